@@ -0,0 +1,191 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Local HTTP stand-in for the newspapers used by the benchmarks.
+
+The server answers the fixture sites from memory, under a path prefix
+with the name of every newspaper, adding the configured latency to
+every answer and failing a configured fraction of the requests.
+"""
+import http.server
+import random
+import re
+import threading
+import time
+
+from scrapper.http_transport import HttpTransport
+
+
+class FixtureServer:
+    """Class that implements a threaded HTTP server for the fixture sites,
+    with latency and error injection. It can be used as a context manager.
+    """
+    def __init__(self, sites, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503,
+                 retry_after=None, seed=0) -> None:
+        self.__sites = sites
+        self.__latency = latency
+        self.__jitter = jitter
+        self.__error_rate = error_rate
+        self.__error_status = error_status
+        self.__retry_after = retry_after
+        self.__rng = random.Random(seed)
+        self.__rng_lock = threading.Lock()
+        self.__n_requests = 0
+        self.__n_errors = 0
+        self.__server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self.__server.daemon_threads = True
+        self.__thread = None
+
+    @property
+    def base_url_(self):
+        """Base url property.
+
+        Returns:
+            str: Url of the server.
+        """
+        return f'http://127.0.0.1:{self.__server.server_port}'
+
+    @property
+    def n_requests_(self):
+        """Number of requests property.
+
+        Returns:
+            int: Number of requests answered, failed ones included.
+        """
+        return self.__n_requests
+
+    @property
+    def n_errors_(self):
+        """Number of errors property.
+
+        Returns:
+            int: Number of requests failed on purpose.
+        """
+        return self.__n_errors
+
+    def _draw(self):
+        """Function to draw the delay and if the next request fails.
+
+        Returns:
+            float, bool: Seconds to wait before answering and if the answer is an error.
+        """
+        with self.__rng_lock:
+            self.__n_requests += 1
+            delay = self.__latency + self.__rng.uniform(0, self.__jitter)
+            failed = self.__rng.random() < self.__error_rate
+            self.__n_errors += failed
+        return delay, failed
+
+    def _handler_class(self):
+        """Function to create the request handler class bound to this server.
+
+        Returns:
+            type: BaseHTTPRequestHandler subclass.
+        """
+        fixture_server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            """Handler that answers the fixture sites."""
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                pass
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Function to answer a GET request."""
+                fixture_server.answer(self)
+
+        return Handler
+
+    def answer(self, handler):
+        """Function to answer a request from the fixture sites.
+
+        Args:
+            handler (BaseHTTPRequestHandler): Handler of the request
+        """
+        delay, failed = self._draw()
+        if delay:
+            time.sleep(delay)
+        name, _, path = re.sub('/+', '/', handler.path.split('?')[0]).lstrip('/').partition('/')
+        body = self.__sites.get(name, {}).get('/' + path)
+        if failed:
+            status, body = self.__error_status, b''
+        elif body is None:
+            status, body = 404, b''
+        else:
+            status = 200
+        handler.send_response(status)
+        if failed and self.__retry_after is not None:
+            handler.send_header('Retry-After', str(self.__retry_after))
+        content_type = 'image/gif' if path.endswith('.gif') else 'text/html; charset=utf-8'
+        handler.send_header('Content-Type', content_type)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self):
+        """Function to start serving in a background thread.
+        """
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Function to stop the server.
+        """
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class RewritingTransport(HttpTransport):
+    """Transport that sends the requests for the newspapers to the fixture
+    server, so the scrappers run unchanged against it.
+    """
+    def __init__(self, origins, base_url, **kwargs) -> None:
+        super().__init__(**kwargs)
+        # Longest origins first, so one that is the prefix of another doesn't win.
+        self.__prefixes = sorted(((origin.rstrip('/'), f'{base_url}/{name}') for name, origin in origins.items()),
+                                 key=lambda prefix: -len(prefix[0]))
+
+    def _rewrite(self, url):
+        """Function to change the origin of a newspaper url by the fixture server.
+
+        Args:
+            url (str): Url of the newspaper
+
+        Returns:
+            str: Url in the fixture server, or the same url if it isn't from a newspaper.
+        """
+        for origin, local_url in self.__prefixes:
+            if url.startswith(origin):
+                return local_url + url[len(origin):]
+        return url
+
+    def _get_robots_txt(self, robots_url):
+        return super()._get_robots_txt(self._rewrite(robots_url))
+
+    def get(self, url, **kwargs):
+        return super().get(self._rewrite(url), **kwargs)
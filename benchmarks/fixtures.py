@@ -0,0 +1,153 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Fixture websites for the benchmarks.
+
+Every fixture site imitates the markup read by one newspaper scrapper: a
+main page with the news headers and news articles with a title, a body,
+images and the usual boilerplate around them. The sites are generated
+with a fixed seed, so every run of the benchmarks downloads the same bytes.
+"""
+import random
+from collections import namedtuple
+
+
+SiteLayout = namedtuple('SiteLayout', ['origin', 'absolute_links', 'header_name', 'header_class',
+                                       'title_name', 'title_class', 'body_name', 'body_class'])
+SiteLayout.__doc__ = """Markup read by a newspaper scrapper: the origin of its urls, if
+the news links at the main page are absolute, and the tags and classes of the
+news headers, the news article title and its body."""
+
+LAYOUTS = {
+    'elpais': SiteLayout('https://elpais.com', False, 'h2', 'c_t', 'h1', 'a_t', 'div', 'a_c clearfix'),
+    'elmundo': SiteLayout('https://www.elmundo.es', True, 'header', 'ue-c-cover-content__headline-group',
+                          'h1', 'ue-c-article__headline js-headline', 'div',
+                          'ue-l-article__body ue-c-article__body'),
+    'abc': SiteLayout('https://www.abc.es', False, 'h3', 'titular lead-title', 'span', 'titular',
+                      'span', 'cuerpo-texto'),
+    'ideal': SiteLayout('https://www.ideal.es', False, 'h2', 'voc-title', 'h1', 'voc-title',
+                        'p', 'voc-paragraph'),
+}
+
+SECTIONS = ['espana', 'internacional', 'economia', 'cultura', 'deportes', 'tecnologia']
+WORDS = ('el la de que y en los se del las un por con no una su para es al lo como mas pero sus le ya o '
+         'gobierno ciudad mercado equipo datos acuerdo partido empresa proyecto semana').split()
+
+# 1x1 transparent GIF, the images only have to be downloaded.
+IMAGE = (b'GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00,'
+         b'\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;')
+
+
+def _sentence(rng, n_words):
+    """Function to create a random sentence.
+
+    Args:
+        rng (random.Random): Random generator
+        n_words (int): Number of words
+
+    Returns:
+        str: Sentence.
+    """
+    return ' '.join(rng.choice(WORDS) for _ in range(n_words)).capitalize() + '.'
+
+
+def _boilerplate(rng, origin, n_links=60):
+    """Function to create the navigation and footer of a page.
+
+    Args:
+        rng (random.Random): Random generator
+        origin (str): Origin of the newspaper urls
+        n_links (int): Number of links in the menus.
+
+    Returns:
+        str, str: Html of the header and the footer.
+    """
+    links = ''.join(f'<li><a class="menu-link" href="{origin}/{rng.choice(SECTIONS)}/">'
+                    f'{_sentence(rng, 2)}</a></li>' for _ in range(n_links))
+    header = (f'<header class="site-header"><nav><ul>{links}</ul></nav>'
+              f'<script>window.dataLayer = [{{"page": "{rng.random()}"}}];</script></header>')
+    footer = f'<footer><ul>{links}</ul><p>{_sentence(rng, 30)}</p></footer>'
+    return header, footer
+
+
+def _article_path(i, rng):
+    """Function to create the path of a news article.
+
+    Args:
+        i (int): Number of the news article
+        rng (random.Random): Random generator
+
+    Returns:
+        str: Path of the news article.
+    """
+    return f'/{rng.choice(SECTIONS)}/2021-05-{i % 28 + 1:02d}/noticia-{i}.html'
+
+
+def _body(layout, paragraphs):
+    """Function to create the body of a news article with the layout of a newspaper.
+
+    Args:
+        layout (SiteLayout): Markup of the newspaper
+        paragraphs (list): Text of the paragraphs.
+
+    Returns:
+        str: Html of the body.
+    """
+    if layout.body_name == 'p':
+        return ''.join(f'<p class="{layout.body_class}">{text}</p>' for text in paragraphs)
+    return (f'<{layout.body_name} class="{layout.body_class}">'
+            + ''.join(f'<p>{text}</p>' for text in paragraphs) + f'</{layout.body_name}>')
+
+
+def build_site(name, n_articles=50, n_paragraphs=12, n_images=2, seed=0):
+    """Function to create the fixture site of a newspaper.
+
+    Args:
+        name (str): Name of the newspaper
+        n_articles (int): Number of news articles linked from the main page.
+        n_paragraphs (int): Number of paragraphs of every news article.
+        n_images (int): Number of images of every news article.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        dict: Content of every path of the site, with the main page at '/'.
+    """
+    layout = LAYOUTS[name]
+    rng = random.Random(f'{name}-{seed}')
+    header, footer = _boilerplate(rng, layout.origin)
+    pages = {}
+    headlines = []
+    for i in range(n_articles):
+        path = _article_path(i, rng)
+        href = layout.origin + path if layout.absolute_links else path
+        title = _sentence(rng, 8)
+        headlines.append(f'<article><{layout.header_name} class="{layout.header_class}">'
+                         f'<a href="{href}">{title}</a></{layout.header_name}>'
+                         f'<p class="summary">{_sentence(rng, 20)}</p></article>')
+        images = ''.join(f'<figure><img src="/img/{i}-{j}.gif" alt="{title}"></figure>' for j in range(n_images))
+        paragraphs = [_sentence(rng, rng.randint(25, 60)) for _ in range(n_paragraphs)]
+        pages[path] = (f'<!DOCTYPE html><html><head><title>{title}</title></head><body>{header}<main>'
+                       f'<{layout.title_name} class="{layout.title_class}">{title}</{layout.title_name}>'
+                       f'{images}{_body(layout, paragraphs)}</main>'
+                       f'<aside>{"".join(headlines[-10:])}</aside>{footer}</body></html>').encode()
+        for j in range(n_images):
+            pages[f'/img/{i}-{j}.gif'] = IMAGE
+    pages['/'] = (f'<!DOCTYPE html><html><head><title>{name}</title></head><body>{header}<main>'
+                  f'{"".join(headlines)}</main>{footer}</body></html>').encode()
+    return pages
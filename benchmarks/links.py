@@ -0,0 +1,157 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Benchmark of the extraction of the news links from the main pages.
+
+The links of the main page of every fixture site are extracted with the
+BeautifulSoup tree, as _get_news_links does, with and without the
+SoupStrainer of selective parsing, and with the tree free extractor. All
+the link lists are checked against the html.parser tree. Run it from the
+repository root:
+
+    python -m benchmarks.links --articles 500 --repeat 7
+"""
+import argparse
+import json
+import statistics
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fixtures import LAYOUTS, build_site
+from scrapper.link_extractor import extract_header_links
+from scrapper.soup_strainers import main_page_strainer
+
+
+def soup_links(html, header_name, header_class, parser='html.parser', parse_only=None):
+    """Function to extract the news links as _get_news_links does, with a
+    BeautifulSoup tree.
+
+    Args:
+        html (str): Html of the main page
+        header_name (str): Headers at the main page that contain the news
+        header_class (str): header_name class in the html file.
+        parser (str): Parser used by BeautifulSoup
+        parse_only (SoupStrainer): If given, only the tags kept by it are parsed.
+
+    Returns:
+        list: List with the href of every header.
+    """
+    soup = BeautifulSoup(html, parser, parse_only=parse_only)
+    links = [tag.find('a').get('href') for tag in soup.find_all(name=header_name, class_=header_class)]
+    soup.decompose()
+    return links
+
+
+def _extractors(header_name, header_class):
+    """Function to get the link extractors to compare. lxml is only used if
+    it's installed.
+
+    Args:
+        header_name (str): Headers at the main page that contain the news
+        header_class (str): header_name class in the html file.
+
+    Returns:
+        dict: Function that extracts the links from the html, by name.
+    """
+    strainer = main_page_strainer(header_name, header_class)
+    extractors = {'soup': lambda html: soup_links(html, header_name, header_class),
+                  'strainer': lambda html: soup_links(html, header_name, header_class, parse_only=strainer)}
+    try:
+        import lxml  # pylint: disable=import-outside-toplevel,unused-import
+        extractors['lxml'] = lambda html: soup_links(html, header_name, header_class, parser='lxml')
+    except ImportError:
+        pass
+    extractors['fast'] = lambda html: extract_header_links(html, header_name, header_class)
+    return extractors
+
+
+def run_newspaper(name, n_articles=300, repeat=5):
+    """Function to time every link extractor on the main page of a fixture site.
+
+    Args:
+        name (str): Name of the newspaper
+        n_articles (int): Number of news articles linked from the main page.
+        repeat (int): Number of times every extractor is timed.
+
+    Returns:
+        list: List with the results of every extractor.
+    """
+    layout = LAYOUTS[name]
+    html = build_site(name, n_articles=n_articles, n_paragraphs=1, n_images=0)['/'].decode()
+    expected = soup_links(html, layout.header_name, layout.header_class)
+    results = []
+    for method, extract in _extractors(layout.header_name, layout.header_class).items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            links = extract(html)
+            timings.append(time.perf_counter() - start)
+        results.append({'newspaper': name, 'method': method, 'page_bytes': len(html), 'links': len(links),
+                        'identical': links == expected, 'median_ms': statistics.median(timings) * 1000})
+    soup_ms = results[0]['median_ms']
+    for result in results:
+        result['speedup'] = soup_ms / result['median_ms'] if result['median_ms'] else 0.0
+    return results
+
+
+def print_results(results):
+    """Function to print the results of the benchmark as a table.
+
+    Args:
+        results (list): List with the results of every newspaper and extractor.
+    """
+    print(f'{"newspaper":<10}{"method":<10}{"page KB":>9}{"links":>7}{"same":>6}{"ms":>9}{"speedup":>9}')
+    for result in results:
+        print(f'{result["newspaper"]:<10}{result["method"]:<10}{result["page_bytes"] / 1024:>9.0f}'
+              f'{result["links"]:>7}{"yes" if result["identical"] else "NO":>6}{result["median_ms"]:>9.2f}'
+              f'{result["speedup"]:>8.1f}x')
+
+
+def parse_args():
+    """Function to parse the command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the extraction of the news links from the main pages.')
+    parser.add_argument('newspapers', nargs='*', default=list(LAYOUTS),
+                        help='Newspapers to benchmark, all by default.')
+    parser.add_argument('--articles', type=int, default=300, help='News articles linked from every main page.')
+    parser.add_argument('--repeat', type=int, default=5, help='Times every extractor is timed.')
+    parser.add_argument('--json', default=None, metavar='PATH', help='Also write the results as JSON to PATH.')
+    return parser.parse_args()
+
+
+def main():
+    """Main function.
+    """
+    args = parse_args()
+    results = [result for name in args.newspapers
+               for result in run_newspaper(name, n_articles=args.articles, repeat=args.repeat)]
+    print_results(results)
+    if args.json is not None:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+    if not all(result['identical'] for result in results):
+        raise SystemExit('Some extractor gave different links than the html.parser tree.')
+
+
+if __name__ == '__main__':
+    main()
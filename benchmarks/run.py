@@ -0,0 +1,255 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Offline benchmarks of the newspaper scrappers.
+
+Every newspaper scrapper runs its pipeline against its fixture site,
+served by a local stand-in with configurable latency and errors, in a
+fresh process, so the peak memory of every newspaper is measured alone.
+Run it from the repository root:
+
+    python -m benchmarks.run --articles 100 --latency 0.02 --error-rate 0.05
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.fixtures import LAYOUTS, build_site
+from benchmarks.fixture_server import FixtureServer, RewritingTransport
+from scrapper.metrics import MetricsRegistry, ARTICLES
+from scrapper.news_factory import NewsFactory
+from scrapper.retry import CircuitBreaker
+
+
+def percentile(values, percent):
+    """Function to get a percentile with the nearest rank method.
+
+    Args:
+        values (list): Values
+        percent (float): Percentile, between 0 and 100.
+
+    Returns:
+        float: Percentile of the values, or 0 if there are no values.
+    """
+    if not values:
+        return 0.0
+    values = sorted(values)
+    rank = max(int(round(percent / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def _folder_size(path):
+    """Function to get the bytes of all the files inside a folder.
+
+    Args:
+        path (str): Path of the folder
+
+    Returns:
+        int: Number of bytes.
+    """
+    return sum(os.path.getsize(os.path.join(root, file)) for root, _, files in os.walk(path) for file in files)
+
+
+def _peak_rss_bytes():
+    """Function to get the peak resident memory of this process.
+
+    Returns:
+        int: Number of bytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux gives it in kilobytes and macOS in bytes.
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_newspaper(name, base_url, mode='sync', storage='folder', max_concurrency=8):
+    """Function to run the pipeline of a newspaper against the fixture server,
+    in a temporal folder.
+
+    Args:
+        name (str): Name of the newspaper
+        base_url (str): Url of the fixture server
+        mode (str): 'sync' runs pipeline and 'async' runs pipeline_async.
+        storage (str): Storage of the news articles.
+        max_concurrency (int): Max news articles downloaded at the same time in async mode.
+
+    Returns:
+        dict: Results of the benchmark.
+    """
+    metrics = MetricsRegistry()
+    transport = RewritingTransport({newspaper: layout.origin for newspaper, layout in LAYOUTS.items()},
+                                   base_url, circuit_breaker=CircuitBreaker())
+    latencies = []
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+        factory = NewsFactory(name, transport=transport, metrics=metrics, storage=storage)
+        scrapper = factory.scrapper_
+        # The latency of a news article goes from the start of its download to
+        # the end of its write, that run one after the other in the same thread.
+        extract_article = scrapper._extract_article  # pylint: disable=protected-access
+        save_article = scrapper._save_article  # pylint: disable=protected-access
+        started = threading.local()
+
+        def timed_extract_article(*args):
+            started.value = time.perf_counter()
+            return extract_article(*args)
+
+        def timed_save_article(*args, **kwargs):
+            try:
+                return save_article(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - started.value)
+
+        scrapper._extract_article = timed_extract_article  # pylint: disable=protected-access
+        scrapper._save_article = timed_save_article  # pylint: disable=protected-access
+        start = time.perf_counter()
+        if mode == 'async':
+            factory.pipeline_async(max_concurrency=max_concurrency)
+        else:
+            factory.pipeline()
+        factory.close()
+        elapsed = time.perf_counter() - start
+        bytes_written = _folder_size(folder)
+        os.chdir(os.path.dirname(folder))
+    counts = {value['labels']['result']: value['value']
+              for value in metrics.snapshot()['counters'].get(ARTICLES, [])}
+    n_saved = counts.get('saved', 0)
+    return {'newspaper': name, 'mode': mode, 'articles': n_saved, 'errors': counts.get('error', 0),
+            'seconds': elapsed, 'articles_per_second': n_saved / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(latencies, 50) * 1000, 'p99_ms': percentile(latencies, 99) * 1000,
+            'peak_rss_bytes': _peak_rss_bytes(), 'bytes_written': bytes_written}
+
+
+def failed_result(name, mode, err):
+    """Function to get the results of a newspaper whose benchmark has failed.
+
+    Args:
+        name (str): Name of the newspaper
+        mode (str): 'sync' or 'async'.
+        err (Exception): Error raised by the benchmark.
+
+    Returns:
+        dict: Results with one error and no news articles.
+    """
+    return {'newspaper': name, 'mode': mode, 'articles': 0, 'errors': 1, 'seconds': 0.0,
+            'articles_per_second': 0.0, 'p50_ms': 0.0, 'p99_ms': 0.0, 'peak_rss_bytes': 0,
+            'bytes_written': 0, 'failure': f'{type(err).__name__}: {err}'}
+
+
+def run_benchmarks(names, n_articles=50, n_paragraphs=12, n_images=2, latency=0.0, jitter=0.0,
+                   error_rate=0.0, retry_after=None, mode='sync', storage='folder', max_concurrency=8):
+    """Function to run the benchmark of several newspapers, each of them in a new process.
+
+    Args:
+        names (list): Names of the newspapers
+        n_articles (int): Number of news articles of every fixture site.
+        n_paragraphs (int): Number of paragraphs of every news article.
+        n_images (int): Number of images of every news article.
+        latency (float): Seconds added to every answer of the fixture server.
+        jitter (float): Max random seconds added to the latency.
+        error_rate (float): Fraction of the requests that fail.
+        retry_after (int): Retry-After header of the failed requests, if any.
+        mode (str): 'sync' or 'async'.
+        storage (str): Storage of the news articles.
+        max_concurrency (int): Max news articles downloaded at the same time in async mode.
+
+    Returns:
+        list: List with the results of every newspaper. A newspaper whose
+        benchmark fails is reported with one error and its failure.
+    """
+    sites = {name: build_site(name, n_articles=n_articles, n_paragraphs=n_paragraphs, n_images=n_images)
+             for name in names}
+    results = []
+    with FixtureServer(sites, latency=latency, jitter=jitter, error_rate=error_rate,
+                       retry_after=retry_after) as server:
+        for name in names:
+            try:
+                with ProcessPoolExecutor(max_workers=1,
+                                         mp_context=multiprocessing.get_context('spawn')) as executor:
+                    results.append(executor.submit(run_newspaper, name, server.base_url_, mode=mode,
+                                                   storage=storage, max_concurrency=max_concurrency).result())
+            except Exception as err:  # pylint: disable=broad-except
+                print(f'Benchmark of {name} failed: {err}')
+                results.append(failed_result(name, mode, err))
+        print(f'Fixture server: {server.n_requests_} requests, {server.n_errors_} errors injected.')
+    return results
+
+
+def print_results(results):
+    """Function to print the results of the benchmarks as a table.
+
+    Args:
+        results (list): List with the results of every newspaper.
+    """
+    print(f'{"newspaper":<10}{"articles":>9}{"errors":>8}{"art/s":>9}{"p50 ms":>9}{"p99 ms":>9}'
+          f'{"rss MB":>9}{"written MB":>12}')
+    for result in results:
+        print(f'{result["newspaper"]:<10}{result["articles"]:>9}{result["errors"]:>8}'
+              f'{result["articles_per_second"]:>9.1f}{result["p50_ms"]:>9.1f}{result["p99_ms"]:>9.1f}'
+              f'{result["peak_rss_bytes"] / 2 ** 20:>9.1f}{result["bytes_written"] / 2 ** 20:>12.2f}'
+              f'{"  failed: " + result["failure"] if "failure" in result else ""}')
+
+
+def parse_args():
+    """Function to parse the command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the newspaper scrappers against local fixture sites.')
+    parser.add_argument('newspapers', nargs='*', default=list(LAYOUTS),
+                        help='Newspapers to benchmark, all by default.')
+    parser.add_argument('--articles', type=int, default=50, help='News articles of every fixture site.')
+    parser.add_argument('--paragraphs', type=int, default=12, help='Paragraphs of every news article.')
+    parser.add_argument('--images', type=int, default=2, help='Images of every news article.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every answer.')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Max random seconds added to the latency.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of the requests that fail.')
+    parser.add_argument('--retry-after', type=int, default=None, help='Retry-After of the failed requests.')
+    parser.add_argument('--mode', default='sync', choices=['sync', 'async'], help='Pipeline to benchmark.')
+    parser.add_argument('--storage', default='folder', choices=['folder', 'jsonl', 'parquet'],
+                        help='Where the news articles are saved.')
+    parser.add_argument('--max-concurrency', type=int, default=8,
+                        help='Max news articles downloaded at the same time in async mode.')
+    parser.add_argument('--json', default=None, metavar='PATH', help='Also write the results as JSON to PATH.')
+    return parser.parse_args()
+
+
+def main():
+    """Main function.
+    """
+    args = parse_args()
+    results = run_benchmarks(args.newspapers, n_articles=args.articles, n_paragraphs=args.paragraphs,
+                             n_images=args.images, latency=args.latency, jitter=args.jitter,
+                             error_rate=args.error_rate, retry_after=args.retry_after, mode=args.mode,
+                             storage=args.storage, max_concurrency=args.max_concurrency)
+    print_results(results)
+    if args.json is not None:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
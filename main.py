@@ -34,21 +34,149 @@ Author: Alberto Argente del Castillo Garrido
 Github: AlArgente
 """
 
+import argparse
 
 from scrapper.news_factory import NewsFactory
+from scrapper.registry import available_newspapers
+from scrapper.profiling import Profiler, PROFILE_MODES
 
 def print_available_newspaper_scrappers():
     """Function to print the available newspaper scrappers.
     """
-    newspapers = ['elpais', 'elmundo', 'abc', 'ideal']
+    newspapers = available_newspapers()
     print('The newspaper available are:')
     for i, newspaper in enumerate(newspapers, start=1):
         print(f'{i}.- {newspaper}')
     print('Please, select one from the showed above.')
 
+def parse_args():
+    """Function to parse the command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description='Download the news from spanish newspapers. '
+                                                 'Without newspapers it asks for one.')
+    parser.add_argument('newspapers', nargs='*', help='Newspapers to download at the same time.')
+    parser.add_argument('--all', action='store_true', help='Download all the available newspapers.')
+    parser.add_argument('--list', action='store_true', help='Print the available newspapers and exit.')
+    parser.add_argument('--max-workers', type=int, default=16,
+                        help='Max news articles downloaded at the same time from all the newspapers.')
+    parser.add_argument('--per-newspaper', type=int, default=4,
+                        help='Max news articles downloaded at the same time from one newspaper.')
+    parser.add_argument('--max-articles', type=int, default=None,
+                        help='Max news articles downloaded from every newspaper.')
+    parser.add_argument('--parser', default='html.parser', help='Parser used by BeautifulSoup.')
+    parser.add_argument('--storage', default='folder', choices=['folder', 'jsonl', 'parquet'],
+                        help='Where the news articles are saved.')
+    parser.add_argument('--warc', default=None, metavar='DIR',
+                        help='Archive every downloaded page in WARC files at DIR.')
+    parser.add_argument('--discovery', default='homepage', choices=['homepage', 'feeds'],
+                        help='Find the news links in the newspaper main page or in its RSS feeds and sitemaps.')
+    parser.add_argument('--deep', action='store_true',
+                        help='Follow the section and archive pages too. The crawl can be resumed if it stops.')
+    parser.add_argument('--frontier', default='frontier.sqlite',
+                        help='SQLite database with the urls of the deep crawl.')
+    parser.add_argument('--max-depth', type=int, default=2,
+                        help='Max number of pages followed from the main page in a deep crawl.')
+    parser.add_argument('--max-per-section', type=int, default=None,
+                        help='Max news articles from every section in a deep crawl.')
+    parser.add_argument('--metrics', default=None, metavar='PATH',
+                        help='Write the metrics of the run to PATH, as JSON if it ends with .json or as '
+                             'a Prometheus textfile otherwise.')
+    parser.add_argument('--profile', default=None, choices=PROFILE_MODES,
+                        help='Profile the run of every newspaper with cProfile or a sampling profiler, '
+                             'and trace the memory of the parsing. The results are written next to the output.')
+    parser.add_argument('--profile-top', type=int, default=25,
+                        help='Number of lines in the memory report of the profile.')
+    parser.add_argument('--max-body-mb', type=float, default=10.0,
+                        help='Max size of a page, bigger pages are skipped.')
+    parser.add_argument('--memory-budget-mb', type=float, default=None,
+                        help='Lower the number of news articles downloaded at the same time while the '
+                             'process uses more memory.')
+    parser.add_argument('--http-cache', default=None, metavar='DIR',
+                        help='Cache the pages at DIR and request them again with conditional GETs.')
+    parser.add_argument('--dedup', default=None, metavar='PATH',
+                        help='Tag the near duplicate news articles across newspapers, with the index at PATH.')
+    parser.add_argument('--dedup-skip', default=None, choices=['images', 'text'],
+                        help='Save the near duplicates without images, or without text nor images.')
+    parser.add_argument('--search-index', default=None, metavar='DIR',
+                        help='Add the news articles saved to the search index at DIR. Search it with '
+                             'python -m scrapper.search_index.')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep polling the newspapers, downloading only their new news articles.')
+    parser.add_argument('--min-interval', type=float, default=60.0,
+                        help='Min seconds between two polls of a newspaper in daemon mode.')
+    parser.add_argument('--max-interval', type=float, default=3600.0,
+                        help='Max seconds between two polls of a newspaper in daemon mode.')
+    parser.add_argument('--reextract', nargs='+', default=None, metavar='WARC',
+                        help='Extract again the news articles archived in WARC files of one newspaper, '
+                             'without network access.')
+    return parser.parse_args()
+
 def main():
     """Main function.
     """
+    args = parse_args()
+    if args.list:
+        print('\n'.join(available_newspapers()))
+        return
+    newspapers = available_newspapers() if args.all else args.newspapers
+    max_body_bytes = int(args.max_body_mb * 1024 ** 2)
+    memory_budget = int(args.memory_budget_mb * 1024 ** 2) if args.memory_budget_mb else None
+    if args.reextract:
+        if len(newspapers) != 1:
+            raise SystemExit('--reextract needs exactly one newspaper.')
+        factory = NewsFactory(newspapers[0], parser=args.parser, storage=args.storage, url_index=None,
+                              metrics_path=args.metrics, dedup=args.dedup, dedup_skip=args.dedup_skip,
+                              search_index=args.search_index)
+        n_saved = factory.scrapper_.reextract(args.reextract)
+        factory.close()
+        print(f'{n_saved} news articles extracted again.')
+        return
+    if args.profile:
+        # The sequential pipeline runs in this thread, so cProfile sees all of it.
+        for newspaper in newspapers or available_newspapers():
+            factory = NewsFactory(newspaper, parser=args.parser, storage=args.storage, warc=args.warc,
+                                  discovery=args.discovery, metrics_path=args.metrics,
+                                  max_body_bytes=max_body_bytes, dedup=args.dedup, dedup_skip=args.dedup_skip,
+                                  search_index=args.search_index, http_cache=args.http_cache)
+            try:
+                factory.pipeline(profiler=Profiler(mode=args.profile, tracemalloc_top=args.profile_top))
+            finally:
+                factory.close()
+        return
+    if args.deep:
+        for newspaper in newspapers or available_newspapers():
+            factory = NewsFactory(newspaper, parser=args.parser, storage=args.storage, warc=args.warc,
+                                  metrics_path=args.metrics, max_body_bytes=max_body_bytes, dedup=args.dedup,
+                                  dedup_skip=args.dedup_skip, search_index=args.search_index,
+                                  http_cache=args.http_cache)
+            try:
+                n_saved = factory.deep_crawl(frontier=args.frontier, max_depth=args.max_depth,
+                                             max_per_section=args.max_per_section, max_urls=args.max_articles)
+            finally:
+                factory.close()
+            print(f'{newspaper}: {n_saved} news articles saved.')
+        return
+    if args.daemon:
+        NewsFactory.run_daemon(newspapers or available_newspapers(), min_interval=args.min_interval,
+                               max_interval=args.max_interval, per_newspaper=args.per_newspaper,
+                               parser=args.parser, storage=args.storage, warc=args.warc,
+                               discovery=args.discovery, metrics_path=args.metrics, max_body_bytes=max_body_bytes,
+                               memory_budget=memory_budget, dedup=args.dedup, dedup_skip=args.dedup_skip,
+                               search_index=args.search_index, http_cache=args.http_cache)
+        return
+    if newspapers:
+        summaries = NewsFactory.run_many(newspapers, max_workers=args.max_workers,
+                                         per_newspaper=args.per_newspaper, max_articles=args.max_articles,
+                                         parser=args.parser, storage=args.storage, warc=args.warc,
+                                         discovery=args.discovery, metrics_path=args.metrics,
+                                         max_body_bytes=max_body_bytes, memory_budget=memory_budget,
+                                         dedup=args.dedup, dedup_skip=args.dedup_skip,
+                                         search_index=args.search_index, http_cache=args.http_cache)
+        NewsFactory.print_summary(summaries)
+        return
     print_available_newspaper_scrappers()
     newspaper = input('Input the newspaper name you want to save the news: ')
     # Load the newspaper scrapper.
@@ -56,6 +184,7 @@ def main():
     factory = NewsFactory(newspaper)
     # Download all the news available at the newspaper site.
     factory.pipeline()
+    factory.close()
 
 if __name__ == '__main__':
     main()
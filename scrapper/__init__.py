@@ -18,15 +18,40 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 """This file is part of the scrapper repository
+
+The classes are imported the first time they are used, so importing the
+package doesn't import requests, BeautifulSoup or the scrappers of the
+newspapers that aren't used.
 """
 
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from scrapper.news_factory import NewsFactory
-from scrapper.news_scrapper import NewsScrapper
-from scrapper.elpais_scrapper import ElPaisScrapper
-from scrapper.elmundo_scrapper import ElMundoScrapper
-from scrapper.abc_scrapper import ABCScrapper
-from scrapper.ideal_scrapper import IdealScrapper
+import importlib
+
+from scrapper.registry import available_newspapers, load_newspaper, register_newspaper
+
+_LAZY_ATTRIBUTES = {
+    'NewsFactory': 'scrapper.news_factory',
+    'NewsScrapper': 'scrapper.news_scrapper',
+    'ElPaisScrapper': 'scrapper.elpais_scrapper',
+    'ElMundoScrapper': 'scrapper.elmundo_scrapper',
+    'ABCScrapper': 'scrapper.abc_scrapper',
+    'IdealScrapper': 'scrapper.ideal_scrapper',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES) + ['available_newspapers', 'load_newspaper', 'register_newspaper']
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -25,7 +25,8 @@ Author: Alberto Argente del Castillo Garrido
 Github: AlArgente
 """
 
-import requests
+from urllib.parse import urlsplit
+
 from scrapper.news_scrapper import NewsScrapper
 
 
@@ -36,7 +37,7 @@ class ABCScrapper(NewsScrapper):
     so it's important to look for that class first in case to do an own
     scrapper.
     """
-    def __init__(self, parser='html.parser') -> None:
+    def __init__(self, parser='html.parser', headers=None, **kwargs) -> None:
         name = 'abc'
         url = 'https://www.abc.es/'
         header_name_news = 'h3'
@@ -45,9 +46,15 @@ class ABCScrapper(NewsScrapper):
         newsarticle_title_class = 'titular'
         newsarticle_body_name = 'span'
         newsarticle_body_class = 'cuerpo-texto'
+        kwargs.setdefault('requests_per_second', 1.0)
+        kwargs.setdefault('burst', 3)
+        kwargs.setdefault('feed_urls', ['https://www.abc.es/rss/feeds/abcPortada.xml'])
+        default_headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.1; WOW64; rv:50.0) Gecko/20100101 Firefox/50.0'}
+        default_headers.update(headers or {})
         super().__init__(name, url, parser, header_name_news, header_class_news,
                          newsarticle_title_name, newsarticle_title_class, 
-                         newsarticle_body_name, newsarticle_body_class)
+                         newsarticle_body_name, newsarticle_body_class,
+                         headers=default_headers, **kwargs)
 
     def _get_link_path(self, link: str):
         """Function that process the news url to create a path for it,
@@ -89,17 +96,16 @@ class ABCScrapper(NewsScrapper):
         """
         return self.url_ + link
 
-    def _init_bs4(self, url: str):
-        """Function to init a BeautifulSoup object
-        Overrided to be able to extract the data from the newspaper,
-        beacause of the need of headers.
+    def _get_link_from_url(self, news_url):
+        """Function to get the news link from the full url of a news article.
+        In ABC the links start with /, like the ones from the home page.
 
         Args:
-            url (str): Url from newspaper to be scrapped
+            news_url (str): Full url of the news
 
         Returns:
-            BeautifulSoup object: BeautifulSoup object that has parsed the url
+            str: News link.
         """
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.1; WOW64; rv:50.0) Gecko/20100101 Firefox/50.0'}
-        source=requests.get(url, headers=headers).text
-        return self.bs4_(source, self.parser_)
+        parts = urlsplit(news_url)
+        link = '/' + parts.path.lstrip('/')
+        return link + '?' + parts.query if parts.query else link
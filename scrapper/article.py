@@ -0,0 +1,92 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Record of a news article extracted by a scrapper.
+"""
+from dataclasses import dataclass, fields
+from datetime import datetime
+from urllib.parse import urljoin
+
+
+@dataclass(frozen=True)
+class Article:
+    """Class with the data extracted from a news article. It's immutable and
+    uses __slots__, so keeping many of them in memory is cheap.
+    """
+    __slots__ = ('newspaper', 'url', 'link', 'title', 'paragraphs', 'images', 'extracted_at', 'cluster_id')
+    newspaper: str
+    url: str
+    link: str
+    title: str
+    paragraphs: tuple
+    images: tuple
+    extracted_at: str
+    cluster_id: int
+
+    @classmethod
+    def from_extraction(cls, newspaper, link, url, title, paragraphs, images_src, extracted_at=None,
+                        cluster_id=None):
+        """Function to create the article from the data extracted by a scrapper.
+
+        Args:
+            newspaper (str): Newspaper's name
+            link (str): News link as returned by _clean_news_links
+            url (str): Full url of the news article
+            title (str): Title of the news article
+            paragraphs (list): List with the paragraphs of the news article
+            images_src (list): List with the images urls, relative ones are made absolute.
+            extracted_at (str): ISO date of the extraction, now by default.
+            cluster_id (int): Id of its cluster of near duplicates, if it's known.
+
+        Returns:
+            Article: The news article.
+        """
+        if extracted_at is None:
+            extracted_at = datetime.now().isoformat(timespec='seconds')
+        return cls(newspaper, url, link, title, tuple(paragraphs),
+                   tuple(urljoin(url, img) if img else img for img in images_src), extracted_at, cluster_id)
+
+    @property
+    def text(self):
+        """Text property.
+
+        Returns:
+            str: Paragraphs of the news article, one per line.
+        """
+        return '\n'.join(self.paragraphs)
+
+    def to_record(self):
+        """Function to get the record saved by the shard storages.
+
+        Returns:
+            dict: Record with the newspaper, url, title, paragraphs, images, extraction
+            date and cluster id.
+        """
+        return {'newspaper': self.newspaper, 'url': self.url, 'title': self.title,
+                'paragraphs': list(self.paragraphs), 'images': list(self.images),
+                'extracted_at': self.extracted_at, 'cluster_id': self.cluster_id}
+
+    # A frozen dataclass with __slots__ can't be unpickled with setattr, and the
+    # articles are sent back by the extraction processes.
+    def __getstate__(self):
+        return tuple(getattr(self, field.name) for field in fields(self))
+
+    def __setstate__(self, state):
+        for field, value in zip(fields(self), state):
+            object.__setattr__(self, field.name, value)
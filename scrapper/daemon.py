@@ -0,0 +1,126 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Daemon that keeps polling the newspapers main pages.
+
+Every newspaper is polled in its own thread. Each poll only downloads the
+news articles that aren't in the url index, and the poll interval of every
+newspaper adapts to how often new news articles appear: it gets shorter
+after a poll with new news and longer after a poll without them.
+"""
+import threading
+
+
+class PollingDaemon:
+    """Class that polls several newspapers until it's stopped.
+    """
+    def __init__(self, scrappers, min_interval=60.0, max_interval=3600.0, initial_interval=300.0,
+                 speedup=0.5, slowdown=1.5, max_concurrency=4) -> None:
+        self.__scrappers = scrappers
+        self.__min_interval = min_interval
+        self.__max_interval = max_interval
+        self.__speedup = speedup
+        self.__slowdown = slowdown
+        self.__max_concurrency = max_concurrency
+        self.__intervals = {scrapper.name_: self._clamp(initial_interval) for scrapper in scrappers}
+        self.__stop = threading.Event()
+
+    @property
+    def intervals_(self):
+        """Intervals property.
+
+        Returns:
+            dict: Current poll interval in seconds of every newspaper.
+        """
+        return dict(self.__intervals)
+
+    def _clamp(self, interval):
+        """Function to keep an interval between the min and max intervals.
+
+        Args:
+            interval (float): Poll interval in seconds
+
+        Returns:
+            float: Clamped interval.
+        """
+        return min(self.__max_interval, max(self.__min_interval, interval))
+
+    def next_interval(self, interval, n_new):
+        """Function to adapt the poll interval of a newspaper after a poll.
+
+        Args:
+            interval (float): Current poll interval in seconds
+            n_new (int): Number of new news articles found in the poll.
+
+        Returns:
+            float: Next poll interval.
+        """
+        factor = self.__speedup if n_new > 0 else self.__slowdown
+        return self._clamp(interval * factor)
+
+    def poll(self, scrapper):
+        """Function to poll a newspaper once, downloading only its new news articles.
+
+        Args:
+            scrapper (NewsScrapper): Scrapper of the newspaper
+
+        Returns:
+            CrawlSummary: Summary of the poll.
+        """
+        return scrapper.pipeline_async(max_concurrency=self.__max_concurrency)
+
+    def _poll_forever(self, scrapper):
+        """Function to poll a newspaper until the daemon is stopped.
+
+        Args:
+            scrapper (NewsScrapper): Scrapper of the newspaper
+        """
+        name = scrapper.name_
+        while not self.__stop.is_set():
+            try:
+                n_new = self.poll(scrapper).n_links
+            except Exception as err:  # pylint: disable=broad-except
+                print(f'Error polling {name}: {err}')
+                n_new = 0
+            self.__intervals[name] = self.next_interval(self.__intervals[name], n_new)
+            print(f'{name}: {n_new} new news articles, next poll in {self.__intervals[name]:.0f}s.')
+            self.__stop.wait(self.__intervals[name])
+
+    def run(self):
+        """Function to poll all the newspapers until stop is called or the
+        process is interrupted.
+        """
+        threads = [threading.Thread(target=self._poll_forever, args=(scrapper,), name=scrapper.name_,
+                                    daemon=True) for scrapper in self.__scrappers]
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=1.0)
+        except KeyboardInterrupt:
+            print('Stopping, waiting for the running polls to finish.')
+            self.stop()
+            for thread in threads:
+                thread.join()
+
+    def stop(self):
+        """Function to stop the daemon after the running polls.
+        """
+        self.__stop.set()
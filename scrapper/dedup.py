@@ -0,0 +1,360 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Near-duplicate detection of the news articles across newspapers.
+
+Agency wires are published almost word for word by several newspapers.
+Every news article gets a MinHash signature of the word shingles of its
+paragraphs, and the signatures are indexed with LSH banding in a SQLite
+database. Finding the similar news articles only looks up a few buckets,
+whatever the number of news articles already indexed, and the candidates
+are checked with the similarity of their signatures.
+
+The signatures are computed in batches with NumPy when it's installed.
+The pure Python fallback gives the same signatures, only slower.
+"""
+import re
+import random
+import sqlite3
+import hashlib
+import threading
+import zlib
+from array import array
+from dataclasses import replace
+from itertools import chain
+
+MERSENNE_PRIME = (1 << 31) - 1
+WORD_RE = re.compile(r'\w+')
+SKIP_MODES = ('images', 'text')
+
+
+def shingle_hashes(paragraphs, size=5):
+    """Function to get the hashes of the word shingles of a news article. The
+    words are lowercased and the punctuation is ignored.
+
+    Args:
+        paragraphs (list): List with the paragraphs of the news article
+        size (int): Number of words of every shingle.
+
+    Returns:
+        list: Sorted list with the distinct 32 bit hashes of the shingles.
+    """
+    words = WORD_RE.findall(' '.join(paragraphs).lower())
+    if len(words) < size:
+        return [zlib.crc32(' '.join(words).encode('utf-8'))] if words else []
+    return sorted({zlib.crc32(' '.join(words[i:i + size]).encode('utf-8'))
+                   for i in range(len(words) - size + 1)})
+
+
+def similarity(signature, other):
+    """Function to estimate the Jaccard similarity of two news articles from
+    their MinHash signatures.
+
+    Args:
+        signature (array): Signature of a news article
+        other (array): Signature of the other news article.
+
+    Returns:
+        float: Fraction of equal values, between 0 and 1.
+    """
+    return sum(x == y for x, y in zip(signature, other)) / len(signature)
+
+
+class MinHasher:
+    """Class that computes the MinHash signatures of sets of shingle hashes,
+    with num_perm hash functions (a * x + b) mod (2^31 - 1).
+    """
+    # Max shingles hashed at once by NumPy, 8 bytes for every one and hash function.
+    MAX_BATCH_SHINGLES = 1 << 15
+
+    def __init__(self, num_perm=128, seed=1, use_numpy=True) -> None:
+        rng = random.Random(seed)
+        self.__num_perm = num_perm
+        self.__a = [rng.randrange(1, MERSENNE_PRIME) for _ in range(num_perm)]
+        self.__b = [rng.randrange(0, MERSENNE_PRIME) for _ in range(num_perm)]
+        self.__numpy = None
+        if use_numpy:
+            try:
+                import numpy  # pylint: disable=import-outside-toplevel
+                self.__numpy = numpy
+            except ImportError:
+                pass
+
+    @property
+    def num_perm_(self):
+        """Number of permutations property.
+
+        Returns:
+            int: Number of values of every signature.
+        """
+        return self.__num_perm
+
+    @property
+    def uses_numpy_(self):
+        """Uses NumPy property.
+
+        Returns:
+            bool: True if the signatures are computed with NumPy.
+        """
+        return self.__numpy is not None
+
+    def signatures(self, shingle_sets):
+        """Function to compute the signatures of a batch of news articles.
+
+        Args:
+            shingle_sets (list): List with the shingle hashes of every news article.
+
+        Returns:
+            list: List with the signature of every news article, as an array of
+            unsigned ints, or None if it has no shingles.
+        """
+        if self.__numpy is None:
+            return [self._signature(shingles) if shingles else None for shingles in shingle_sets]
+        results = [None] * len(shingle_sets)
+        batch, n_shingles = [], 0
+        for i, shingles in enumerate(shingle_sets):
+            if not shingles:
+                continue
+            if batch and n_shingles + len(shingles) > self.MAX_BATCH_SHINGLES:
+                self._numpy_signatures(shingle_sets, batch, results)
+                batch, n_shingles = [], 0
+            batch.append(i)
+            n_shingles += len(shingles)
+        if batch:
+            self._numpy_signatures(shingle_sets, batch, results)
+        return results
+
+    def _signature(self, shingles):
+        """Function to compute the signature of a news article in pure Python.
+
+        Args:
+            shingles (list): Shingle hashes of the news article
+
+        Returns:
+            array: Signature of the news article.
+        """
+        return array('I', (min((a * x + b) % MERSENNE_PRIME for x in shingles)
+                           for a, b in zip(self.__a, self.__b)))
+
+    def _numpy_signatures(self, shingle_sets, batch, results):
+        """Function to compute the signatures of a batch of news articles at
+        once with NumPy: all the shingles are hashed together and the min of
+        every news article is taken with reduceat.
+
+        Args:
+            shingle_sets (list): List with the shingle hashes of every news article
+            batch (list): Positions of the news articles of this batch
+            results (list): List where the signatures are saved, by position.
+        """
+        numpy = self.__numpy
+        lengths = [len(shingle_sets[i]) for i in batch]
+        shingles = numpy.fromiter(chain.from_iterable(shingle_sets[i] for i in batch), dtype=numpy.uint64,
+                                  count=sum(lengths))
+        offsets = numpy.cumsum([0] + lengths[:-1])
+        a = numpy.array(self.__a, dtype=numpy.uint64)[:, None]
+        b = numpy.array(self.__b, dtype=numpy.uint64)[:, None]
+        # a < 2^31 and x < 2^32, so a * x + b fits in 64 bits.
+        hashes = (a * shingles[None, :] + b) % MERSENNE_PRIME
+        minimums = numpy.minimum.reduceat(hashes, offsets, axis=1).T.astype('=u4')
+        for i, row in zip(batch, minimums):
+            results[i] = array('I', row.tobytes())
+
+
+class Deduplicator:
+    """Class that tags every news article with the id of its cluster of near
+    duplicates. The first news article of a cluster gives it its id. The index
+    is persisted in a SQLite database and can be shared by all the scrappers.
+
+    With skip='images' the near duplicates are saved without images, and
+    with skip='text' without text nor images.
+    """
+    def __init__(self, path='duplicates.sqlite', threshold=0.8, num_perm=128, bands=16, shingle_size=5,
+                 seed=1, skip=None, use_numpy=True) -> None:
+        if num_perm % bands:
+            raise ValueError(f'The {num_perm} permutations can not be split in {bands} bands.')
+        if skip is not None and skip not in SKIP_MODES:
+            raise ValueError(f'Unknown skip mode {skip}, use images or text.')
+        self.__path = path
+        self.__threshold = threshold
+        self.__bands = bands
+        self.__shingle_size = shingle_size
+        self.__skip = skip
+        self.__minhasher = MinHasher(num_perm=num_perm, seed=seed, use_numpy=use_numpy)
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        with self.__connection:
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS articles (id INTEGER PRIMARY KEY, '
+                                      'url TEXT UNIQUE, newspaper TEXT, cluster_id INTEGER, signature BLOB)')
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS lsh_buckets (key INTEGER, article_id INTEGER, '
+                                      'PRIMARY KEY (key, article_id)) WITHOUT ROWID')
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT)')
+        self._check_settings({'num_perm': num_perm, 'bands': bands, 'shingle_size': shingle_size, 'seed': seed})
+
+    @property
+    def path_(self):
+        """Path property.
+
+        Returns:
+            str: Path of the SQLite database.
+        """
+        return self.__path
+
+    @property
+    def skip_(self):
+        """Skip property.
+
+        Returns:
+            str: What isn't saved of the near duplicates, 'images', 'text' or None.
+        """
+        return self.__skip
+
+    def _check_settings(self, settings):
+        """Function to save the settings of the signatures in a new index, or to
+        check that they are the ones of an existing index.
+
+        Args:
+            settings (dict): Settings of the signatures.
+        """
+        saved = dict(self.__connection.execute('SELECT name, value FROM settings'))
+        if not saved:
+            with self.__connection:
+                self.__connection.executemany('INSERT INTO settings (name, value) VALUES (?, ?)',
+                                              [(name, str(value)) for name, value in settings.items()])
+            return
+        if saved != {name: str(value) for name, value in settings.items()}:
+            raise ValueError(f'The duplicates index {self.__path} was created with {saved}.')
+
+    def _band_keys(self, signature):
+        """Function to get the LSH bucket of every band of a signature.
+
+        Args:
+            signature (array): Signature of a news article
+
+        Returns:
+            list: List with the key of every band, as signed 64 bit ints.
+        """
+        data = signature.tobytes()
+        band_size = len(data) // self.__bands
+        return [int.from_bytes(hashlib.blake2b(bytes([band]) + data[band * band_size:(band + 1) * band_size],
+                                               digest_size=8).digest(), 'little', signed=True)
+                for band in range(self.__bands)]
+
+    def _find_cluster(self, signature):
+        """Function to find the cluster of the most similar indexed news article.
+
+        Args:
+            signature (array): Signature of a news article
+
+        Returns:
+            int: Cluster id, or None if no indexed news article is similar enough.
+        """
+        keys = self._band_keys(signature)
+        placeholders = ', '.join('?' * len(keys))
+        query = ('SELECT id, cluster_id, signature FROM articles WHERE id IN '
+                 f'(SELECT article_id FROM lsh_buckets WHERE key IN ({placeholders}))')
+        best_similarity, best_cluster = self.__threshold, None
+        for _, cluster_id, data in self.__connection.execute(query, keys):
+            candidate = array('I')
+            candidate.frombytes(data)
+            candidate_similarity = similarity(signature, candidate)
+            if candidate_similarity >= best_similarity:
+                best_similarity, best_cluster = candidate_similarity, cluster_id
+        return best_cluster
+
+    def _assign(self, article, signature):
+        """Function to index a news article and get its cluster.
+
+        Args:
+            article (Article): News article
+            signature (array): Its signature, or None if it has no text.
+
+        Returns:
+            int, bool: Cluster id and if the news article is a near duplicate of
+            another one already indexed.
+        """
+        row = self.__connection.execute('SELECT cluster_id FROM articles WHERE url = ?', (article.url,)).fetchone()
+        if row is not None:
+            return row[0], False
+        cluster_id = self._find_cluster(signature) if signature is not None else None
+        cursor = self.__connection.execute('INSERT INTO articles (url, newspaper, cluster_id, signature) '
+                                           'VALUES (?, ?, ?, ?)',
+                                           (article.url, article.newspaper, cluster_id,
+                                            signature.tobytes() if signature is not None else None))
+        article_id = cursor.lastrowid
+        if cluster_id is None:
+            self.__connection.execute('UPDATE articles SET cluster_id = ? WHERE id = ?', (article_id, article_id))
+        if signature is not None:
+            self.__connection.executemany('INSERT OR IGNORE INTO lsh_buckets (key, article_id) VALUES (?, ?)',
+                                          [(key, article_id) for key in self._band_keys(signature)])
+        return (cluster_id, True) if cluster_id is not None else (article_id, False)
+
+    def tag_many(self, articles):
+        """Function to tag a batch of news articles with their cluster. The
+        signatures of the whole batch are computed at once, and the near
+        duplicates inside the batch are found too.
+
+        Args:
+            articles (list): List with Article objects.
+
+        Returns:
+            list: List with the Article objects with their cluster_id. The near
+            duplicates lose their images or text, depending on skip.
+        """
+        articles = list(articles)
+        signatures = self.__minhasher.signatures([shingle_hashes(article.paragraphs, self.__shingle_size)
+                                                  for article in articles])
+        tagged = []
+        with self.__lock, self.__connection:
+            for article, signature in zip(articles, signatures):
+                cluster_id, is_duplicate = self._assign(article, signature)
+                changes = {'cluster_id': cluster_id}
+                if is_duplicate and self.__skip is not None:
+                    changes['images'] = ()
+                    if self.__skip == 'text':
+                        changes['paragraphs'] = ()
+                tagged.append(replace(article, **changes))
+        return tagged
+
+    def tag(self, article):
+        """Function to tag a news article with its cluster.
+
+        Args:
+            article (Article): News article
+
+        Returns:
+            Article: The news article with its cluster_id.
+        """
+        return self.tag_many([article])[0]
+
+    def counts(self):
+        """Function to count the news articles and clusters of the index.
+
+        Returns:
+            dict: Number of news articles, clusters and near duplicates.
+        """
+        with self.__lock:
+            n_articles, n_clusters = self.__connection.execute(
+                'SELECT COUNT(*), COUNT(DISTINCT cluster_id) FROM articles').fetchone()
+        return {'articles': n_articles, 'clusters': n_clusters, 'duplicates': n_articles - n_clusters}
+
+    def close(self):
+        """Function to close the database.
+        """
+        with self.__lock:
+            self.__connection.close()
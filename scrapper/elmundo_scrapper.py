@@ -35,7 +35,7 @@ class ElMundoScrapper(NewsScrapper):
     so it's important to look for that class first in case to do an own
     scrapper.
     """
-    def __init__(self, parser='html.parser') -> None:
+    def __init__(self, parser='html.parser', **kwargs) -> None:
         name = 'elmundo'
         url = 'https://www.elmundo.es/'
         header_name_news = 'header'
@@ -44,9 +44,12 @@ class ElMundoScrapper(NewsScrapper):
         newsarticle_title_class = 'ue-c-article__headline js-headline'
         newsarticle_body_name = 'div'
         newsarticle_body_class = 'ue-l-article__body ue-c-article__body'
+        kwargs.setdefault('requests_per_second', 2.0)
+        kwargs.setdefault('burst', 5)
+        kwargs.setdefault('feed_urls', ['https://e00-elmundo.uecdn.es/elmundo/rss/portada.xml'])
         super().__init__(name, url, parser, header_name_news, header_class_news,
                          newsarticle_title_name, newsarticle_title_class, 
-                         newsarticle_body_name, newsarticle_body_class)
+                         newsarticle_body_name, newsarticle_body_class, **kwargs)
 
     def _get_link_path(self, link):
         """Function that process the news url to create a path for it,
@@ -88,3 +91,15 @@ class ElMundoScrapper(NewsScrapper):
             str: Full url of the news
         """
         return link
+
+    def _get_link_from_url(self, news_url):
+        """Function to get the news link from the full url of a news article.
+        In ElMundo the links are the full urls.
+
+        Args:
+            news_url (str): Full url of the news
+
+        Returns:
+            str: News link.
+        """
+        return news_url
@@ -35,7 +35,7 @@ class ElPaisScrapper(NewsScrapper):
     so it's important to look for that class first in case to do an own
     scrapper.
     """
-    def __init__(self, parser='html.parser') -> None:
+    def __init__(self, parser='html.parser', **kwargs) -> None:
         name = 'elpais'
         url = 'https://elpais.com'
         header_name_news = 'h2'
@@ -44,9 +44,12 @@ class ElPaisScrapper(NewsScrapper):
         newsarticle_title_class = 'a_t'
         newsarticle_body_name = 'div'
         newsarticle_body_class = 'a_c clearfix'
+        kwargs.setdefault('requests_per_second', 2.0)
+        kwargs.setdefault('burst', 5)
+        kwargs.setdefault('feed_urls', ['https://feeds.elpais.com/mrss-s/pages/ep/site/elpais.com/portada'])
         super().__init__(name, url, parser, header_name_news, header_class_news,
                          newsarticle_title_name, newsarticle_title_class, 
-                         newsarticle_body_name, newsarticle_body_class)
+                         newsarticle_body_name, newsarticle_body_class, **kwargs)
 
     def _get_link_path(self, link):
         """Function that process the news url to create a path for it,
@@ -0,0 +1,61 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Extraction workers for the multiprocess pipeline.
+
+Parsing the news articles with BeautifulSoup holds the GIL, so it's done in
+a pool of processes. Every worker process builds its own scrapper once, and
+then turns the html of the news articles into Article records.
+"""
+import time
+
+from scrapper.article import Article
+
+_WORKER_SCRAPPER = None
+
+
+def init_extraction_worker(scrapper_class, parser, selective_parsing):
+    """Function to initialize an extraction worker process.
+
+    Args:
+        scrapper_class (type): NewsScrapper subclass of the newspaper
+        parser (str): Parser used by BeautifulSoup
+        selective_parsing (bool): If True only the parts of the pages used by the scrapper are parsed.
+    """
+    global _WORKER_SCRAPPER  # pylint: disable=global-statement
+    _WORKER_SCRAPPER = scrapper_class(parser=parser, selective_parsing=selective_parsing,
+                                      url_index=None)
+
+
+def extract_article(link, news_url, website_html):
+    """Function to extract the data from the html of a news article in an
+    extraction worker process.
+
+    Args:
+        link (str): News link as returned by _clean_news_links
+        news_url (str): Full url of the news
+        website_html (str/bytes): Html of the news article, bytes are decoded by BeautifulSoup.
+
+    Returns:
+        Article, float: The news article and the seconds spent parsing it.
+    """
+    start = time.perf_counter()
+    text, images_src, title = _WORKER_SCRAPPER.extract_news_article(website_html)
+    parse_seconds = time.perf_counter() - start
+    return Article.from_extraction(_WORKER_SCRAPPER.name_, link, news_url, title, text, images_src), parse_seconds
@@ -0,0 +1,124 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Discovery of news articles from RSS/Atom feeds and news sitemaps.
+
+The feeds are read with an incremental XML parser while they are being
+downloaded, clearing every item once it's read, so the memory doesn't
+grow with the size of the feed.
+"""
+from collections import namedtuple
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from xml.etree.ElementTree import iterparse
+
+
+FeedEntry = namedtuple('FeedEntry', ['url', 'published', 'is_sitemap'], defaults=(False,))
+FeedEntry.__doc__ = """Entry of a feed or sitemap: the url, its publish date
+(timezone aware, or None) and if the url is another sitemap from a sitemap index."""
+
+# Elements that contain one entry, for RSS, Atom, sitemaps and sitemap indexes.
+ENTRY_TAGS = frozenset(['item', 'entry', 'url', 'sitemap'])
+DATE_TAGS = ('publication_date', 'published', 'pubDate', 'date', 'updated', 'lastmod')
+
+
+def _local_name(tag):
+    """Function to remove the namespace from an XML tag.
+
+    Args:
+        tag (str): Tag as '{namespace}name' or 'name'
+
+    Returns:
+        str: Name of the tag.
+    """
+    return tag.rpartition('}')[2]
+
+
+def parse_date(value):
+    """Function to parse the dates used by RSS (RFC 822) and by Atom and the
+    sitemaps (ISO 8601). Dates without timezone are taken as UTC.
+
+    Args:
+        value (str): Date
+
+    Returns:
+        datetime: Timezone aware date, or None if it can't be parsed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        date = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date
+
+
+def _entry_from_element(element):
+    """Function to get the url and date of an entry element.
+
+    Args:
+        element (Element): item, entry, url or sitemap element
+
+    Returns:
+        FeedEntry: Entry, or None if the element doesn't have an url.
+    """
+    url, dates = None, {}
+    for child in element.iter():
+        name = _local_name(child.tag)
+        if name in ('link', 'loc') and url is None:
+            # Atom links have the url in href, RSS links and sitemap locs in the text.
+            if child.get('href') and child.get('rel', 'alternate') == 'alternate':
+                url = child.get('href')
+            elif child.text and child.text.strip():
+                url = child.text.strip()
+        elif name in DATE_TAGS and name not in dates:
+            dates[name] = child.text
+    if url is None:
+        return None
+    published = next((parse_date(dates[name]) for name in DATE_TAGS if dates.get(name)), None)
+    return FeedEntry(url, published, _local_name(element.tag) == 'sitemap')
+
+
+def iter_feed_entries(stream):
+    """Function to read the entries of an RSS/Atom feed or a sitemap
+    incrementally from a stream.
+
+    Args:
+        stream (file object): Binary stream with the XML
+
+    Yields:
+        FeedEntry: Every entry of the feed.
+    """
+    depth = 0
+    for event, element in iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            continue
+        depth -= 1
+        if _local_name(element.tag) in ENTRY_TAGS and depth <= 2:
+            entry = _entry_from_element(element)
+            element.clear()
+            if entry is not None:
+                yield entry
@@ -0,0 +1,175 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Persistent frontier for the deep crawls.
+
+The urls waiting to be crawled are kept in a SQLite database instead of
+in memory, so a deep crawl can go through months of archive pages with
+bounded memory and continue after a crash without downloading again the
+urls already done.
+"""
+import sqlite3
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+
+FrontierItem = namedtuple('FrontierItem', ['url', 'kind', 'depth', 'section', 'priority'])
+FrontierItem.__doc__ = """Url of the frontier: kind is 'page' for the pages whose
+links are followed and 'article' for the news articles to save."""
+
+PENDING = 'pending'
+IN_PROGRESS = 'in_progress'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class Frontier:
+    """Class that implements a persistent priority queue of urls. Every url
+    is only added once, so the urls done are never crawled again, and the
+    number of news articles of every section can be limited.
+    """
+    def __init__(self, path='frontier.sqlite', max_per_section=None) -> None:
+        self.__path = path
+        self.__max_per_section = max_per_section
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        with self.__connection:
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS frontier (url TEXT PRIMARY KEY, '
+                                      'newspaper TEXT, kind TEXT, depth INTEGER, section TEXT, '
+                                      'priority INTEGER, state TEXT, added_at TEXT)')
+            self.__connection.execute('CREATE INDEX IF NOT EXISTS frontier_next ON frontier '
+                                      '(newspaper, state, priority DESC, depth)')
+
+    @property
+    def path_(self):
+        """Path property.
+
+        Returns:
+            str: Path of the SQLite database.
+        """
+        return self.__path
+
+    def _section_counts(self, newspaper, sections):
+        """Function to count the news articles already in the frontier for some sections.
+
+        Args:
+            newspaper (str): Name of the newspaper
+            sections (set): Sections to count
+
+        Returns:
+            dict: Number of news articles of every section.
+        """
+        query = "SELECT COUNT(*) FROM frontier WHERE newspaper = ? AND section = ? AND kind = 'article'"
+        return {section: self.__connection.execute(query, (newspaper, section)).fetchone()[0]
+                for section in sections}
+
+    def push_many(self, items, newspaper):
+        """Function to add urls to the frontier. The urls already in the
+        frontier, and the news articles over the limit of their section, are ignored.
+
+        Args:
+            items (list): List with FrontierItem objects
+            newspaper (str): Name of the newspaper of the urls.
+
+        Returns:
+            int: Number of urls added.
+        """
+        added_at = datetime.now().isoformat(timespec='seconds')
+        with self.__lock, self.__connection:
+            if self.__max_per_section is not None:
+                counts = self._section_counts(newspaper, {item.section for item in items if item.kind == 'article'})
+            n_added = 0
+            for item in items:
+                if item.kind == 'article' and self.__max_per_section is not None:
+                    if counts[item.section] >= self.__max_per_section:
+                        continue
+                cursor = self.__connection.execute(
+                    'INSERT OR IGNORE INTO frontier (url, newspaper, kind, depth, section, priority, state, '
+                    'added_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (item.url, newspaper, item.kind, item.depth, item.section, item.priority, PENDING, added_at))
+                if cursor.rowcount:
+                    n_added += 1
+                    if item.kind == 'article' and self.__max_per_section is not None:
+                        counts[item.section] += 1
+            return n_added
+
+    def pop_many(self, newspaper, n_items):
+        """Function to take the pending urls with more priority, and less
+        depth, marking them as in progress.
+
+        Args:
+            newspaper (str): Name of the newspaper
+            n_items (int): Max number of urls to take.
+
+        Returns:
+            list: List with FrontierItem objects.
+        """
+        with self.__lock, self.__connection:
+            rows = self.__connection.execute(
+                'SELECT url, kind, depth, section, priority FROM frontier WHERE newspaper = ? AND state = ? '
+                'ORDER BY priority DESC, depth, rowid LIMIT ?', (newspaper, PENDING, n_items)).fetchall()
+            self.__connection.executemany('UPDATE frontier SET state = ? WHERE url = ?',
+                                          [(IN_PROGRESS, row[0]) for row in rows])
+        return [FrontierItem(*row) for row in rows]
+
+    def mark_many(self, urls, state):
+        """Function to change the state of some urls.
+
+        Args:
+            urls (list): List with the urls
+            state (str): New state, like DONE or FAILED.
+        """
+        with self.__lock, self.__connection:
+            self.__connection.executemany('UPDATE frontier SET state = ? WHERE url = ?',
+                                          [(state, url) for url in urls])
+
+    def reset_in_progress(self, newspaper):
+        """Function to return to pending the urls that were in progress when a
+        previous crawl stopped, so the crawl can be resumed.
+
+        Args:
+            newspaper (str): Name of the newspaper
+
+        Returns:
+            int: Number of urls returned to pending.
+        """
+        with self.__lock, self.__connection:
+            return self.__connection.execute('UPDATE frontier SET state = ? WHERE newspaper = ? AND state = ?',
+                                             (PENDING, newspaper, IN_PROGRESS)).rowcount
+
+    def counts(self, newspaper):
+        """Function to count the urls of a newspaper in every state.
+
+        Args:
+            newspaper (str): Name of the newspaper
+
+        Returns:
+            dict: Number of urls of every state.
+        """
+        with self.__lock:
+            rows = self.__connection.execute('SELECT state, COUNT(*) FROM frontier WHERE newspaper = ? '
+                                             'GROUP BY state', (newspaper,)).fetchall()
+        return dict(rows)
+
+    def close(self):
+        """Function to close the database.
+        """
+        with self.__lock:
+            self.__connection.close()
@@ -0,0 +1,138 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""On disk HTTP cache for the newspaper pages.
+
+The cache keeps the body, ETag and Last-Modified of every page, so the next
+request to the same url is a conditional GET. When the server answers 304
+Not Modified, the page isn't transferred again.
+"""
+import os
+import json
+import hashlib
+import threading
+
+
+class HttpCache:
+    """Class that implements an on disk cache for conditional GET requests.
+    Every url is saved in two files named by the sha256 of the url: one with
+    the validators and the encoding, and another one with the body.
+    """
+    def __init__(self, root='http_cache') -> None:
+        self.__root = root
+        os.makedirs(root, exist_ok=True)
+
+    @property
+    def root_(self):
+        """Root property.
+
+        Returns:
+            str: Folder of the cache.
+        """
+        return self.__root
+
+    def _paths(self, url):
+        """Function to get the paths of the cached files of an url.
+
+        Args:
+            url (str): Cached url
+
+        Returns:
+            str, str: Path of the metadata file and path of the body file.
+        """
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base_path = os.path.join(self.__root, key[:2], key)
+        return base_path + '.json', base_path + '.body'
+
+    def _load_metadata(self, url):
+        """Function to load the cached metadata of an url.
+
+        Args:
+            url (str): Cached url
+
+        Returns:
+            dict: Metadata of the url, or None if it isn't cached.
+        """
+        metadata_path, body_path = self._paths(url)
+        if not os.path.exists(metadata_path) or not os.path.exists(body_path):
+            return None
+        try:
+            with open(metadata_path, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, url):
+        """Function to get the headers for a conditional GET of an url.
+
+        Args:
+            url (str): Url that is going to be requested
+
+        Returns:
+            dict: If-None-Match and If-Modified-Since headers, empty if the url isn't cached.
+        """
+        metadata = self._load_metadata(url)
+        if metadata is None:
+            return {}
+        headers = {}
+        if metadata.get('etag'):
+            headers['If-None-Match'] = metadata['etag']
+        if metadata.get('last_modified'):
+            headers['If-Modified-Since'] = metadata['last_modified']
+        return headers
+
+    def load_text(self, url):
+        """Function to load the cached body of an url.
+
+        Args:
+            url (str): Cached url
+
+        Returns:
+            str: Decoded body of the url, or None if it isn't cached.
+        """
+        metadata = self._load_metadata(url)
+        if metadata is None:
+            return None
+        with open(self._paths(url)[1], 'rb') as file:
+            body = file.read()
+        return body.decode(metadata.get('encoding') or 'utf-8', errors='replace')
+
+    def store(self, url, response):
+        """Function to save a response in the cache. Only the successful responses
+        with an ETag or a Last-Modified header are saved.
+
+        Args:
+            url (str): Requested url
+            response (requests.Response): Response from the url.
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+        metadata_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(metadata_path), exist_ok=True)
+        metadata = {'url': url, 'etag': etag, 'last_modified': last_modified,
+                    'encoding': response.encoding}
+        # Body first, so the metadata never points to an incomplete body.
+        for path, mode, content in ((body_path, 'wb', response.content),
+                                    (metadata_path, 'w', json.dumps(metadata))):
+            tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp_path, mode) as file:
+                file.write(content)
+            os.replace(tmp_path, path)
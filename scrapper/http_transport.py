@@ -0,0 +1,231 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""HTTP transport shared by the newspaper scrappers.
+
+Every scrapper owns one transport, so all the requests done to a newspaper
+reuse the same keep-alive connections instead of opening a new TCP+TLS
+connection for each news article.
+"""
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from scrapper.retry import RETRYABLE_STATUS, RetryableError, parse_retry_after
+
+
+class ResponseTooLarge(requests.RequestException):
+    """Error raised when the body of a response is bigger than the max size of
+    the transport. It isn't retried.
+    """
+
+
+class HttpTransport:
+    """Class that wraps a requests Session with connection pooling, timeouts,
+    retries and default headers. If a rate limiter is given every request
+    waits for it before being sent.
+
+    Connection errors are retried right away by urllib3. Overloaded or
+    throttling answers (429 and 5xx) raise RetryableError, so the crawl can
+    retry them later, and are recorded in the circuit breaker, if given.
+
+    Compression is negotiated by requests, which asks for gzip and deflate,
+    and also for brotli when the brotli package is installed.
+
+    With max_body_bytes the bodies are read in chunks and the download is
+    aborted as soon as it's bigger, raising ResponseTooLarge. The requests
+    done with stream=True are read by the caller and aren't limited.
+    """
+    BODY_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, headers=None, timeout=(5.0, 30.0), max_retries=3,
+                 backoff_factor=0.5, pool_maxsize=10, rate_limiter=None, circuit_breaker=None,
+                 max_body_bytes=None) -> None:
+        self.__timeout = timeout
+        self.__max_body_bytes = max_body_bytes
+        self.__rate_limiter = rate_limiter
+        self.__circuit_breaker = circuit_breaker
+        self.__session = requests.Session()
+        if headers:
+            self.__session.headers.update(headers)
+        retries = Retry(total=max_retries, backoff_factor=backoff_factor, respect_retry_after_header=False,
+                        allowed_methods=frozenset(['GET', 'HEAD']))
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize,
+                              max_retries=retries)
+        self.__session.mount('http://', adapter)
+        self.__session.mount('https://', adapter)
+
+    @property
+    def session_(self):
+        """Session property.
+
+        Returns:
+            requests.Session: Session used to do the requests.
+        """
+        return self.__session
+
+    @property
+    def timeout_(self):
+        """Timeout property.
+
+        Returns:
+            float/tuple: Connect and read timeout for every request.
+        """
+        return self.__timeout
+
+    @property
+    def max_body_bytes_(self):
+        """Max body bytes property.
+
+        Returns:
+            int: Max size of the decoded body of a response, or None.
+        """
+        return self.__max_body_bytes
+
+    @property
+    def circuit_breaker_(self):
+        """Circuit breaker property.
+
+        Returns:
+            CircuitBreaker: Circuit breaker of the hosts, or None.
+        """
+        return self.__circuit_breaker
+
+    @property
+    def rate_limiter_(self):
+        """Rate limiter property.
+
+        Returns:
+            RateLimiter: Rate limiter used before every request, or None.
+        """
+        return self.__rate_limiter
+
+    def _get_robots_txt(self, robots_url):
+        """Function to download a robots.txt without waiting for the rate limiter.
+
+        Args:
+            robots_url (str): Url of the robots.txt
+
+        Returns:
+            str: Text of the robots.txt, empty if it doesn't exist.
+        """
+        response = self.__session.get(robots_url, timeout=self.__timeout)
+        return response.text if response.status_code == 200 else ''
+
+    def wait_for_rate_limit(self, url):
+        """Function to wait until the rate limiter allows a request to the url.
+
+        Args:
+            url (str): Url that is going to be requested
+        """
+        if self.__rate_limiter is not None:
+            self.__rate_limiter.acquire(url, fetch_robots=self._get_robots_txt)
+
+    def get(self, url, **kwargs):
+        """Function to do a GET request using the pooled connections.
+
+        Args:
+            url (str): Url to be requested
+            **kwargs: Extra arguments for requests.Session.get
+
+        Returns:
+            requests.Response: Response from the url.
+
+        Raises:
+            RetryableError: If the answer is 429 or 5xx, or the circuit breaker of the host is open.
+            ResponseTooLarge: If the body is bigger than max_body_bytes.
+        """
+        kwargs.setdefault('timeout', self.__timeout)
+        read_body = self.__max_body_bytes is not None and not kwargs.get('stream')
+        if read_body:
+            kwargs['stream'] = True
+        host = urlparse(url).netloc
+        if self.__circuit_breaker is not None:
+            self.__circuit_breaker.before_request(host)
+        try:
+            self.wait_for_rate_limit(url)
+            response = self.__session.get(url, **kwargs)
+        except requests.RequestException:
+            if self.__circuit_breaker is not None:
+                self.__circuit_breaker.record_failure(host)
+            raise
+        except BaseException:
+            # Not an answer from the host, but the trial request must be released.
+            if self.__circuit_breaker is not None:
+                self.__circuit_breaker.release_trial(host)
+            raise
+        if response.status_code in RETRYABLE_STATUS:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if self.__circuit_breaker is not None:
+                self.__circuit_breaker.record_failure(host, retry_after=retry_after)
+            response.close()
+            raise RetryableError(f'{response.status_code} answer from {url}', retry_after=retry_after,
+                                 response=response)
+        if self.__circuit_breaker is not None:
+            self.__circuit_breaker.record_success(host)
+        if read_body:
+            self._read_body(response, url)
+        return response
+
+    def _read_body(self, response, url):
+        """Function to read the body of a streamed response in chunks, aborting
+        as soon as it's bigger than max_body_bytes. The body is kept in the
+        response, so its content and text can be used as usual.
+
+        Args:
+            response (requests.Response): Response requested with stream=True
+            url (str): Url of the response, for the error message.
+
+        Raises:
+            ResponseTooLarge: If the body is bigger than max_body_bytes.
+        """
+        # The compressed size is never bigger than the decoded one, so a big
+        # Content-Length is enough to give up before reading anything.
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > self.__max_body_bytes:
+            response.close()
+            raise ResponseTooLarge(f'{url} has {content_length} bytes, more than the max of '
+                                   f'{self.__max_body_bytes}', response=response)
+        chunks, size = [], 0
+        for chunk in response.iter_content(chunk_size=self.BODY_CHUNK_SIZE):
+            size += len(chunk)
+            if size > self.__max_body_bytes:
+                response.close()
+                raise ResponseTooLarge(f'{url} is bigger than the max of {self.__max_body_bytes} bytes',
+                                       response=response)
+            chunks.append(chunk)
+        response._content = b''.join(chunks)  # pylint: disable=protected-access
+
+    def get_text(self, url):
+        """Function to get the text from a url.
+
+        Args:
+            url (str): Url to be requested
+
+        Returns:
+            str: Decoded body of the response.
+        """
+        return self.get(url).text
+
+    def close(self):
+        """Function to close all the pooled connections.
+        """
+        self.__session.close()
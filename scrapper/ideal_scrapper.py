@@ -25,7 +25,6 @@ Author: Alberto Argente del Castillo Garrido
 Github: AlArgente
 """
 
-import requests
 from scrapper.news_scrapper import NewsScrapper
 
 
@@ -36,7 +35,7 @@ class IdealScrapper(NewsScrapper):
     so it's important to look for that class first in case to do an own
     scrapper.
     """
-    def __init__(self, parser='html.parser') -> None:
+    def __init__(self, parser='html.parser', headers=None, **kwargs) -> None:
         name = 'ideal'
         url = 'https://www.ideal.es'
         header_name_news = 'h2'
@@ -45,9 +44,15 @@ class IdealScrapper(NewsScrapper):
         newsarticle_title_class = 'voc-title'
         newsarticle_body_name = 'p'
         newsarticle_body_class = 'voc-paragraph'
+        kwargs.setdefault('requests_per_second', 1.0)
+        kwargs.setdefault('burst', 3)
+        kwargs.setdefault('feed_urls', ['https://www.ideal.es/rss/2.0/portada'])
+        default_headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.1; WOW64; rv:50.0) Gecko/20100101 Firefox/50.0'}
+        default_headers.update(headers or {})
         super().__init__(name, url, parser, header_name_news, header_class_news,
                          newsarticle_title_name, newsarticle_title_class, 
-                         newsarticle_body_name, newsarticle_body_class)
+                         newsarticle_body_name, newsarticle_body_class,
+                         headers=default_headers, **kwargs)
 
     def _get_link_path(self, link):
         """Function that process the news url to create a path for it,
@@ -89,20 +94,5 @@ class IdealScrapper(NewsScrapper):
         """
         return self.url_ + link
 
-    def _init_bs4(self, url: str):
-        """Function to init a BeautifulSoup object
-        Overrided to be able to extract the data from the newspaper,
-        beacause of the need of headers.
-
-        Args:
-            url (str): Url from newspaper to be scrapped
-
-        Returns:
-            BeautifulSoup object: BeautifulSoup object that has parsed the url
-        """
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.1; WOW64; rv:50.0) Gecko/20100101 Firefox/50.0'}
-        source=requests.get(url, headers=headers).text
-        return self.bs4_(source, self.parser_)
-
     def _get_paragraph_text(self, article):
         return [art.getText() for art in article]
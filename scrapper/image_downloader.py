@@ -0,0 +1,199 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Image downloader used by the newspaper scrappers.
+
+The images from a news article are downloaded in parallel through the
+scrapper transport, streaming every body to disk in chunks. The images
+bigger than the max_body_bytes of the transport are dropped. If an image
+store is given, the images already stored are not downloaded again.
+"""
+import os
+import hashlib
+from collections import namedtuple
+from urllib.parse import urljoin, urlparse, unquote
+from concurrent.futures import ThreadPoolExecutor
+from scrapper.http_transport import ResponseTooLarge
+
+
+ImageResult = namedtuple('ImageResult', ['url', 'path', 'status', 'error', 'blob_path'],
+                         defaults=(None,))
+ImageResult.__doc__ = """Result of an image download. The status is one of
+'downloaded', 'cached', 'skipped' or 'failed'. The blob_path is the path of
+the image in the image store, if used."""
+
+
+class ImageDownloader:
+    """Class that downloads the images from a news article using a bounded
+    pool of workers.
+    """
+    def __init__(self, transport, max_workers=4, chunk_size=64 * 1024, image_store=None) -> None:
+        self.__transport = transport
+        self.__image_store = image_store
+        self.__max_workers = max_workers
+        self.__chunk_size = chunk_size
+
+    @property
+    def max_workers_(self):
+        """Max workers property.
+
+        Returns:
+            int: Max number of images downloaded at the same time.
+        """
+        return self.__max_workers
+
+    @property
+    def image_store_(self):
+        """Image store property.
+
+        Returns:
+            ImageStore: Store where the images are saved, or None.
+        """
+        return self.__image_store
+
+    @staticmethod
+    def _file_names(images_url):
+        """Function to get a file name for every image url. As wget does, the
+        name is the last part of the url path, adding a suffix if repeated.
+
+        Args:
+            images_url (list): List with the images urls
+
+        Returns:
+            list: List with the file names.
+        """
+        file_names, used_names = [], set()
+        for img_url in images_url:
+            file_name = os.path.basename(unquote(urlparse(img_url).path)) or 'index.html'
+            candidate, cnt = file_name, 0
+            while candidate in used_names:
+                cnt += 1
+                candidate = f'{file_name}.{cnt}'
+            used_names.add(candidate)
+            file_names.append(candidate)
+        return file_names
+
+    def _stream_to_file(self, img_url, tmp_path):
+        """Function to stream an image to a file.
+
+        Args:
+            img_url (str): Image url
+            tmp_path (str): Path where the image is written
+
+        Returns:
+            str: Hex sha256 digest of the image content.
+
+        Raises:
+            ResponseTooLarge: If the image is bigger than the max_body_bytes of the transport.
+        """
+        max_bytes = self.__transport.max_body_bytes_
+        digest = hashlib.sha256()
+        with self.__transport.get(img_url, stream=True) as response:
+            response.raise_for_status()
+            content_length = response.headers.get('Content-Length', '')
+            if max_bytes is not None and content_length.isdigit() and int(content_length) > max_bytes:
+                raise ResponseTooLarge(f'{img_url} has {content_length} bytes, more than the max of {max_bytes}',
+                                       response=response)
+            size = 0
+            with open(tmp_path, 'wb') as file:
+                for chunk in response.iter_content(chunk_size=self.__chunk_size):
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise ResponseTooLarge(f'{img_url} is bigger than the max of {max_bytes} bytes',
+                                               response=response)
+                    digest.update(chunk)
+                    file.write(chunk)
+        return digest.hexdigest()
+
+    def _download_image(self, img_url, file_path):
+        """Function to stream an image to disk. The image is written to a
+        temporal file that is renamed when the download is complete.
+
+        Args:
+            img_url (str): Image url
+            file_path (str): Path where the image is saved
+
+        Returns:
+            ImageResult: Result of the download.
+        """
+        if self.__image_store is not None:
+            return self._download_image_to_store(img_url, file_path)
+        tmp_path = file_path + '.part'
+        try:
+            self._stream_to_file(img_url, tmp_path)
+            os.replace(tmp_path, file_path)
+        except Exception as err:  # pylint: disable=broad-except
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return ImageResult(img_url, None, 'failed', str(err))
+        return ImageResult(img_url, file_path, 'downloaded', None)
+
+    def _download_image_to_store(self, img_url, file_path):
+        """Function to get an image through the image store. The image is only
+        downloaded if it isn't stored yet, and then it's linked into the news
+        article folder.
+
+        Args:
+            img_url (str): Image url
+            file_path (str): Path where the image is linked
+
+        Returns:
+            ImageResult: Result of the download.
+        """
+        status = 'cached'
+        blob_path = self.__image_store.lookup(img_url)
+        if blob_path is None:
+            status = 'downloaded'
+            tmp_path = self.__image_store.temporary_file()
+            try:
+                sha256 = self._stream_to_file(img_url, tmp_path)
+            except Exception as err:  # pylint: disable=broad-except
+                os.remove(tmp_path)
+                return ImageResult(img_url, None, 'failed', str(err))
+            blob_path = self.__image_store.add(img_url, tmp_path, sha256)
+        path = file_path if self.__image_store.link(blob_path, file_path) else None
+        return ImageResult(img_url, path, status, None, blob_path)
+
+    def download(self, images_src, img_folder, base_url=None):
+        """Function to download the images from a news article into a folder.
+
+        Args:
+            images_src (list): List with the images urls
+            img_folder (str): Path to save the images
+            base_url (str): Url of the news article, used for the relative images urls.
+
+        Returns:
+            list: List with an ImageResult for every image url.
+        """
+        results = [None] * len(images_src)
+        to_download = []
+        for i, img_url in enumerate(images_src):
+            if not img_url or img_url.startswith('data:'):
+                results[i] = ImageResult(img_url, None, 'skipped', 'No downloadable url')
+                continue
+            to_download.append((i, urljoin(base_url, img_url) if base_url else img_url))
+        file_names = self._file_names([img_url for _, img_url in to_download])
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            futures = [(i, executor.submit(self._download_image, img_url, os.path.join(img_folder, file_name)))
+                       for (i, img_url), file_name in zip(to_download, file_names)]
+            for i, future in futures:
+                results[i] = future.result()
+        if self.__image_store is not None:
+            self.__image_store.write_manifest(img_folder, results)
+        return results
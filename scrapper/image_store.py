@@ -0,0 +1,173 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Content addressed store for the images from the news articles.
+
+Every image is saved once in a tree of files named by the sha256 of their
+content, and an index maps the image urls to their hash. The images that
+are already in the store are never downloaded again, and the news article
+folders only get hard links to the stored files and a manifest.
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+from urllib.parse import urlparse
+
+
+class ImageStore:
+    """Class that implements a content addressed store for images with an
+    url to hash index saved in a SQLite database.
+    """
+    MANIFEST_NAME = 'MANIFEST.txt'
+
+    def __init__(self, root='images', link_images=True) -> None:
+        self.__root = root
+        self.__link_images = link_images
+        self.__blobs_folder = os.path.join(root, 'blobs')
+        self.__tmp_folder = os.path.join(root, 'tmp')
+        os.makedirs(self.__blobs_folder, exist_ok=True)
+        os.makedirs(self.__tmp_folder, exist_ok=True)
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(os.path.join(root, 'index.sqlite'), check_same_thread=False)
+        with self.__connection:
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS images '
+                                      '(url TEXT PRIMARY KEY, sha256 TEXT NOT NULL, ext TEXT NOT NULL)')
+
+    @property
+    def root_(self):
+        """Root property.
+
+        Returns:
+            str: Folder of the store.
+        """
+        return self.__root
+
+    @staticmethod
+    def _extension(url):
+        """Function to get the extension of an image from its url.
+
+        Args:
+            url (str): Image url
+
+        Returns:
+            str: Extension of the image (with the dot), or an empty string.
+        """
+        ext = os.path.splitext(urlparse(url).path)[1].lower()
+        return ext if 1 < len(ext) <= 6 and ext[1:].isalnum() else ''
+
+    def _blob_path(self, sha256, ext):
+        """Function to get the path of a stored image from its hash.
+
+        Args:
+            sha256 (str): Hex digest of the image content
+            ext (str): Extension of the image
+
+        Returns:
+            str: Path of the image in the store.
+        """
+        return os.path.join(self.__blobs_folder, sha256[:2], sha256[2:4], sha256 + ext)
+
+    def lookup(self, url):
+        """Function to get the stored image of an url.
+
+        Args:
+            url (str): Image url
+
+        Returns:
+            str: Path of the image in the store, or None if it isn't stored.
+        """
+        with self.__lock:
+            row = self.__connection.execute('SELECT sha256, ext FROM images WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+        blob_path = self._blob_path(*row)
+        return blob_path if os.path.exists(blob_path) else None
+
+    def temporary_file(self):
+        """Function to create a temporal file inside the store, so it can be
+        moved to the blobs tree once its content is complete.
+
+        Returns:
+            str: Path of the temporal file.
+        """
+        file_descriptor, tmp_path = tempfile.mkstemp(dir=self.__tmp_folder, suffix='.part')
+        os.close(file_descriptor)
+        return tmp_path
+
+    def add(self, url, tmp_path, sha256):
+        """Function to add a downloaded image to the store.
+
+        Args:
+            url (str): Image url
+            tmp_path (str): Path of the downloaded image, created with temporary_file
+            sha256 (str): Hex digest of the image content
+
+        Returns:
+            str: Path of the image in the store.
+        """
+        ext = self._extension(url)
+        blob_path = self._blob_path(sha256, ext)
+        if os.path.exists(blob_path):
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            os.replace(tmp_path, blob_path)
+        with self.__lock, self.__connection:
+            self.__connection.execute('INSERT OR REPLACE INTO images (url, sha256, ext) VALUES (?, ?, ?)',
+                                      (url, sha256, ext))
+        return blob_path
+
+    def link(self, blob_path, file_path):
+        """Function to make a stored image available in a news article folder
+        with a hard link, so the image isn't copied.
+
+        Args:
+            blob_path (str): Path of the image in the store
+            file_path (str): Path of the image in the news article folder
+
+        Returns:
+            bool: True if the link has been created.
+        """
+        if not self.__link_images:
+            return False
+        try:
+            os.link(blob_path, file_path)
+        except OSError:
+            return False
+        return True
+
+    def write_manifest(self, img_folder, results):
+        """Function to write the manifest of the images from a news article,
+        with the url and the stored path of every image.
+
+        Args:
+            img_folder (str): Images folder of the news article
+            results (list): List with the ImageResult of every image.
+        """
+        with open(os.path.join(img_folder, self.MANIFEST_NAME), 'w') as file:
+            for result in results:
+                if result.blob_path is not None:
+                    file.write(f'{result.url}\t{result.blob_path}\n')
+
+    def close(self):
+        """Function to close the index database.
+        """
+        with self.__lock:
+            self.__connection.close()
@@ -0,0 +1,150 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Memory budget of the crawl.
+
+Big news articles, like live blogs, build huge BeautifulSoup trees, and
+many of them being parsed at the same time can use a lot of memory. The
+memory governor is a semaphore whose number of slots is halved while the
+resident memory of the process is over a budget, and grows again slowly
+once it's back under it.
+"""
+import os
+import threading
+import time
+
+try:
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    PAGE_SIZE = 4096
+
+
+def current_rss():
+    """Function to get the resident memory of this process. It's read from
+    /proc on Linux, and with the optional psutil package elsewhere.
+
+    Returns:
+        int: Resident memory in bytes, or None if it can't be measured.
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as file:
+            return int(file.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+class MemoryGovernor:
+    """Class that limits the number of news articles processed at the same
+    time while the process uses more memory than its budget. It's used as a
+    context manager around every news article, and can be shared by all the
+    scrappers of a process. Without a way of measuring the memory it never
+    limits anything.
+    """
+    def __init__(self, max_rss_bytes, max_concurrency=64, min_concurrency=1, low_watermark=0.8,
+                 check_interval=0.25) -> None:
+        self.__max_rss_bytes = max_rss_bytes
+        self.__max_concurrency = max_concurrency
+        self.__min_concurrency = min_concurrency
+        self.__low_watermark = low_watermark
+        self.__check_interval = check_interval
+        self.__limit = max_concurrency
+        self.__active = 0
+        self.__last_check = None
+        self.__n_sheds = 0
+        self.__condition = threading.Condition()
+
+    @property
+    def max_rss_bytes_(self):
+        """Max rss property.
+
+        Returns:
+            int: Memory budget of the process in bytes.
+        """
+        return self.__max_rss_bytes
+
+    @property
+    def limit_(self):
+        """Limit property.
+
+        Returns:
+            int: Max number of news articles processed at the same time right now.
+        """
+        return self.__limit
+
+    @property
+    def n_sheds_(self):
+        """Number of sheds property.
+
+        Returns:
+            int: Number of times the limit has been lowered for being over the budget.
+        """
+        return self.__n_sheds
+
+    def _adjust(self):
+        """Function to lower or raise the limit depending on the memory used.
+        The memory is measured at most once every check_interval seconds.
+        Must be called holding the condition.
+        """
+        now = time.monotonic()
+        if self.__last_check is not None and now - self.__last_check < self.__check_interval:
+            return
+        self.__last_check = now
+        rss = current_rss()
+        if rss is None:
+            return
+        if rss > self.__max_rss_bytes:
+            # Halve what is really running, a limit over it wouldn't shed anything.
+            limit = max(self.__min_concurrency, min(self.__limit, self.__active) // 2)
+            if limit < self.__limit:
+                self.__limit = limit
+                self.__n_sheds += 1
+                print(f'Memory at {rss / 1024 ** 2:.0f} MB, over the budget of '
+                      f'{self.__max_rss_bytes / 1024 ** 2:.0f} MB: concurrency lowered to {limit}.')
+        elif rss < self.__max_rss_bytes * self.__low_watermark and self.__limit < self.__max_concurrency:
+            self.__limit += 1
+            self.__condition.notify()
+
+    def acquire(self):
+        """Function to wait until a news article can be processed.
+        """
+        with self.__condition:
+            self._adjust()
+            while self.__active >= self.__limit:
+                self.__condition.wait(self.__check_interval)
+                self._adjust()
+            self.__active += 1
+
+    def release(self):
+        """Function to free the slot of a news article already processed.
+        """
+        with self.__condition:
+            self.__active -= 1
+            self.__condition.notify()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -0,0 +1,225 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""In-process metrics of the crawls.
+
+The scrappers record how long every stage takes, how many bytes they
+download and how many news articles they save or fail, in a registry
+that can be written at the end of a run as a Prometheus textfile (for
+the node exporter textfile collector) or as a JSON snapshot.
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+
+
+STAGE_SECONDS = 'scrapper_stage_seconds'
+DOWNLOADED_BYTES = 'scrapper_downloaded_bytes_total'
+ARTICLES = 'scrapper_articles_total'
+
+METRICS_HELP = {
+    STAGE_SECONDS: 'Seconds spent in every stage of the crawl.',
+    DOWNLOADED_BYTES: 'Bytes downloaded from the newspapers.',
+    ARTICLES: 'News articles saved or failed.',
+}
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Class that implements a histogram with fixed buckets, like the
+    Prometheus ones: every bucket counts the values lower or equal than it.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS) -> None:
+        self.__buckets = tuple(sorted(buckets))
+        self.__counts = [0] * len(self.__buckets)
+        self.__count = 0
+        self.__sum = 0.0
+
+    def observe(self, value):
+        """Function to add a value to the histogram.
+
+        Args:
+            value (float): Value observed
+        """
+        for i, bucket in enumerate(self.__buckets):
+            if value <= bucket:
+                self.__counts[i] += 1
+        self.__count += 1
+        self.__sum += value
+
+    def snapshot(self):
+        """Function to get the state of the histogram.
+
+        Returns:
+            dict: Count, sum and cumulative count of every bucket.
+        """
+        return {'count': self.__count, 'sum': self.__sum,
+                'buckets': dict(zip(self.__buckets, self.__counts))}
+
+
+def _labels_key(labels):
+    """Function to get a hashable key from some labels.
+
+    Args:
+        labels (dict): Labels of a metric
+
+    Returns:
+        tuple: Sorted labels.
+    """
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels, extra=()):
+    """Function to format the labels of a metric for the Prometheus text format.
+
+    Args:
+        labels (tuple): Sorted labels
+        extra (tuple): Labels added after them, like the bucket 'le'.
+
+    Returns:
+        str: Labels between braces, or an empty string.
+    """
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+class MetricsRegistry:
+    """Class that implements a thread safe registry of counters and histograms,
+    identified by their name and labels.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS) -> None:
+        self.__buckets = buckets
+        self.__lock = threading.Lock()
+        self.__counters = {}
+        self.__histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        """Function to increase a counter.
+
+        Args:
+            name (str): Name of the counter
+            value (float): Amount to add.
+            **labels: Labels of the counter, like the newspaper.
+        """
+        key = (name, _labels_key(labels))
+        with self.__lock:
+            self.__counters[key] = self.__counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Function to add a value to a histogram.
+
+        Args:
+            name (str): Name of the histogram
+            value (float): Value observed
+            **labels: Labels of the histogram, like the newspaper.
+        """
+        key = (name, _labels_key(labels))
+        with self.__lock:
+            histogram = self.__histograms.get(key)
+            if histogram is None:
+                histogram = self.__histograms[key] = Histogram(self.__buckets)
+            histogram.observe(value)
+
+    @contextlib.contextmanager
+    def timer(self, name, **labels):
+        """Function to observe in a histogram the seconds a block of code takes,
+        even if it raises.
+
+        Args:
+            name (str): Name of the histogram
+            **labels: Labels of the histogram, like the newspaper.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self):
+        """Function to remove all the metrics.
+        """
+        with self.__lock:
+            self.__counters.clear()
+            self.__histograms.clear()
+
+    def snapshot(self):
+        """Function to get the value of all the metrics.
+
+        Returns:
+            dict: Counters and histograms, with a list of the values of every name.
+        """
+        with self.__lock:
+            counters, histograms = {}, {}
+            for (name, labels), value in sorted(self.__counters.items()):
+                counters.setdefault(name, []).append({'labels': dict(labels), 'value': value})
+            for (name, labels), histogram in sorted(self.__histograms.items(), key=lambda item: item[0]):
+                histograms.setdefault(name, []).append({'labels': dict(labels), **histogram.snapshot()})
+        return {'timestamp': time.time(), 'counters': counters, 'histograms': histograms}
+
+    def to_prometheus(self):
+        """Function to get all the metrics in the Prometheus text format.
+
+        Returns:
+            str: Text with the metrics.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for metric_type, metrics in (('counter', snapshot['counters']), ('histogram', snapshot['histograms'])):
+            for name, values in metrics.items():
+                if name in METRICS_HELP:
+                    lines.append(f'# HELP {name} {METRICS_HELP[name]}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                for value in values:
+                    labels = _labels_key(value['labels'])
+                    if metric_type == 'counter':
+                        lines.append(f'{name}{_format_labels(labels)} {value["value"]}')
+                        continue
+                    for bucket, count in value['buckets'].items():
+                        lines.append(f'{name}_bucket{_format_labels(labels, [("le", str(bucket))])} {count}')
+                    lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {value["count"]}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {value["sum"]}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {value["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Function to write all the metrics to a file, as a JSON snapshot if
+        the path ends with .json or in the Prometheus text format otherwise.
+        The file is replaced at once, so it's never read half written.
+
+        Args:
+            path (str): Path of the file
+        """
+        if path.endswith('.json'):
+            content = json.dumps(self.snapshot(), indent=2)
+        else:
+            content = self.to_prometheus()
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as file:
+            file.write(content)
+        os.replace(tmp_path, path)
+
+
+# Registry shared by all the scrappers of the process.
+REGISTRY = MetricsRegistry()
@@ -21,20 +21,25 @@
 only has to select one it's name.
 """
 
-from scrapper.abc_scrapper import ABCScrapper
-from scrapper.elmundo_scrapper import ElMundoScrapper
-from scrapper.elpais_scrapper import ElPaisScrapper
-from scrapper.ideal_scrapper import IdealScrapper
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from scrapper.registry import load_newspaper
+from scrapper.url_index import UrlIndex
+from scrapper.daemon import PollingDaemon
+from scrapper.memory import MemoryGovernor
+from scrapper.dedup import Deduplicator
+from scrapper.search_index import SearchIndex
 
 
 class NewsFactory:
     """Factory class to select the correct scrapper with only
     using the name of the newspaper.
     """
-    def __init__(self, name: str, parser='html.parser'):
+    def __init__(self, name: str, parser='html.parser', **kwargs):
         self.__name = name
         self.__scrapper = None
-        self.__load_class(parser=parser)
+        self.__load_class(parser=parser, **kwargs)
 
     @property
     def scrapper_(self):
@@ -45,21 +50,238 @@ class NewsFactory:
         """
         return self.__scrapper
 
-    def __load_class(self, parser):
-        """Function to load the newspaper scrapper
+    def __load_class(self, parser, **kwargs):
+        """Function to load the newspaper scrapper from the registry, which
+        only imports the module of this newspaper.
+
+        Args:
+            parser (str): Parser used by BeautifulSoup, like 'html.parser' or
+            the faster 'lxml' if it's installed.
+            **kwargs: Extra arguments for the scrapper, like the headers or
+            the timeout used by its transport.
+        """
+        scrapper_class = load_newspaper(self.__name)
+        self.__scrapper = scrapper_class(parser=parser, **kwargs)
+
+    @staticmethod
+    def _run_one(name, parser, max_concurrency, max_articles, worker_budget, **kwargs):
+        """Function to run the concurrent pipeline of one newspaper for run_many.
+
+        Returns:
+            CrawlSummary: Summary of the crawl. If the crawl fails, it has one error.
+        """
+        from scrapper.news_scrapper import CrawlSummary  # pylint: disable=import-outside-toplevel
+        try:
+            factory = NewsFactory(name, parser=parser, **kwargs)
+        except Exception as err:  # pylint: disable=broad-except
+            print(f'Error creating the scrapper of {name}: {err}')
+            return CrawlSummary(name, 0, 0, 1, 0.0)
+        try:
+            summary = factory.scrapper_.pipeline_async(max_concurrency=max_concurrency, max_articles=max_articles,
+                                                       worker_budget=worker_budget)
+        except Exception as err:  # pylint: disable=broad-except
+            print(f'Error crawling {name}: {err}')
+            summary = CrawlSummary(name, 0, 0, 1, 0.0)
+        try:
+            factory.close()
+        except Exception as err:  # pylint: disable=broad-except
+            print(f'Error closing the scrapper of {name}: {err}')
+            summary = summary._replace(n_errors=summary.n_errors + 1)
+        return summary
+
+    @staticmethod
+    def run_many(names, max_workers=16, per_newspaper=4, max_articles=None, parser='html.parser', **kwargs):
+        """Function to run the pipeline of several newspapers at the same time in
+        this process. All the newspapers share one url index and a global budget
+        of news articles being downloaded at the same time.
+
+        Args:
+            names (list): Names of the newspapers
+            max_workers (int): Max number of news articles being downloaded at the same time.
+            per_newspaper (int): Max number of news articles being downloaded at the
+            same time from one newspaper.
+            max_articles (int): Max number of news articles downloaded from every newspaper.
+            parser (str): Parser used by BeautifulSoup
+            **kwargs: Extra arguments for the scrappers.
+
+        Returns:
+            list: List with the CrawlSummary of every newspaper.
+        """
+        worker_budget = threading.BoundedSemaphore(max_workers)
+        NewsFactory._share_memory_governor(kwargs)
+        owns_url_index = NewsFactory._share_url_index(kwargs)
+        owns_dedup = NewsFactory._share_dedup(kwargs)
+        owns_search_index = NewsFactory._share_search_index(kwargs)
+        try:
+            with ThreadPoolExecutor(max_workers=max(len(names), 1)) as executor:
+                futures = [executor.submit(NewsFactory._run_one, name, parser, per_newspaper, max_articles,
+                                           worker_budget, **kwargs) for name in names]
+                return [future.result() for future in futures]
+        finally:
+            if owns_url_index:
+                kwargs['url_index'].close()
+            if owns_dedup:
+                kwargs['dedup'].close()
+            if owns_search_index:
+                kwargs['search_index'].close()
+
+    @staticmethod
+    def _share_url_index(kwargs):
+        """Function to open the url index once, so it's shared by several scrappers.
+
+        Args:
+            kwargs (dict): Arguments for the scrappers, updated with the opened url index.
+
+        Returns:
+            bool: True if the url index has been opened here and must be closed by the caller.
+        """
+        url_index = kwargs.get('url_index', 'seen_urls.sqlite')
+        if not isinstance(url_index, str):
+            return False
+        kwargs['url_index'] = UrlIndex(url_index)
+        return True
+
+    @staticmethod
+    def _share_dedup(kwargs):
+        """Function to open the near duplicates index once, so the duplicates are
+        found across all the newspapers.
+
+        Args:
+            kwargs (dict): Arguments for the scrappers, updated with the opened index.
+
+        Returns:
+            bool: True if the index has been opened here and must be closed by the caller.
+        """
+        dedup = kwargs.get('dedup')
+        if not isinstance(dedup, str):
+            return False
+        kwargs['dedup'] = Deduplicator(dedup, skip=kwargs.get('dedup_skip'))
+        return True
+
+    @staticmethod
+    def _share_search_index(kwargs):
+        """Function to open the search index once, so the news articles of all the
+        newspapers are added to it.
+
+        Args:
+            kwargs (dict): Arguments for the scrappers, updated with the opened index.
+
+        Returns:
+            bool: True if the index has been opened here and must be closed by the caller.
+        """
+        search_index = kwargs.get('search_index')
+        if not isinstance(search_index, str):
+            return False
+        kwargs['search_index'] = SearchIndex(search_index)
+        return True
+
+    @staticmethod
+    def _share_memory_governor(kwargs):
+        """Function to create one memory governor for all the scrappers, as the
+        memory budget is for the whole process.
+
+        Args:
+            kwargs (dict): Arguments for the scrappers, updated with the governor.
         """
-        if self.__name == 'elpais':
-            self.__scrapper = ElPaisScrapper(parser=parser)
-        elif self.__name == 'elmundo':
-            self.__scrapper = ElMundoScrapper(parser=parser)
-        elif self.__name == 'abc':
-            self.__scrapper = ABCScrapper(parser=parser)
-        elif self.__name == 'ideal':
-            self.__scrapper = IdealScrapper(parser=parser)
-        else:
-            raise ValueError('No other newspaper available now. Sorry!')
-
-    def pipeline(self):
+        memory_budget = kwargs.get('memory_budget')
+        if isinstance(memory_budget, (int, float)):
+            kwargs['memory_budget'] = MemoryGovernor(memory_budget)
+
+    @staticmethod
+    def run_daemon(names, min_interval=60.0, max_interval=3600.0, per_newspaper=4, parser='html.parser',
+                   **kwargs):
+        """Function to keep polling several newspapers, downloading only their new
+        news articles and adapting how often every newspaper is polled.
+
+        Args:
+            names (list): Names of the newspapers
+            min_interval (float): Min seconds between two polls of a newspaper.
+            max_interval (float): Max seconds between two polls of a newspaper.
+            per_newspaper (int): Max number of news articles being downloaded at the
+            same time from one newspaper.
+            parser (str): Parser used by BeautifulSoup
+            **kwargs: Extra arguments for the scrappers.
+        """
+        NewsFactory._share_memory_governor(kwargs)
+        owns_url_index = NewsFactory._share_url_index(kwargs)
+        owns_dedup = NewsFactory._share_dedup(kwargs)
+        owns_search_index = NewsFactory._share_search_index(kwargs)
+        factories = [NewsFactory(name, parser=parser, **kwargs) for name in names]
+        daemon = PollingDaemon([factory.scrapper_ for factory in factories], min_interval=min_interval,
+                               max_interval=max_interval, max_concurrency=per_newspaper)
+        try:
+            daemon.run()
+        finally:
+            for factory in factories:
+                factory.close()
+            if owns_url_index:
+                kwargs['url_index'].close()
+            if owns_dedup:
+                kwargs['dedup'].close()
+            if owns_search_index:
+                kwargs['search_index'].close()
+
+    @staticmethod
+    def print_summary(summaries):
+        """Function to print the summary of several crawls.
+
+        Args:
+            summaries (list): List with CrawlSummary objects.
+        """
+        print(f'{"newspaper":<12}{"links":>8}{"saved":>8}{"errors":>8}{"seconds":>10}')
+        for summary in summaries:
+            print(f'{summary.newspaper:<12}{summary.n_links:>8}{summary.n_scrapped:>8}'
+                  f'{summary.n_errors:>8}{summary.elapsed:>10.1f}')
+        print(f'{"total":<12}{sum(s.n_links for s in summaries):>8}{sum(s.n_scrapped for s in summaries):>8}'
+              f'{sum(s.n_errors for s in summaries):>8}')
+
+    def pipeline(self, profiler=None):
         """Function to apply the pipeline from the scrapper.
+
+        Args:
+            profiler (Profiler): If given, the run is profiled with it.
+        """
+        self.__scrapper.pipeline(profiler=profiler)
+
+    def pipeline_async(self, max_concurrency=8):
+        """Function to apply the concurrent pipeline from the scrapper.
+
+        Args:
+            max_concurrency (int): Max number of news articles being downloaded
+            at the same time from the same host.
+
+        Returns:
+            CrawlSummary: Summary of the crawl.
+        """
+        return self.__scrapper.pipeline_async(max_concurrency=max_concurrency)
+
+    def close(self):
+        """Function to close the resources used by the scrapper.
+        """
+        self.__scrapper.close()
+
+    def pipeline_multiprocess(self, fetch_workers=8, extract_workers=None, queue_size=32):
+        """Function to apply the multiprocess pipeline from the scrapper.
+
+        Args:
+            fetch_workers (int): Number of threads downloading news articles.
+            extract_workers (int): Number of extraction processes, by default one per core.
+            queue_size (int): Max number of news articles waiting between the stages.
+        """
+        self.__scrapper.pipeline_multiprocess(fetch_workers=fetch_workers, extract_workers=extract_workers,
+                                              queue_size=queue_size)
+
+    def deep_crawl(self, frontier='frontier.sqlite', max_depth=2, max_per_section=None, max_urls=None):
+        """Function to apply the resumable deep crawl from the scrapper.
+
+        Args:
+            frontier (str): Path of the SQLite database with the frontier.
+            max_depth (int): Max number of pages followed from the main page.
+            max_per_section (int): Max number of news articles from every section.
+            max_urls (int): Max number of urls crawled in this call, all by default.
+
+        Returns:
+            int: Number of news articles saved.
         """
-        self.__scrapper.pipeline()
+        return self.__scrapper.deep_crawl(frontier=frontier, max_depth=max_depth, max_per_section=max_per_section,
+                                          max_urls=max_urls)
@@ -20,12 +20,44 @@
 """Abstrac class for news scrapper.
 """
 import os
+import shutil
+import asyncio
+import contextlib
 import time
-import subprocess
-from datetime import datetime
+import queue
+import threading
+from collections import namedtuple
+from urllib.parse import urlparse, urljoin
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+from xml.etree.ElementTree import ParseError
 from abc import abstractmethod, ABC
 import requests
 from bs4 import BeautifulSoup
+from scrapper.http_transport import HttpTransport
+from scrapper.rate_limiter import RateLimiter
+from scrapper.image_downloader import ImageDownloader
+from scrapper.image_store import ImageStore
+from scrapper.url_index import UrlIndex, canonicalize_url
+from scrapper.http_cache import HttpCache
+from scrapper.soup_strainers import main_page_strainer, news_article_strainer
+from scrapper.link_extractor import extract_header_links
+from scrapper.article import Article
+from scrapper.extraction import init_extraction_worker, extract_article
+from scrapper.storage import FolderStorage, STORAGES
+from scrapper.warc import WarcWriter, iter_warc_responses
+from scrapper.feeds import iter_feed_entries
+from scrapper.frontier import Frontier, FrontierItem, DONE, FAILED
+from scrapper.retry import CircuitBreaker, RetryPolicy, RetryQueue, counts_as_attempt, is_retryable
+from scrapper.metrics import REGISTRY, STAGE_SECONDS, DOWNLOADED_BYTES, ARTICLES
+from scrapper.memory import MemoryGovernor
+from scrapper.dedup import Deduplicator
+from scrapper.search_index import SearchIndex
+
+
+CrawlSummary = namedtuple('CrawlSummary', ['newspaper', 'n_links', 'n_scrapped', 'n_errors', 'elapsed'])
+CrawlSummary.__doc__ = """Summary of a crawl: number of new news links found, news
+articles saved and errors, and the seconds it took."""
 
 
 class NewsScrapper(ABC):
@@ -35,10 +67,21 @@ class NewsScrapper(ABC):
     """
     def __init__(self, name: str, url: str, parser='html.parser', header_name_news='', 
                  header_class_news='', newsarticle_title_name='', newsarticle_title_class='',
-                 newsarticle_body_name='', newsarticle_body_class='') -> None:
+                 newsarticle_body_name='', newsarticle_body_class='', headers=None,
+                 timeout=(5.0, 30.0), max_retries=3, pool_maxsize=10, requests_per_second=1.0,
+                 burst=5, use_robots_crawl_delay=True, image_workers=4, image_store=None,
+                 url_index='seen_urls.sqlite', http_cache=None, selective_parsing=False,
+                 storage='folder', warc=None, transport=None, feed_urls=None, sitemap_urls=None,
+                 discovery='homepage', retry_policy=None, metrics=None, metrics_path=None,
+                 max_body_bytes=10 * 1024 ** 2, memory_budget=None, fast_link_extraction=True, dedup=None,
+                 dedup_skip=None, search_index=None) -> None:
+        if discovery not in ('homepage', 'feeds'):
+            raise ValueError(f'Unknown discovery {discovery}, use homepage or feeds.')
         self.__newspaper_name = name
         self.__newspaper_url = url
         self.__parser = parser
+        self.__selective_parsing = selective_parsing
+        self.__fast_link_extraction = fast_link_extraction
         self.__bs4 = BeautifulSoup
         self.__header_name_news=header_name_news
         self.__header_class_news=header_class_news
@@ -46,6 +89,60 @@ class NewsScrapper(ABC):
         self.__newsarticle_title_class=newsarticle_title_class
         self.__newsarticle_body_name=newsarticle_body_name
         self.__newsarticle_body_class=newsarticle_body_class
+        if transport is None:
+            rate_limiter = RateLimiter(requests_per_second=requests_per_second, burst=burst,
+                                       use_robots_crawl_delay=use_robots_crawl_delay)
+            transport = HttpTransport(headers=headers, timeout=timeout, max_retries=max_retries,
+                                      pool_maxsize=pool_maxsize, rate_limiter=rate_limiter,
+                                      circuit_breaker=CircuitBreaker(), max_body_bytes=max_body_bytes)
+        self.__transport = transport
+        self.__retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.__metrics = metrics if metrics is not None else REGISTRY
+        self.__metrics_path = metrics_path
+        self.__profiler = None
+        # A budget in bytes gets its own governor, a MemoryGovernor can be shared by several scrappers.
+        if isinstance(memory_budget, (int, float)):
+            memory_budget = MemoryGovernor(memory_budget)
+        self.__memory_governor = memory_budget
+        self.__owns_image_store = isinstance(image_store, str)
+        if self.__owns_image_store:
+            image_store = ImageStore(image_store)
+        self.__image_store = image_store
+        self.__image_downloader = ImageDownloader(transport, max_workers=image_workers,
+                                                  image_store=image_store)
+        if isinstance(http_cache, str):
+            http_cache = HttpCache(http_cache)
+        self.__http_cache = http_cache
+        # Storages given by name are owned by the scrapper. The shard ones
+        # are saved at corpus/<newspaper>.
+        self.__owns_storage = isinstance(storage, str)
+        if storage == 'folder':
+            storage = FolderStorage(self)
+        elif isinstance(storage, str):
+            storage = STORAGES[storage](os.path.join('corpus', name), prefix=name)
+        self.__storage = storage
+        self.__owns_warc = isinstance(warc, str)
+        if self.__owns_warc:
+            warc = WarcWriter(warc, prefix=name)
+        self.__warc = warc
+        self.__owns_dedup = isinstance(dedup, str)
+        if self.__owns_dedup:
+            dedup = Deduplicator(dedup, skip=dedup_skip)
+        self.__dedup = dedup
+        self.__owns_search_index = isinstance(search_index, str)
+        if self.__owns_search_index:
+            search_index = SearchIndex(search_index)
+        self.__search_index = search_index
+        # The url index is opened the first time is needed, so it's only opened by
+        # the scrappers that really crawl. If a path is given the scrapper owns it.
+        self.__url_index = url_index
+        self.__owns_url_index = isinstance(url_index, str)
+        self.__url_index_seeded = False
+        self.__url_index_lock = threading.Lock()
+        self.__feed_urls = list(feed_urls or [])
+        self.__sitemap_urls = list(sitemap_urls or [])
+        self.__discovery = discovery
+        self.__discovery_started = None
 
     @property
     def name_(self):
@@ -74,6 +171,15 @@ class NewsScrapper(ABC):
         """
         return self.__parser
     
+    @property
+    def selective_parsing_(self):
+        """Selective parsing property
+
+        Returns:
+            bool: If True only the parts of the pages used by the scrapper are parsed.
+        """
+        return self.__selective_parsing
+
     @property
     def bs4_(self):
         """BeautifulSoup object to scrape the websites
@@ -83,6 +189,127 @@ class NewsScrapper(ABC):
         """
         return self.__bs4
 
+    @property
+    def discovery_(self):
+        """Discovery property
+
+        Returns:
+            str: How the news links are found, 'homepage' or 'feeds'.
+        """
+        return self.__discovery
+
+    @property
+    def metrics_(self):
+        """Metrics property
+
+        Returns:
+            MetricsRegistry: Registry where the scrapper records its metrics.
+        """
+        return self.__metrics
+
+    @property
+    def dedup_(self):
+        """Deduplicator property.
+
+        Returns:
+            Deduplicator: Index of near duplicates that tags the news articles, or None.
+        """
+        return self.__dedup
+
+    @property
+    def search_index_(self):
+        """Search index property.
+
+        Returns:
+            SearchIndex: Inverted index where the news articles saved are added, or None.
+        """
+        return self.__search_index
+
+    @property
+    def memory_governor_(self):
+        """Memory governor property.
+
+        Returns:
+            MemoryGovernor: Governor that sheds concurrency over the memory budget, or None.
+        """
+        return self.__memory_governor
+
+    @property
+    def transport_(self):
+        """Transport property
+
+        Returns:
+            HttpTransport: Transport with the pooled connections used to download the websites.
+        """
+        return self.__transport
+
+    @property
+    def url_index_(self):
+        """Url index property
+
+        Returns:
+            UrlIndex: Index with the urls from the news articles already saved, or None.
+        """
+        with self.__url_index_lock:
+            if isinstance(self.__url_index, str):
+                self.__url_index = UrlIndex(self.__url_index)
+            if self.__url_index is not None and not self.__url_index_seeded:
+                self.__url_index_seeded = True
+                self._seed_url_index(self.__url_index)
+            return self.__url_index
+
+    def _seed_url_index(self, url_index):
+        """Function to add to the url index the news articles saved in folders
+        before the newspaper had any url in it, so they aren't downloaded again.
+        The urls are read from the METADATA.txt of every folder.
+
+        Args:
+            url_index (UrlIndex): Index with the urls from the news articles already saved.
+        """
+        if not os.path.isdir(self.__newspaper_name) or url_index.has_newspaper(self.__newspaper_name):
+            return
+        urls = []
+        with os.scandir(self.__newspaper_name) as entries:
+            for entry in entries:
+                metadata_path = os.path.join(entry.path, 'METADATA.txt')
+                if not entry.is_dir() or not os.path.isfile(metadata_path):
+                    continue
+                with open(metadata_path) as file:
+                    urls.extend(line[len('URL: '):].strip() for line in file if line.startswith('URL: '))
+        if urls:
+            url_index.add_many(urls, newspaper=self.__newspaper_name)
+            print(f'{self.__newspaper_name}: {len(urls)} news articles already saved added to the url index.')
+
+    @property
+    def storage_(self):
+        """Storage property
+
+        Returns:
+            FolderStorage/ShardStorage: Backend where the news articles are saved.
+        """
+        return self.__storage
+
+    def close(self):
+        """Function to close the storage, the WARC archive, the image store, the url
+        index, the deduplicator and the search index, if they are owned by the
+        scrapper, and the transport connections.
+        """
+        if self.__owns_storage:
+            self._mark_saved(self.__storage.close())
+        if self.__owns_warc:
+            self.__warc.close()
+        if self.__owns_image_store:
+            self.__image_store.close()
+        if self.__owns_dedup:
+            self.__dedup.close()
+        if self.__owns_search_index:
+            self.__search_index.close()
+        with self.__url_index_lock:
+            if self.__owns_url_index and isinstance(self.__url_index, UrlIndex):
+                self.__url_index.close()
+                self.__url_index = self.__url_index.path_
+        self.__transport.close()
+
     @abstractmethod
     def _clean_news_links(self, all_links):
         """Function to clean the urls obtained at the newspaper home page.
@@ -118,24 +345,28 @@ class NewsScrapper(ABC):
             str: Path of the folder where the data will be saved.
         """
 
-    def create_metadata_for_newspaper_url(self, title, url, n_images):
+    def create_metadata_for_newspaper_url(self, title, url, n_images, cluster_id=None):
         """Function to create the metadata for a url from the newspaper
 
         Args:
             title (str): News title
             url (str): News url
             n_images (int): Number of images
+            cluster_id (int): Id of the cluster of near duplicates, if known.
         Returns:
             str: Must return the metadata for the news that is being analyzed.
         """
         now = datetime.now()
         date_extracted = '_'.join(now.strftime('%D').split('/'))
-        return str(
+        metadata = str(
             f'DATE EXTRACTED: {date_extracted}\n'
             f'TITLE: {title}\n'
             f'N_IMAGES: {n_images}\n'
             f'URL: {url}\n'
         )
+        if cluster_id is not None:
+            metadata += f'CLUSTER_ID: {cluster_id}\n'
+        return metadata
 
     def _save_metadata(self, metadata, file_path):
         """Function to save the metadata from a news article in a file.
@@ -160,45 +391,492 @@ class NewsScrapper(ABC):
             for txt in text:
                 file.write(txt)
 
-    def _save_images(self, images_src, img_folder):
+    def _save_images(self, images_src, img_folder, base_url=None):
         """Function to save the images from a news article. This function
         will create a folder called 'img' where it's going o download
-        all the images from a news article.
+        all the images from a news article. If the scrapper has an image store
+        the folder only gets links to the stored images and a manifest.
 
         Args:
             images_src (list): List with the images urls
             img_folder (str): Path to save the images
+            base_url (str): Url of the news article, used for the relative images urls.
+
+        Returns:
+            list: List with an ImageResult for every image url.
         """
         img_folder = img_folder + '/img/'
-        os.mkdir(img_folder)
-        for img_url in images_src:
-            # Download all the images
-            cmd = ['wget', img_url, '-P', img_folder]
+        os.makedirs(img_folder, exist_ok=True)
+        with self._stage('image_download'):
+            results = self.__image_downloader.download(images_src, img_folder, base_url=base_url)
+        for result in results:
+            if result.status == 'failed':
+                print(f'Error downloading image {result.url}: {result.error}')
+            elif result.status == 'downloaded':
+                self._count_bytes('image', os.path.getsize(result.path or result.blob_path))
+        return results
+
+    def _stage(self, stage):
+        """Function to time a stage of the crawl in the metrics.
+
+        Args:
+            stage (str): Name of the stage, like 'article_fetch'.
+
+        Returns:
+            context manager: Context that observes the seconds spent inside it.
+        """
+        return self.__metrics.timer(STAGE_SECONDS, newspaper=self.__newspaper_name, stage=stage)
+
+    def _count_bytes(self, kind, n_bytes):
+        """Function to count bytes downloaded in the metrics.
+
+        Args:
+            kind (str): What has been downloaded, 'html' or 'image'.
+            n_bytes (int): Number of bytes.
+        """
+        self.__metrics.inc(DOWNLOADED_BYTES, n_bytes, newspaper=self.__newspaper_name, kind=kind)
+
+    def _count_article(self, result):
+        """Function to count a news article in the metrics.
+
+        Args:
+            result (str): 'saved' or 'error'.
+        """
+        self.__metrics.inc(ARTICLES, newspaper=self.__newspaper_name, result=result)
+
+    def _write_metrics(self):
+        """Function to write the metrics, if the scrapper has a path for them.
+        """
+        if self.__metrics_path is not None:
+            self.__metrics.write(self.__metrics_path)
+
+    def pipeline(self, profiler=None):
+        """Basic pipeline for extracting information from the newspaper website
+
+        Args:
+            profiler (Profiler): If given, the run is profiled with it. By default
+            the results are written next to the output of the storage.
+        """
+        if profiler is not None:
+            if profiler.output_dir_ is None:
+                profiler.output_dir_ = os.path.normpath(self.__storage.root_) + '.profile'
+            self.__profiler = profiler
             try:
-                subprocess.Popen(cmd).communicate()
-            except TypeError:
+                with profiler:
+                    self.pipeline()
+            finally:
+                self.__profiler = None
+            return
+        try:
+            all_links = self._discover_links()
+        except Exception as err:  # pylint: disable=broad-except
+            print(f'Error finding the news links of {self.__newspaper_name}: {err}')
+            return
+        self._crawl_links(all_links, self.__newsarticle_title_name, self.__newsarticle_title_class,
+                          self.__newsarticle_body_name, self.__newsarticle_body_class)
+
+    def _discover_links(self):
+        """Function to find the news links of the newspaper, from its main page
+        or from its feeds and sitemaps, depending on the discovery of the scrapper.
+        The requests are retried with the same policy as the news articles.
+        If the main page hasn't changed since it was cached, the cached one is
+        used, so the news articles that failed in the last run are tried again.
+
+        Returns:
+            list: List with the news links cleaned by the newspaper scrapper.
+        """
+        self.__discovery_started = datetime.now(timezone.utc)
+        if self.__discovery == 'feeds':
+            since = None
+            if self.url_index_ is not None:
+                since = self.url_index_.get_last_run(self.__newspaper_name)
+            with self._stage('feed_discovery'):
+                return self.discover_feed_links(since=since)
+        return self._call_with_retries(self._find_news_links)
+
+    def _find_news_links(self):
+        """Function to find the news links of the newspaper main page once, without retries.
+
+        Returns:
+            list: List with the news links cleaned by the newspaper scrapper.
+        """
+        if self.__fast_link_extraction:
+            return self._extract_main_page_links()
+        soup = self._init_bs4(self.__newspaper_url, parse_only=self._main_page_strainer(), page='homepage')
+        try:
+            return self._get_news_links(soup, self.__header_name_news, self.__header_class_news)
+        finally:
+            soup.decompose()
+
+    def _extract_main_page_links(self):
+        """Function to get the news links from the newspaper main page without
+        building its BeautifulSoup tree. The links are the same ones that
+        _get_news_links finds in the tree built by html.parser.
+
+        Returns:
+            list: List with the news links cleaned by the newspaper scrapper.
+        """
+        with self._stage('homepage_fetch'):
+            website_html, _ = self._fetch_html(self.__newspaper_url)
+        with self._stage('homepage_parse'):
+            all_links = extract_header_links(website_html, self.__header_name_news, self.__header_class_news)
+        with self._stage('link_cleaning'):
+            return self._clean_news_links(all_links)
+
+    def discover_feed_links(self, since=None):
+        """Function to get the news links from the RSS/Atom feeds and the
+        sitemaps of the newspaper. The sitemap indexes are followed one level.
+        Only the urls from the newspaper host are kept. Every feed is retried
+        like the news articles. A feed that is missing or broken is skipped, but
+        if one still fails for a reason that could go away, the error is raised,
+        so the crawl isn't taken as complete.
+
+        Args:
+            since (datetime): If given, the entries published before it are skipped.
+            Entries without date are always kept.
+
+        Returns:
+            list: List with the news links cleaned by the newspaper scrapper.
+
+        Raises:
+            requests.RequestException: If a feed can't be downloaded after its retries.
+        """
+        host = urlparse(self.__newspaper_url).netloc
+        links = {}
+        for feed_url in self.__feed_urls + self.__sitemap_urls:
+            try:
+                entries = self._call_with_retries(self._read_feed_entries, feed_url, since)
+            except (requests.RequestException, ParseError) as err:
+                if not isinstance(err, (requests.HTTPError, ParseError)) or is_retryable(err):
+                    raise
+                print(f'Error reading the feed {feed_url}: {err}')
                 continue
+            for entry in entries:
+                if urlparse(entry.url).netloc == host:
+                    links.setdefault(self._get_link_from_url(entry.url))
+        return self._clean_news_links(list(links))
 
-    def pipeline(self):
-        """Basic pipeline for extracting information from the newspaper website
+    def _read_feed_entries(self, feed_url, since=None):
+        """Function to read all the entries of a feed or sitemap, so it can be retried as a whole.
+
+        Args:
+            feed_url (str): Url of the feed or sitemap
+            since (datetime): If given, the entries published before it are skipped.
+
+        Returns:
+            list: List with the FeedEntry of every news article of the feed.
+        """
+        return list(self._read_feed(feed_url, since=since))
+
+    def _read_feed(self, feed_url, since=None, follow_sitemaps=True):
+        """Function to read the entries of a feed or sitemap while it's downloaded.
+
+        Args:
+            feed_url (str): Url of the feed or sitemap
+            since (datetime): If given, the entries published before it are skipped.
+            follow_sitemaps (bool): If True the sitemaps from a sitemap index are read too.
+
+        Yields:
+            FeedEntry: Every news article entry of the feed.
+        """
+        response = self.__transport.get(feed_url, stream=True)
+        with response:
+            response.raise_for_status()
+            # Let urllib3 undo the gzip/deflate compression of the raw stream.
+            response.raw.decode_content = True
+            sitemaps = []
+            for entry in iter_feed_entries(response.raw):
+                if since is not None and entry.published is not None and entry.published < since:
+                    continue
+                if entry.is_sitemap:
+                    sitemaps.append(entry.url)
+                else:
+                    yield entry
+        if follow_sitemaps:
+            for sitemap_url in sitemaps:
+                yield from self._read_feed(sitemap_url, since=since, follow_sitemaps=False)
+
+    def _main_page_strainer(self):
+        """Function to get the strainer for the newspaper main page.
+
+        Returns:
+            SoupStrainer: Strainer that keeps the headers with the news links,
+            or None if the scrapper doesn't use selective parsing.
+        """
+        if not self.__selective_parsing:
+            return None
+        return main_page_strainer(self.__header_name_news, self.__header_class_news)
+
+    def _fetch_html(self, url):
+        """Function to download the html from a url. If the scrapper has an
+        HTTP cache, the request is a conditional GET and the cached html is
+        used when the server answers that it hasn't changed.
+
+        Args:
+            url (str): Url from newspaper to be downloaded
+
+        Returns:
+            str, bool: Html from the url and if it has changed since it was cached.
         """
-        soup = self._init_bs4(self.__newspaper_url)
-        self.crawl_website(soup, self.__header_name_news, self.__header_class_news,
-                           self.__newsarticle_title_name, self.__newsarticle_title_class,
-                           self.__newsarticle_body_name, self.__newsarticle_body_class)
+        if self.__http_cache is None:
+            response = self.__transport.get(url)
+            self._archive(response)
+            self._count_bytes('html', len(response.content))
+            return response.text, True
+        response = self.__transport.get(url, headers=self.__http_cache.conditional_headers(url))
+        if response.status_code == 304:
+            cached_html = self.__http_cache.load_text(url)
+            if cached_html is not None:
+                return cached_html, False
+            response = self.__transport.get(url)
+        self._archive(response)
+        self._count_bytes('html', len(response.content))
+        self.__http_cache.store(url, response)
+        return response.text, True
+
+    def _archive(self, response):
+        """Function to save a response in the WARC archive, if the scrapper has one.
 
-    def _init_bs4(self, url):
+        Args:
+            response (requests.Response): Response to be archived.
+        """
+        if self.__warc is not None:
+            self.__warc.write_response(response)
+
+    def _init_bs4(self, url, parse_only=None, page='article'):
         """Function to init a BeautifulSoup object
 
         Args:
             url (str): Url from newspaper to be scrapped
+            parse_only (SoupStrainer): If given, only the tags kept by it are parsed.
+            page (str): Kind of page, used to name the fetch and parse stages in the metrics.
+
+        Returns:
+            BeautifulSoup object: BeautifulSoup object that has parsed the url.
+        """
+        with self._stage(f'{page}_fetch'):
+            website_html, _ = self._fetch_html(url)
+        with self._stage(f'{page}_parse'):
+            return self.__bs4(website_html, self.__parser, parse_only=parse_only)
+
+    def pipeline_async(self, max_concurrency=8, max_articles=None, worker_budget=None):
+        """Pipeline for extracting information from the newspaper website
+        fetching the news articles concurrently.
+
+        Args:
+            max_concurrency (int): Max number of news articles being downloaded
+            at the same time from the same host.
+            max_articles (int): Max number of news articles downloaded, all by default.
+            worker_budget (threading.Semaphore): Semaphore shared with other scrappers
+            that limits the total number of news articles being downloaded.
+
+        Returns:
+            CrawlSummary: Summary of the crawl.
+        """
+        start = time.monotonic()
+        try:
+            all_links = self._discover_links()
+        except Exception as err:  # pylint: disable=broad-except
+            print(f'Error finding the news links of {self.__newspaper_name}: {err}')
+            return CrawlSummary(self.__newspaper_name, 0, 0, 1, time.monotonic() - start)
+        summary = asyncio.run(self._crawl_links_async(all_links, self.__newsarticle_title_name,
+                                                      self.__newsarticle_title_class, self.__newsarticle_body_name,
+                                                      self.__newsarticle_body_class, max_concurrency=max_concurrency,
+                                                      max_articles=max_articles, worker_budget=worker_budget))
+        return summary._replace(elapsed=time.monotonic() - start)
+
+    def pipeline_multiprocess(self, fetch_workers=8, extract_workers=None, queue_size=32):
+        """Pipeline for extracting information from the newspaper website
+        downloading the news articles in threads and parsing them in a pool
+        of processes.
+
+        Args:
+            fetch_workers (int): Number of threads downloading news articles.
+            extract_workers (int): Number of extraction processes, by default one per core.
+            queue_size (int): Max number of news articles waiting between the stages.
+        """
+        try:
+            all_links = self._discover_links()
+        except Exception as err:  # pylint: disable=broad-except
+            print(f'Error finding the news links of {self.__newspaper_name}: {err}')
+            return
+        self._crawl_links_multiprocess(all_links, fetch_workers=fetch_workers, extract_workers=extract_workers,
+                                       queue_size=queue_size)
+
+    def _get_news_links(self, soup, header_name_news, header_class_news):
+        """Function to get the cleaned news links from the newspaper main page.
+
+        Args:
+            soup (BeautifulSoup Object): BeautifulSoup object of the newspaper main page
+            header_name_news (str): Headers at the main page that contain the news
+            header_class_news (str): header_name_news class in the html file.
 
         Returns:
-            BeautifulSoup object: BeautifulSoup object that has parsed the url
+            list: List with the news links cleaned by the newspaper scrapper.
+        """
+        with self._stage('link_cleaning'):
+            headers = soup.find_all(name=header_name_news, class_=header_class_news)
+            all_links = [tag.find('a').get('href') for tag in headers]
+            return self._clean_news_links(all_links)
+
+    def _create_newspaper_folder(self):
+        """Function to create the newspaper folder if doesn't exists and the
+        news articles are saved in folders.
+        """
+        if isinstance(self.__storage, FolderStorage) and not os.path.isdir(self.__newspaper_name):
+            os.mkdir(self.__newspaper_name)
+
+    def _select_new_links(self, all_links):
+        """Function to select the news links that aren't saved yet, checking
+        all of them at once against the url index. Without url index all the
+        links are selected.
+
+        Args:
+            all_links (list): List with the news links cleaned by the newspaper scrapper.
+
+        Returns:
+            list: List with the news links not saved yet.
+        """
+        links_by_url = {}
+        for link in all_links:
+            links_by_url.setdefault(self._create_news_url(link), link)
+        if self.url_index_ is None:
+            return list(links_by_url.values())
+        new_urls = self.url_index_.filter_new(list(links_by_url))
+        return [links_by_url[news_url] for news_url in new_urls]
+
+    def _scrape_news(self, link, newsarticle_title_name, newsarticle_title_class,
+                     newsarticle_body_name, newsarticle_body_class):
+        """Function to download and save a news article in our local data.
+        Once saved, its url is added to the url index.
+
+        Args:
+            link (str): News link as returned by _clean_news_links
+            newsarticle_title_name (str): String with the news article title name in the html file
+            newsarticle_title_class (str): String with the news article title class in the html file
+            newsarticle_body_name (str): String with the news body name in the html file.
+            newsarticle_body_class (str): String with the news body class in the html file.
+
+        Returns:
+            bool: True if the news article has been downloaded.
+        """
+        self._save_article(self._extract_article(link, newsarticle_title_name, newsarticle_title_class,
+                                                 newsarticle_body_name, newsarticle_body_class))
+        return True
+
+    def _extract_article(self, link, newsarticle_title_name, newsarticle_title_class,
+                         newsarticle_body_name, newsarticle_body_class):
+        """Function to download a news article and extract its data.
+
+        Args:
+            link (str): News link as returned by _clean_news_links
+            newsarticle_title_name (str): String with the news article title name in the html file
+            newsarticle_title_class (str): String with the news article title class in the html file
+            newsarticle_body_name (str): String with the news body name in the html file.
+            newsarticle_body_class (str): String with the news body class in the html file.
+
+        Returns:
+            Article: The news article.
+        """
+        # Get news_url.
+        news_url = self._create_news_url(link)
+        # Get text, images url and article's title
+        text, images_src, title = self.get_info_from_newspaper(news_url, newsarticle_title_name,
+                                                               newsarticle_title_class, newsarticle_body_name,
+                                                               newsarticle_body_class)
+        return Article.from_extraction(self.__newspaper_name, link, news_url, title, text, images_src)
+
+    def _save_article(self, article, download_images=True):
+        """Function to save a news article in the storage. The urls of the
+        news articles already on disk are added to the url index.
+
+        Args:
+            article (Article): News article
+            download_images (bool): If False the images aren't downloaded.
+        """
+        self._save_articles([article], download_images=download_images)
+
+    def _save_articles(self, articles, download_images=True, failed=None):
+        """Function to save several news articles in the storage. If the
+        scrapper has a deduplicator, they are tagged with their cluster of near
+        duplicates first, all of them in one batch.
+
+        Args:
+            articles (list): List with Article objects
+            download_images (bool): If False the images aren't downloaded.
+            failed (list): If given, the links of the news articles that can't be
+            saved are added to it and the rest are still saved, instead of raising.
+        """
+        if self.__dedup is not None and articles:
+            with self._stage('dedup'):
+                articles = self.__dedup.tag_many(articles)
+        for article in articles:
+            try:
+                # With the folder storage the write includes the image download.
+                with self._stage('write'):
+                    saved = self.__storage.write(article, download_images=download_images)
+            except Exception as err:  # pylint: disable=broad-except
+                if failed is None:
+                    raise
+                print(f'Error saving {article.url}: {err}')
+                self._count_article('error')
+                failed.append(article.link)
+                continue
+            self._count_article('saved')
+            self._mark_saved(saved)
+
+    def _save_news_folder(self, article, download_images=True):
+        """Function to save a news article in its own folder, with the metadata,
+        the text and the images. Used by the folder storage.
+
+        Args:
+            article (Article): News article
+            download_images (bool): If False the images aren't downloaded.
+        """
+        link_path = self._get_link_path(article.link)
+        # The folder can exist if a previous run stopped before saving the news article.
+        os.makedirs(link_path, exist_ok=True)
+        try:
+            # Create and save metadata metadata
+            self._create_and_save_metadata(article.title, article.url, len(article.images), link_path,
+                                           cluster_id=article.cluster_id)
+            self._save_text(article.paragraphs, link_path)
+            if download_images and len(article.images) > 0:
+                self._save_images(images_src=article.images, img_folder=link_path, base_url=article.url)
+        except Exception:
+            # Don't leave a half saved news article behind.
+            shutil.rmtree(link_path, ignore_errors=True)
+            raise
+
+    def _mark_saved(self, articles):
+        """Function to add the urls of the news articles already saved to the url
+        index, and the news articles to the search index.
+
+        Args:
+            articles (list): List with the articles saved by the storage.
         """
-        response = requests.get(url)
-        website_html = response.text
-        return self.__bs4(website_html, self.__parser)
+        if articles and self.__search_index is not None:
+            self.__search_index.add_many(articles)
+        self._mark_seen(articles)
+
+    def _mark_seen(self, articles):
+        """Function to add the urls of some news articles to the url index.
+
+        Args:
+            articles (list): List with Article objects.
+        """
+        if articles and self.url_index_ is not None:
+            self.url_index_.add_many([article.url for article in articles], newspaper=self.__newspaper_name)
+
+    def mark_seen(self, articles):
+        """Function to add the urls of some news articles to the url index, so
+        they aren't yielded again by iter_articles. Useful when the articles
+        are consumed without the storage of the scrapper.
+
+        Args:
+            articles (list): List with Article objects.
+        """
+        self._mark_seen(list(articles))
 
     def crawl_website(self, soup, header_name_news, header_class_news,
                       newsarticle_title_name, newsarticle_title_class,
@@ -215,37 +893,553 @@ class NewsScrapper(ABC):
             newsarticle_body_name (str): String with the news body name in the html file.
             newsarticle_body_class (str): String with the news body class in the html file.
         """
-        # Get all links
-        newspaper = self.__newspaper_name
-        headers = soup.find_all(name=header_name_news, class_=header_class_news)
-        all_links = [tag.find('a').get('href') for tag in headers]
-        # Clean news articles links
-        all_links = self._clean_news_links(all_links)
+        self._crawl_links(self._get_news_links(soup, header_name_news, header_class_news),
+                          newsarticle_title_name, newsarticle_title_class,
+                          newsarticle_body_name, newsarticle_body_class)
+
+    def _crawl_links(self, all_links, newsarticle_title_name, newsarticle_title_class,
+                     newsarticle_body_name, newsarticle_body_class):
+        """Function to get all the news not saved yet from a list of news links
+        and save them to our local data.
+
+        Args:
+            all_links (list): List with the news links cleaned by the newspaper scrapper.
+            newsarticle_title_name (str): String with the news article title name in the html file
+            newsarticle_title_class (str): String with the news article title class in the html file
+            newsarticle_body_name (str): String with the news body name in the html file.
+            newsarticle_body_class (str): String with the news body class in the html file.
+        """
+        # Get all links not saved yet
+        all_links = self._select_new_links(all_links)
         # Create folder if doesn't exists
-        if not os.path.isdir(newspaper):
-            os.mkdir(newspaper)
-        # iterate over links_cleaned
-        for cnt_news_scrapped, link in enumerate(all_links):
-            link_path = self._get_link_path(link)
-            # Create a folder for the news article if it doesn't exists in our local data.
-            if not os.path.isdir(link_path):
-                os.mkdir(link_path)
-                # Get news_url.
-                news_url = self._create_news_url(link)
-                # Get text, images url and article's title
-                text, images_src, title = self.get_info_from_newspaper(news_url, newsarticle_title_name, 
-                                                                       newsarticle_title_class, newsarticle_body_name,
-                                                                       newsarticle_body_class)
-                # Create and save metadata metadata
-                self._create_and_save_metadata(title, news_url, len(images_src), link_path)
-                self._save_text(text, link_path)
-                if len(images_src) > 0:
-                    self._save_images(images_src=images_src, img_folder=link_path)
-            # To prevent a max connection count by timer and to not saturate the web.
-            if cnt_news_scrapped % 30 == 0 and cnt_news_scrapped > 1:
-                print('Having a minute break.')
-                time.sleep(60)
-            cnt_news_scrapped += 1
+        self._create_newspaper_folder()
+        # The storage is one more consumer of the news articles stream.
+        failed = []
+        for article in self._iter_link_articles(all_links, failed, newsarticle_title_name,
+                                                newsarticle_title_class, newsarticle_body_name,
+                                                newsarticle_body_class):
+            try:
+                self._save_article(article)
+            except Exception as err:  # pylint: disable=broad-except
+                print(f'Error saving {article.url}: {err}')
+                self._count_article('error')
+                failed.append(article.link)
+        self._finish_crawl(success=not failed)
+
+    def iter_articles(self, max_articles=None):
+        """Function to get the new news articles of the newspaper while they are
+        extracted, without saving them. Only the news article being extracted is
+        kept in memory, whatever the number of news links of the main page. The
+        url index isn't updated, so call mark_seen with the news articles
+        consumed to skip them in the next run.
+
+        Args:
+            max_articles (int): Max number of news articles downloaded, all by default.
+
+        Yields:
+            Article: Every new news article of the newspaper.
+        """
+        try:
+            all_links = self._discover_links()
+        except Exception as err:  # pylint: disable=broad-except
+            print(f'Error finding the news links of {self.__newspaper_name}: {err}')
+            return
+        yield from self._iter_link_articles(self._select_new_links(all_links)[:max_articles], [],
+                                            self.__newsarticle_title_name, self.__newsarticle_title_class,
+                                            self.__newsarticle_body_name, self.__newsarticle_body_class)
+
+    def _iter_link_articles(self, links, failed, newsarticle_title_name, newsarticle_title_class,
+                            newsarticle_body_name, newsarticle_body_class):
+        """Function to download and extract the news articles of a list of news
+        links, one by one. The transport rate limiter keeps us from saturating the
+        web, and the news articles that fail for a temporal reason are retried at
+        the end, with backoff.
+
+        Args:
+            links (list): List with the news links to download.
+            failed (list): List where the news links that failed and won't be retried are added.
+            newsarticle_title_name (str): String with the news article title name in the html file
+            newsarticle_title_class (str): String with the news article title class in the html file
+            newsarticle_body_name (str): String with the news body name in the html file.
+            newsarticle_body_class (str): String with the news body class in the html file.
+
+        Yields:
+            Article: Every news article extracted.
+        """
+        retry_queue = RetryQueue(self.__retry_policy)
+        for link in links:
+            article = self._try_extract_article(link, 1, retry_queue, failed, newsarticle_title_name,
+                                                newsarticle_title_class, newsarticle_body_name,
+                                                newsarticle_body_class)
+            if article is not None:
+                yield article
+        while retry_queue:
+            link, attempt = retry_queue.pop()
+            article = self._try_extract_article(link, attempt + 1, retry_queue, failed, newsarticle_title_name,
+                                                newsarticle_title_class, newsarticle_body_name,
+                                                newsarticle_body_class)
+            if article is not None:
+                yield article
+
+    def _try_extract_article(self, link, attempt, retry_queue, failed, newsarticle_title_name,
+                             newsarticle_title_class, newsarticle_body_name, newsarticle_body_class):
+        """Function to download and extract a news article, adding it to the
+        retry queue if it fails for a reason that could go away later.
+
+        Args:
+            link (str): News link as returned by _clean_news_links
+            attempt (int): Number of this attempt, starting at 1.
+            retry_queue (RetryQueue): Queue of the news articles to retry.
+            failed (list): List where the news link is added if it fails and won't be retried.
+            newsarticle_title_name (str): String with the news article title name in the html file
+            newsarticle_title_class (str): String with the news article title class in the html file
+            newsarticle_body_name (str): String with the news body name in the html file.
+            newsarticle_body_class (str): String with the news body class in the html file.
+
+        Returns:
+            Article: The news article, or None if it has failed.
+        """
+        try:
+            return self._extract_article(link, newsarticle_title_name, newsarticle_title_class,
+                                         newsarticle_body_name, newsarticle_body_class)
+        except Exception as err:  # pylint: disable=broad-except
+            if not retry_queue.push(link, attempt, err):
+                print(f'Error scrapping {link}: {err}')
+                self._count_article('error')
+                failed.append(link)
+            return None
+
+    def _call_with_retries(self, function, *args):
+        """Function to call a function that does requests, waiting and calling
+        it again while it fails for a reason that could go away later.
+
+        Args:
+            function (callable): Function to call
+            *args: Arguments for the function.
+
+        Returns:
+            object: What the function returns.
+        """
+        attempt = 1
+        while True:
+            try:
+                return function(*args)
+            except Exception as err:  # pylint: disable=broad-except
+                if not self.__retry_policy.should_retry(attempt, err):
+                    raise
+                time.sleep(self.__retry_policy.delay(attempt, getattr(err, 'retry_after', None)))
+                attempt += counts_as_attempt(err)
+
+    async def crawl_website_async(self, soup, header_name_news, header_class_news,
+                                  newsarticle_title_name, newsarticle_title_class,
+                                  newsarticle_body_name, newsarticle_body_class,
+                                  max_concurrency=8, max_articles=None, worker_budget=None):
+        """Function to fully crawl a newspaper website downloading the news
+        articles concurrently. The blocking download and save of every news
+        article is done in a thread pool, limiting the number of news articles
+        that are being downloaded at the same time from each host.
+
+        Args:
+            soup (BeautifulSoup Object): BeautifulSoup object to crawl the website
+            header_name_news (str): Headers at the main page that contain the news
+            header_class_news (str): header_name_news class in the html file.
+            newsarticle_title_name (str): String with the news article title name in the html file
+            newsarticle_title_class (str): String with the news article title class in the html file
+            newsarticle_body_name (str): String with the news body name in the html file.
+            newsarticle_body_class (str): String with the news body class in the html file.
+            max_concurrency (int): Max number of news articles being downloaded
+            at the same time from the same host.
+            max_articles (int): Max number of news articles downloaded, all by default.
+            worker_budget (threading.Semaphore): Semaphore shared with other scrappers
+            that limits the total number of news articles being downloaded.
+
+        Returns:
+            CrawlSummary: Summary of the crawl.
+        """
+        return await self._crawl_links_async(self._get_news_links(soup, header_name_news, header_class_news),
+                                             newsarticle_title_name, newsarticle_title_class,
+                                             newsarticle_body_name, newsarticle_body_class,
+                                             max_concurrency=max_concurrency, max_articles=max_articles,
+                                             worker_budget=worker_budget)
+
+    async def _crawl_links_async(self, all_links, newsarticle_title_name, newsarticle_title_class,
+                                 newsarticle_body_name, newsarticle_body_class,
+                                 max_concurrency=8, max_articles=None, worker_budget=None):
+        """Function to get concurrently all the news not saved yet from a list
+        of news links and save them to our local data.
+
+        Args:
+            all_links (list): List with the news links cleaned by the newspaper scrapper.
+            newsarticle_title_name (str): String with the news article title name in the html file
+            newsarticle_title_class (str): String with the news article title class in the html file
+            newsarticle_body_name (str): String with the news body name in the html file.
+            newsarticle_body_class (str): String with the news body class in the html file.
+            max_concurrency (int): Max number of news articles being downloaded
+            at the same time from the same host.
+            max_articles (int): Max number of news articles downloaded, all by default.
+            worker_budget (threading.Semaphore): Semaphore shared with other scrappers
+            that limits the total number of news articles being downloaded.
+
+        Returns:
+            CrawlSummary: Summary of the crawl.
+        """
+        start = time.monotonic()
+        all_links = self._select_new_links(all_links)[:max_articles]
+        self._create_newspaper_folder()
+        # Two links with the same folder would race creating it, so keep only the first one.
+        links_by_path = {}
+        for link in all_links:
+            links_by_path.setdefault(self._get_link_path(link), link)
+        hosts = {link: urlparse(self._create_news_url(link)).netloc for link in links_by_path.values()}
+        host_semaphores = {host: asyncio.Semaphore(max_concurrency) for host in set(hosts.values())}
+        loop = asyncio.get_running_loop()
+
+        budget = worker_budget if worker_budget is not None else contextlib.nullcontext()
+        governor = self.__memory_governor if self.__memory_governor is not None else contextlib.nullcontext()
+
+        def scrape_news(link):
+            with governor, budget:
+                return self._scrape_news(link, newsarticle_title_name, newsarticle_title_class,
+                                         newsarticle_body_name, newsarticle_body_class)
+
+        with ThreadPoolExecutor(max_workers=max_concurrency * max(len(host_semaphores), 1)) as executor:
+            async def scrape(link):
+                # The retries wait without holding the host semaphore, so the other
+                # news articles go on meanwhile.
+                attempt = 1
+                while True:
+                    try:
+                        async with host_semaphores[hosts[link]]:
+                            return await loop.run_in_executor(executor, scrape_news, link)
+                    except Exception as err:  # pylint: disable=broad-except
+                        if not self.__retry_policy.should_retry(attempt, err):
+                            raise
+                        await asyncio.sleep(self.__retry_policy.delay(attempt, getattr(err, 'retry_after', None)))
+                        attempt += counts_as_attempt(err)
+
+            links = list(links_by_path.values())
+            results = await asyncio.gather(*(scrape(link) for link in links), return_exceptions=True)
+
+        n_scrapped, n_errors = 0, 0
+        for link, result in zip(links, results):
+            if isinstance(result, Exception):
+                print(f'Error scrapping {link}: {result}')
+                self._count_article('error')
+                n_errors += 1
+            elif result:
+                n_scrapped += 1
+        self._finish_crawl(success=n_errors == 0)
+        return CrawlSummary(self.__newspaper_name, len(links), n_scrapped, n_errors, time.monotonic() - start)
+
+    def _fetch_news_html(self, link, html_queue):
+        """Function to download the html from a news article and put it in the
+        queue for the extraction stage. It blocks while the queue is full.
+
+        Args:
+            link (str): News link as returned by _clean_news_links
+            html_queue (queue.Queue): Queue of the downloaded news articles.
+        """
+        news_url = self._create_news_url(link)
+        governor = self.__memory_governor if self.__memory_governor is not None else contextlib.nullcontext()
+        try:
+            with governor, self._stage('article_fetch'):
+                website_html, _ = self._call_with_retries(self._fetch_html, news_url)
+        except Exception as err:  # pylint: disable=broad-except
+            html_queue.put((link, news_url, None, err))
+            return
+        html_queue.put((link, news_url, website_html, None))
+
+    def _save_extracted(self, futures, download_images=True):
+        """Function to save the news articles returned by the extraction workers,
+        all of them in one batch. A news article that can't be saved doesn't
+        stop the others.
+
+        Args:
+            futures (set): Finished futures of extract_article.
+            download_images (bool): If False the images aren't downloaded.
+
+        Returns:
+            int: Number of news articles saved.
+        """
+        articles = []
+        for future in futures:
+            try:
+                article, parse_seconds = future.result()
+            except Exception as err:  # pylint: disable=broad-except
+                print(f'Error extracting a news article: {err}')
+                self._count_article('error')
+                continue
+            self.__metrics.observe(STAGE_SECONDS, parse_seconds, newspaper=self.__newspaper_name,
+                                   stage='article_parse')
+            articles.append(article)
+        failed = []
+        self._save_articles(articles, download_images=download_images, failed=failed)
+        return len(articles) - len(failed)
+
+    def crawl_website_multiprocess(self, soup, header_name_news, header_class_news,
+                                   fetch_workers=8, extract_workers=None, queue_size=32):
+        """Function to fully crawl a newspaper website with a pipeline of three
+        stages: threads downloading the html, a pool of processes extracting the
+        data, and this thread saving it. Bounded queues between the stages stop
+        the downloads while the extraction is behind.
+
+        Args:
+            soup (BeautifulSoup Object): BeautifulSoup object to crawl the website
+            header_name_news (str): Headers at the main page that contain the news
+            header_class_news (str): header_name_news class in the html file.
+            fetch_workers (int): Number of threads downloading news articles.
+            extract_workers (int): Number of extraction processes, by default one per core.
+            queue_size (int): Max number of news articles waiting between the stages.
+
+        Returns:
+            int: Number of news articles saved.
+        """
+        return self._crawl_links_multiprocess(self._get_news_links(soup, header_name_news, header_class_news),
+                                              fetch_workers=fetch_workers, extract_workers=extract_workers,
+                                              queue_size=queue_size)
+
+    def _crawl_links_multiprocess(self, all_links, fetch_workers=8, extract_workers=None, queue_size=32):
+        """Function to get all the news not saved yet from a list of news links
+        with the multiprocess pipeline of crawl_website_multiprocess.
+
+        Args:
+            all_links (list): List with the news links cleaned by the newspaper scrapper.
+            fetch_workers (int): Number of threads downloading news articles.
+            extract_workers (int): Number of extraction processes, by default one per core.
+            queue_size (int): Max number of news articles waiting between the stages.
+
+        Returns:
+            int: Number of news articles saved.
+        """
+        all_links = self._select_new_links(all_links)
+        self._create_newspaper_folder()
+        html_queue = queue.Queue(maxsize=queue_size)
+        n_saved = 0
+        with ThreadPoolExecutor(max_workers=fetch_workers) as fetchers, \
+                ProcessPoolExecutor(max_workers=extract_workers, initializer=init_extraction_worker,
+                                    initargs=(type(self), self.__parser, self.__selective_parsing)) as extractors:
+            for link in all_links:
+                fetchers.submit(self._fetch_news_html, link, html_queue)
+            pending = set()
+            for _ in all_links:
+                link, news_url, website_html, err = html_queue.get()
+                if err is not None:
+                    print(f'Error downloading {news_url}: {err}')
+                    self._count_article('error')
+                    continue
+                pending.add(extractors.submit(extract_article, link, news_url, website_html))
+                # Backpressure: don't take more html while the extraction is behind.
+                while len(pending) >= queue_size:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    n_saved += self._save_extracted(done)
+            n_saved += self._save_extracted(wait(pending).done)
+        self._finish_crawl(success=n_saved == len(all_links))
+        return n_saved
+
+    def _get_link_from_url(self, news_url):
+        """Function to get the news link, as returned by _clean_news_links, from
+        the full url of a news article. It's the inverse of _create_news_url for
+        the newspapers whose links are relative to their url.
+
+        Args:
+            news_url (str): Full url of the news
+
+        Returns:
+            str: News link.
+        """
+        if news_url.startswith(self.__newspaper_url):
+            return news_url[len(self.__newspaper_url):]
+        return news_url
+
+    def reextract(self, warc_paths, extract_workers=None, queue_size=32):
+        """Function to extract again the news articles archived in WARC files,
+        without any network access, and save them in the storage. Extraction
+        runs in a pool of processes. The images aren't downloaded.
+
+        Args:
+            warc_paths (list): Paths of the WARC files
+            extract_workers (int): Number of extraction processes, by default one per core.
+            queue_size (int): Max number of news articles being extracted at the same time.
+
+        Returns:
+            int: Number of news articles saved.
+        """
+        main_urls = {self.__newspaper_url, self.__newspaper_url.rstrip('/') + '/'}
+        seen_urls = set()
+        n_saved = 0
+        with ProcessPoolExecutor(max_workers=extract_workers, initializer=init_extraction_worker,
+                                 initargs=(type(self), self.__parser, self.__selective_parsing)) as extractors:
+            pending = set()
+            for warc_path in warc_paths:
+                for news_url, status, _, body in iter_warc_responses(warc_path):
+                    if status != 200 or news_url in main_urls or news_url in seen_urls:
+                        continue
+                    seen_urls.add(news_url)
+                    pending.add(extractors.submit(extract_article, self._get_link_from_url(news_url),
+                                                  news_url, body))
+                    while len(pending) >= queue_size:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        n_saved += self._save_extracted(done, download_images=False)
+            n_saved += self._save_extracted(wait(pending).done, download_images=False)
+        self._mark_saved(self.__storage.flush())
+        self._write_metrics()
+        return n_saved
+
+    def deep_crawl(self, frontier='frontier.sqlite', seed_urls=None, max_depth=2, max_per_section=None,
+                   max_urls=None, batch_size=32):
+        """Function to crawl the newspaper following its section and archive
+        pages, not only its main page. The urls are kept in a persistent
+        frontier, so the crawl can be stopped and resumed later: the urls in
+        progress when it stopped are done again, and the ones done are skipped.
+
+        Args:
+            frontier (str/Frontier): Frontier or path of its SQLite database.
+            seed_urls (list): Pages where the crawl starts, the main page by default.
+            max_depth (int): Max number of pages followed from a seed to reach a page.
+            max_per_section (int): Max number of news articles from every section.
+            max_urls (int): Max number of urls crawled in this call, all by default.
+            batch_size (int): Number of urls taken from the frontier at once.
+
+        Returns:
+            int: Number of news articles saved.
+        """
+        owns_frontier = isinstance(frontier, str)
+        if owns_frontier:
+            frontier = Frontier(frontier, max_per_section=max_per_section)
+        try:
+            n_resumed = frontier.reset_in_progress(self.__newspaper_name)
+            if n_resumed:
+                print(f'{self.__newspaper_name}: resuming {n_resumed} urls of a previous crawl.')
+            # Canonical like the pages found in the crawl, so the main page isn't crawled twice.
+            seeds = {canonicalize_url(url) for url in seed_urls or [self.__newspaper_url]}
+            frontier.push_many([self._frontier_item(url, 'page', 0) for url in sorted(seeds)],
+                               self.__newspaper_name)
+            self._create_newspaper_folder()
+            n_saved, n_crawled = 0, 0
+            while max_urls is None or n_crawled < max_urls:
+                n_items = batch_size if max_urls is None else min(batch_size, max_urls - n_crawled)
+                items = frontier.pop_many(self.__newspaper_name, n_items)
+                if not items:
+                    break
+                n_saved += self._deep_crawl_batch(frontier, items, max_depth)
+                n_crawled += len(items)
+            self._finish_crawl()
+            print(f'{self.__newspaper_name} frontier: {frontier.counts(self.__newspaper_name)}')
+            return n_saved
+        finally:
+            if owns_frontier:
+                frontier.close()
+
+    def _deep_crawl_batch(self, frontier, items, max_depth):
+        """Function to crawl a batch of urls from the frontier. The news
+        articles are marked as done once the storage has written them.
+
+        Args:
+            frontier (Frontier): Frontier of the crawl
+            items (list): List with the FrontierItem objects to crawl
+            max_depth (int): Max depth of the pages followed.
+
+        Returns:
+            int: Number of news articles saved.
+        """
+        done, failed = [], []
+        for item in items:
+            try:
+                if item.kind == 'page':
+                    frontier.push_many(self._call_with_retries(self._expand_page, item, max_depth),
+                                       self.__newspaper_name)
+                else:
+                    self._call_with_retries(self._scrape_news, self._get_link_from_url(item.url),
+                                            self.__newsarticle_title_name, self.__newsarticle_title_class,
+                                            self.__newsarticle_body_name, self.__newsarticle_body_class)
+                done.append(item)
+            except Exception as err:  # pylint: disable=broad-except
+                print(f'Error crawling {item.url}: {err}')
+                if item.kind == 'article':
+                    self._count_article('error')
+                failed.append(item.url)
+        self._mark_saved(self.__storage.flush())
+        frontier.mark_many([item.url for item in done], DONE)
+        frontier.mark_many(failed, FAILED)
+        return sum(item.kind == 'article' for item in done)
+
+    def _expand_page(self, item, max_depth):
+        """Function to get the news articles not saved yet and the pages
+        linked from a section or archive page.
+
+        Args:
+            item (FrontierItem): Page of the frontier
+            max_depth (int): Max depth of the pages followed.
+
+        Returns:
+            list: List with the FrontierItem objects found.
+        """
+        soup = self._init_bs4(item.url, page='section')
+        all_news_urls = [self._create_news_url(link) for link in
+                         self._get_news_links(soup, self.__header_name_news, self.__header_class_news)]
+        news_urls = all_news_urls
+        if self.url_index_ is not None:
+            news_urls = self.url_index_.filter_new(news_urls)
+        items = [self._frontier_item(news_url, 'article', item.depth + 1) for news_url in news_urls]
+        if item.depth < max_depth:
+            host = urlparse(self.__newspaper_url).netloc
+            articles = {canonicalize_url(news_url) for news_url in all_news_urls}
+            for tag in soup.find_all('a', href=True):
+                url = canonicalize_url(urljoin(item.url, tag['href']))
+                if urlparse(url).netloc == host and url not in articles and self._is_crawlable_page(url):
+                    items.append(self._frontier_item(url, 'page', item.depth + 1))
+        soup.decompose()
+        return items
+
+    def _frontier_item(self, url, kind, depth):
+        """Function to create the frontier item of an url. The section is the
+        first folder of the url path, and the news articles go before the pages.
+
+        Args:
+            url (str): Full url
+            kind (str): 'page' or 'article'
+            depth (int): Number of pages followed from a seed to reach the url.
+
+        Returns:
+            FrontierItem: Item for the frontier.
+        """
+        section = urlparse(url).path.strip('/').partition('/')[0]
+        return FrontierItem(url, kind, depth, section, 1 if kind == 'article' else 0)
+
+    def _is_crawlable_page(self, url):
+        """Function to know if a link from the newspaper must be followed in
+        a deep crawl. By default every page is followed, but not files like
+        images or documents. It can be overrided to follow only some sections.
+
+        Args:
+            url (str): Full url of the link
+
+        Returns:
+            bool: True if the page must be followed.
+        """
+        extension = os.path.splitext(urlparse(url).path)[1].lower()
+        return extension in ('', '.html', '.htm', '.shtml')
+
+    def _finish_crawl(self, success=True):
+        """Function to write the news articles buffered by the storage and to
+        print how long every host has been waiting for the rate limiter. The
+        news articles waiting to be added to the search index are written. If the
+        crawl had no errors, its start is saved as the last run of the newspaper,
+        so the next feed discovery skips the entries published before it. The
+        metrics are written if the scrapper has a path for them.
+
+        Args:
+            success (bool): If True all the news articles have been saved.
+        """
+        self._mark_saved(self.__storage.flush())
+        if self.__search_index is not None:
+            self.__search_index.flush()
+        if success and self.__discovery_started is not None and self.url_index_ is not None:
+            self.url_index_.set_last_run(self.__newspaper_name, self.__discovery_started)
+        self.__discovery_started = None
+        if self.__transport.rate_limiter_ is not None:
+            self.__transport.rate_limiter_.report()
+        self._write_metrics()
 
     def get_info_from_newspaper(self, url, newsarticle_title_name, newsarticle_title_class,
                                    newsarticle_body_name, newsarticle_body_class):
@@ -263,7 +1457,50 @@ class NewsScrapper(ABC):
             list, list, str: Return a list with the text, a list with
             the images sources and the tittle of the news.
         """
-        soup = self._init_bs4(url)
+        parse_only = self._news_article_strainer(newsarticle_title_name, newsarticle_title_class,
+                                                 newsarticle_body_name, newsarticle_body_class)
+        soup = self._init_bs4(url, parse_only=parse_only)
+        try:
+            return self._extract_info(soup, newsarticle_title_name, newsarticle_title_class,
+                                      newsarticle_body_name, newsarticle_body_class)
+        finally:
+            # Free the tree now, the extracted data are plain strings.
+            soup.decompose()
+
+    def _news_article_strainer(self, newsarticle_title_name, newsarticle_title_class,
+                               newsarticle_body_name, newsarticle_body_class):
+        """Function to get the strainer for a news article.
+
+        Args:
+            newsarticle_title_name (str): String with the news article title name in the html file
+            newsarticle_title_class (str): String with the news article title class in the html file
+            newsarticle_body_name (str): String with the news body name in the html file.
+            newsarticle_body_class (str): String with the news body class in the html file.
+
+        Returns:
+            SoupStrainer: Strainer that keeps the title, the body and the images,
+            or None if the scrapper doesn't use selective parsing.
+        """
+        if not self.__selective_parsing:
+            return None
+        return news_article_strainer(newsarticle_title_name, newsarticle_title_class,
+                                     newsarticle_body_name, newsarticle_body_class)
+
+    def _extract_info(self, soup, newsarticle_title_name, newsarticle_title_class,
+                      newsarticle_body_name, newsarticle_body_class):
+        """Function to extract text, title and images_src from a parsed news article.
+
+        Args:
+            soup (bs4 object): bs4 object initialized over a newspaper article.
+            newsarticle_title_name (str): String with the news article title name in the html file
+            newsarticle_title_class (str): String with the news article title class in the html file
+            newsarticle_body_name (str): String with the news body name in the html file.
+            newsarticle_body_class (str): String with the news body class in the html file.
+
+        Returns:
+            list, list, str: Return a list with the text, a list with
+            the images sources and the tittle of the news.
+        """
         try:
             title = soup.find(name=newsarticle_title_name, class_=newsarticle_title_class).getText()
         except AttributeError:
@@ -272,9 +1509,32 @@ class NewsScrapper(ABC):
         images_src = self._get_images_src(soup)
         article = soup.find_all(name=newsarticle_body_name, class_=newsarticle_body_class)
         p_tags_text = self._get_paragraph_text(article)
+        if self.__profiler is not None:
+            # The soup is still alive, so the snapshot shows the memory of the parse.
+            self.__profiler.allocation_checkpoint()
         return p_tags_text, images_src, title
 
-    def _create_and_save_metadata(self, title, link, n_images, file_path):
+    def extract_news_article(self, website_html):
+        """Function to extract text, title and images_src from the html of a
+        news article, without any network access.
+
+        Args:
+            website_html (str): Html of the news article
+
+        Returns:
+            list, list, str: Return a list with the text, a list with
+            the images sources and the tittle of the news.
+        """
+        parse_only = self._news_article_strainer(self.__newsarticle_title_name, self.__newsarticle_title_class,
+                                                 self.__newsarticle_body_name, self.__newsarticle_body_class)
+        soup = self.__bs4(website_html, self.__parser, parse_only=parse_only)
+        try:
+            return self._extract_info(soup, self.__newsarticle_title_name, self.__newsarticle_title_class,
+                                      self.__newsarticle_body_name, self.__newsarticle_body_class)
+        finally:
+            soup.decompose()
+
+    def _create_and_save_metadata(self, title, link, n_images, file_path, cluster_id=None):
         """Function that create and save metadata from the news article into our local system.
 
         Args:
@@ -282,8 +1542,10 @@ class NewsScrapper(ABC):
             link (str): Url of the news article
             n_images (int): Number of images from the news article
             file_path (str): Path to save the data in our local system
+            cluster_id (int): Id of the cluster of near duplicates, if known.
         """
-        metadata = self.create_metadata_for_newspaper_url(title=title, url=link, n_images=n_images)
+        metadata = self.create_metadata_for_newspaper_url(title=title, url=link, n_images=n_images,
+                                                          cluster_id=cluster_id)
         self._save_metadata(metadata=metadata, file_path=file_path)
 
     def _get_paragraph_text(self, article):
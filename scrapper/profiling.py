@@ -0,0 +1,318 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Profiling of the crawl runs.
+
+A Profiler captures where a run spends its time, with cProfile or with a
+sampling profiler that walks the stacks of all the threads, and which
+lines hold the memory while the news articles are parsed, with
+tracemalloc. The results are written to a folder, and summarised by
+component: BeautifulSoup, the html parser, I/O and our own code.
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+
+PROFILE_MODES = ('cprofile', 'sample')
+
+# First match wins, so the more specific paths go first.
+COMPONENTS = (
+    ('beautifulsoup', ('/bs4/',)),
+    ('parser', ('/html/parser', '/lxml/', '/html5lib/', '/_markupbase')),
+    ('io', ('/requests/', '/urllib3/', '/http/', '/ssl', '/socket', '/selectors', '/sqlite3/', '/gzip',
+            '/json/', '/pyarrow/', 'genericpath', '/shutil')),
+    ('scrapper', ('/scrapper/',)),
+)
+
+
+def component_of(filename):
+    """Function to get the component a source file belongs to.
+
+    Args:
+        filename (str): Path of the source file
+
+    Returns:
+        str: 'beautifulsoup', 'parser', 'io', 'scrapper', 'builtin' or 'other'.
+    """
+    if filename == '~':
+        # cProfile gives this name to the functions written in C, like the lock waits.
+        return 'builtin'
+    filename = filename.replace('\\', '/')
+    for component, patterns in COMPONENTS:
+        if any(pattern in filename for pattern in patterns):
+            return component
+    return 'other'
+
+
+def _frame_name(code):
+    """Function to get a short name of a function for the reports.
+
+    Args:
+        code (code): Code object of the function
+
+    Returns:
+        str: Name as 'file.py:function'.
+    """
+    return f'{os.path.basename(code.co_filename)}:{code.co_name}'
+
+
+class SamplingProfiler:
+    """Class that implements a sampling profiler: a thread takes the stack of
+    every other thread at a fixed interval. It sees all the threads and adds
+    little overhead, and the time waiting for I/O shows up too.
+    """
+    def __init__(self, interval=0.005) -> None:
+        self.__interval = interval
+        self.__stacks = Counter()
+        self.__self_samples = Counter()
+        self.__components = Counter()
+        self.__n_samples = 0
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    @property
+    def n_samples_(self):
+        """Number of samples property.
+
+        Returns:
+            int: Number of stacks sampled.
+        """
+        return self.__n_samples
+
+    def _sample(self):
+        """Function to take the stacks of all the other threads once.
+        """
+        own_id = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():  # pylint: disable=protected-access
+            if thread_id == own_id:
+                continue
+            stack = []
+            self.__self_samples[_frame_name(frame.f_code)] += 1
+            self.__components[component_of(frame.f_code.co_filename)] += 1
+            while frame is not None:
+                stack.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            self.__stacks[';'.join(reversed(stack))] += 1
+            self.__n_samples += 1
+
+    def _run(self):
+        """Function that samples until the profiler is stopped.
+        """
+        while not self.__stop.wait(self.__interval):
+            self._sample()
+
+    def start(self):
+        """Function to start sampling in a background thread.
+        """
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Function to stop sampling.
+        """
+        self.__stop.set()
+        self.__thread.join()
+
+    def write(self, output_dir, top=30):
+        """Function to write the samples: the stacks in the folded format read
+        by the flame graph tools, and the functions with more samples.
+
+        Args:
+            output_dir (str): Folder of the results
+            top (int): Number of functions in the report.
+
+        Returns:
+            Counter: Samples of every component.
+        """
+        with open(os.path.join(output_dir, 'samples.folded'), 'w') as file:
+            for stack, count in self.__stacks.most_common():
+                file.write(f'{stack} {count}\n')
+        with open(os.path.join(output_dir, 'samples.txt'), 'w') as file:
+            file.write(f'{self.__n_samples} samples every {self.__interval * 1000:.1f}ms\n\n')
+            file.write('Functions with more samples on top of the stack:\n')
+            for name, count in self.__self_samples.most_common(top):
+                file.write(f'{count:>8} {count / max(self.__n_samples, 1):>7.1%}  {name}\n')
+        return self.__components
+
+
+class Profiler:
+    """Class that profiles a crawl run. Use it as a context manager around the
+    run, or pass it to NewsScrapper.pipeline. The scrapper calls
+    allocation_checkpoint once a news article is parsed, so the allocation
+    report shows the memory held by the parse and extraction path.
+    """
+    def __init__(self, output_dir=None, mode='cprofile', tracemalloc_top=25, sample_interval=0.005,
+                 snapshot_interval=1.0) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f'Unknown profile mode {mode}, use one of {", ".join(PROFILE_MODES)}.')
+        self.__output_dir = output_dir
+        self.__mode = mode
+        self.__tracemalloc_top = tracemalloc_top
+        self.__sample_interval = sample_interval
+        self.__snapshot_interval = snapshot_interval
+        self.__profile = None
+        self.__sampler = None
+        self.__snapshot = None
+        self.__snapshot_size = -1
+        self.__last_snapshot = 0.0
+        self.__lock = threading.Lock()
+        self.__started_tracemalloc = False
+        self.__start = None
+
+    @property
+    def output_dir_(self):
+        """Output folder property.
+
+        Returns:
+            str: Folder where the results are written, or None if it isn't set yet.
+        """
+        return self.__output_dir
+
+    @output_dir_.setter
+    def output_dir_(self, output_dir):
+        self.__output_dir = output_dir
+
+    def start(self):
+        """Function to start profiling.
+        """
+        self.__start = time.perf_counter()
+        if self.__tracemalloc_top and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started_tracemalloc = True
+        if self.__mode == 'cprofile':
+            self.__profile = cProfile.Profile()
+            self.__profile.enable()
+        else:
+            self.__sampler = SamplingProfiler(self.__sample_interval)
+            self.__sampler.start()
+
+    def allocation_checkpoint(self):
+        """Function to take a snapshot of the memory allocated, at most once
+        every snapshot_interval seconds. The biggest snapshot is kept.
+        """
+        if not tracemalloc.is_tracing():
+            return
+        now = time.perf_counter()
+        with self.__lock:
+            if now - self.__last_snapshot < self.__snapshot_interval:
+                return
+            self.__last_snapshot = now
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ])
+        size = sum(stat.size for stat in snapshot.statistics('filename'))
+        with self.__lock:
+            if size > self.__snapshot_size:
+                self.__snapshot, self.__snapshot_size = snapshot, size
+
+    def stop(self):
+        """Function to stop profiling and write the results.
+
+        Returns:
+            str: Folder where the results have been written.
+        """
+        elapsed = time.perf_counter() - self.__start
+        if self.__profile is not None:
+            self.__profile.disable()
+        if self.__sampler is not None:
+            self.__sampler.stop()
+        if self.__snapshot is None:
+            self.allocation_checkpoint()
+        output_dir = self.__output_dir or 'profile'
+        os.makedirs(output_dir, exist_ok=True)
+        if self.__profile is not None:
+            components = self._write_cprofile(output_dir)
+            unit = 's'
+        else:
+            components = self.__sampler.write(output_dir)
+            unit = ' samples'
+        memory = self._write_tracemalloc(output_dir)
+        if self.__started_tracemalloc:
+            tracemalloc.stop()
+        with open(os.path.join(output_dir, 'summary.txt'), 'w') as file:
+            file.write(f'Run: {elapsed:.2f}s\n\nCPU by component ({self.__mode}):\n')
+            for component, value in components.most_common():
+                file.write(f'  {component:<14}{value:>10.2f}{unit}\n')
+            file.write('\nMemory held while parsing by component:\n')
+            for component, size in memory.most_common():
+                file.write(f'  {component:<14}{size / 1024:>10.1f} KiB\n')
+        print(f'Profile written to {output_dir}')
+        return output_dir
+
+    def _write_cprofile(self, output_dir):
+        """Function to write the cProfile stats, in binary for pstats or
+        snakeviz and as text with the functions that take more time.
+
+        Args:
+            output_dir (str): Folder of the results
+
+        Returns:
+            Counter: Seconds spent in the functions of every component.
+        """
+        self.__profile.dump_stats(os.path.join(output_dir, 'cprofile.pstats'))
+        text = io.StringIO()
+        stats = pstats.Stats(self.__profile, stream=text)
+        stats.sort_stats('cumulative').print_stats(40)
+        stats.sort_stats('tottime').print_stats(40)
+        with open(os.path.join(output_dir, 'cprofile.txt'), 'w') as file:
+            file.write(text.getvalue())
+        components = Counter()
+        for (filename, _, _), (_, _, tottime, _, _) in stats.stats.items():  # pylint: disable=no-member
+            components[component_of(filename)] += tottime
+        return components
+
+    def _write_tracemalloc(self, output_dir):
+        """Function to write the lines that held more memory in the biggest snapshot.
+
+        Args:
+            output_dir (str): Folder of the results
+
+        Returns:
+            Counter: Bytes held by the lines of every component.
+        """
+        components = Counter()
+        if self.__snapshot is None:
+            return components
+        with open(os.path.join(output_dir, 'tracemalloc.txt'), 'w') as file:
+            file.write(f'Top {self.__tracemalloc_top} lines by memory held, '
+                       f'{self.__snapshot_size / 1024:.1f} KiB in total:\n')
+            for stat in self.__snapshot.statistics('lineno')[:self.__tracemalloc_top]:
+                frame = stat.traceback[0]
+                file.write(f'{stat.size / 1024:>10.1f} KiB {stat.count:>8} blocks  '
+                           f'{frame.filename}:{frame.lineno}\n')
+        for stat in self.__snapshot.statistics('filename'):
+            components[component_of(stat.traceback[0].filename)] += stat.size
+        return components
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
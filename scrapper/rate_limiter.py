@@ -0,0 +1,172 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Politeness scheduler for the requests done to the newspapers.
+
+Each host gets a token bucket that refills at a fixed number of requests
+per second and allows small bursts, so the crawler only waits when it is
+really going faster than allowed.
+"""
+import time
+import threading
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+
+class TokenBucket:
+    """Class that implements a thread safe token bucket. Tokens are reserved
+    in order, so every caller knows how long it must wait for its token.
+    """
+    def __init__(self, rate: float, burst: int) -> None:
+        self.__rate = rate
+        self.__burst = burst
+        self.__tokens = float(burst)
+        self.__last = time.monotonic()
+        self.__lock = threading.Lock()
+
+    @property
+    def rate_(self):
+        """Rate property.
+
+        Returns:
+            float: Tokens added to the bucket per second.
+        """
+        return self.__rate
+
+    @property
+    def burst_(self):
+        """Burst property.
+
+        Returns:
+            int: Max number of tokens in the bucket.
+        """
+        return self.__burst
+
+    def reserve(self):
+        """Function to reserve a token from the bucket.
+
+        Returns:
+            float: Seconds to wait until the reserved token is available.
+        """
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(self.__burst, self.__tokens + (now - self.__last) * self.__rate)
+            self.__last = now
+            self.__tokens -= 1
+            if self.__tokens >= 0:
+                return 0.0
+            return -self.__tokens / self.__rate
+
+
+class RateLimiter:
+    """Class that keeps one token bucket for every host. The rate of a host
+    can be lowered by the Crawl-delay from its robots.txt.
+    """
+    def __init__(self, requests_per_second=1.0, burst=5, use_robots_crawl_delay=True,
+                 user_agent='*') -> None:
+        self.__requests_per_second = requests_per_second
+        self.__burst = burst
+        self.__use_robots_crawl_delay = use_robots_crawl_delay
+        self.__user_agent = user_agent
+        self.__buckets = {}
+        self.__wait_times = {}
+        self.__lock = threading.Lock()
+
+    @property
+    def wait_times_(self):
+        """Wait times property.
+
+        Returns:
+            dict: Seconds waited by every host.
+        """
+        with self.__lock:
+            return dict(self.__wait_times)
+
+    def _crawl_delay(self, robots_url, fetch_robots):
+        """Function to get the Crawl-delay of a host from its robots.txt.
+
+        Args:
+            robots_url (str): Url of the robots.txt
+            fetch_robots (callable): Function that returns the text from a url.
+
+        Returns:
+            float: Crawl-delay in seconds, or None if it isn't set.
+        """
+        try:
+            robots_txt = fetch_robots(robots_url)
+        except Exception as err:  # pylint: disable=broad-except
+            print(f'Unable to read {robots_url}: {err}')
+            return None
+        robots = RobotFileParser()
+        robots.parse(robots_txt.splitlines())
+        delay = robots.crawl_delay(self.__user_agent)
+        return float(delay) if delay else None
+
+    def _get_bucket(self, url, fetch_robots=None):
+        """Function to get the token bucket of the url host, creating it if
+        it's the first time the host is seen.
+
+        Args:
+            url (str): Url that is going to be requested
+            fetch_robots (callable): Function that returns the text from a url,
+            used to read the robots.txt of a new host.
+
+        Returns:
+            str, TokenBucket: Host of the url and its token bucket.
+        """
+        parsed_url = urlparse(url)
+        host = parsed_url.netloc
+        with self.__lock:
+            bucket = self.__buckets.get(host)
+        if bucket is not None:
+            return host, bucket
+        rate, burst = self.__requests_per_second, self.__burst
+        if self.__use_robots_crawl_delay and fetch_robots is not None:
+            delay = self._crawl_delay(f'{parsed_url.scheme}://{host}/robots.txt', fetch_robots)
+            if delay:
+                rate, burst = min(rate, 1 / delay), 1
+        with self.__lock:
+            bucket = self.__buckets.setdefault(host, TokenBucket(rate, burst))
+            self.__wait_times.setdefault(host, 0.0)
+        return host, bucket
+
+    def acquire(self, url, fetch_robots=None):
+        """Function to wait until a request to the url host is allowed.
+
+        Args:
+            url (str): Url that is going to be requested
+            fetch_robots (callable): Function that returns the text from a url,
+            used to read the robots.txt of a new host.
+
+        Returns:
+            float: Seconds waited.
+        """
+        host, bucket = self._get_bucket(url, fetch_robots)
+        wait = bucket.reserve()
+        if wait > 0:
+            time.sleep(wait)
+            with self.__lock:
+                self.__wait_times[host] += wait
+        return wait
+
+    def report(self):
+        """Function to print how long every host has been waiting.
+        """
+        for host, wait in sorted(self.wait_times_.items()):
+            print(f'{host}: {wait:.1f}s waiting for the rate limiter.')
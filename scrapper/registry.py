@@ -0,0 +1,168 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Registry of the newspaper scrappers.
+
+The registry maps every newspaper name to the 'module:Class' path of its
+scrapper, and only imports the module when the scrapper is used, so
+listing the newspapers or creating one of them doesn't import the rest.
+Other packages can add newspapers with an entry point in the
+'scrapper.newspapers' group, for example in their pyproject.toml:
+
+    [project.entry-points."scrapper.newspapers"]
+    lavanguardia = "my_package.lavanguardia:LaVanguardiaScrapper"
+"""
+import importlib
+import threading
+from importlib import metadata
+
+
+ENTRY_POINT_GROUP = 'scrapper.newspapers'
+
+BUILTIN_NEWSPAPERS = {
+    'elpais': 'scrapper.elpais_scrapper:ElPaisScrapper',
+    'elmundo': 'scrapper.elmundo_scrapper:ElMundoScrapper',
+    'abc': 'scrapper.abc_scrapper:ABCScrapper',
+    'ideal': 'scrapper.ideal_scrapper:IdealScrapper',
+}
+
+
+def _entry_points(group):
+    """Function to get the entry points of a group, with the API of any Python 3 version.
+
+    Args:
+        group (str): Name of the group
+
+    Returns:
+        list: List with the EntryPoint objects.
+    """
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        return list(entry_points.select(group=group))
+    return list(entry_points.get(group, []))
+
+
+class NewspaperRegistry:
+    """Class that maps the newspaper names to their scrapper classes, importing
+    every class the first time it's loaded. The entry points are read the first
+    time the registry is used, without importing them.
+    """
+    def __init__(self, newspapers=None, entry_point_group=ENTRY_POINT_GROUP) -> None:
+        self.__targets = dict(BUILTIN_NEWSPAPERS if newspapers is None else newspapers)
+        self.__entry_point_group = entry_point_group
+        self.__entry_points_loaded = entry_point_group is None
+        self.__classes = {}
+        self.__lock = threading.Lock()
+
+    def _load_entry_points(self):
+        """Function to add the newspapers from the entry points. The built-in
+        and registered newspapers keep their name.
+        """
+        if self.__entry_points_loaded:
+            return
+        for entry_point in _entry_points(self.__entry_point_group):
+            self.__targets.setdefault(entry_point.name, entry_point)
+        self.__entry_points_loaded = True
+
+    def register(self, name, target):
+        """Function to add a newspaper, or to replace the scrapper of one.
+
+        Args:
+            name (str): Name of the newspaper
+            target (str/type): 'module:Class' path of the scrapper, or the class.
+        """
+        with self.__lock:
+            self.__targets[name] = target
+            self.__classes.pop(name, None)
+
+    def names(self):
+        """Function to get the names of the newspapers, the built-in ones first.
+
+        Returns:
+            list: List with the names.
+        """
+        with self.__lock:
+            self._load_entry_points()
+            return list(self.__targets)
+
+    def __contains__(self, name):
+        return name in self.names()
+
+    def load(self, name):
+        """Function to get the scrapper class of a newspaper, importing it if needed.
+
+        Args:
+            name (str): Name of the newspaper
+
+        Returns:
+            type: NewsScrapper subclass of the newspaper.
+
+        Raises:
+            ValueError: If there isn't a newspaper with that name.
+        """
+        with self.__lock:
+            if name in self.__classes:
+                return self.__classes[name]
+            self._load_entry_points()
+            target = self.__targets.get(name)
+            if target is None:
+                raise ValueError(f'No newspaper called {name}. Available: {", ".join(self.__targets)}.')
+            if isinstance(target, str):
+                module_name, _, class_name = target.partition(':')
+                scrapper_class = getattr(importlib.import_module(module_name), class_name)
+            elif isinstance(target, metadata.EntryPoint):
+                scrapper_class = target.load()
+            else:
+                scrapper_class = target
+            self.__classes[name] = scrapper_class
+            return scrapper_class
+
+
+NEWSPAPERS = NewspaperRegistry()
+
+
+def available_newspapers():
+    """Function to get the names of all the newspapers.
+
+    Returns:
+        list: List with the names.
+    """
+    return NEWSPAPERS.names()
+
+
+def load_newspaper(name):
+    """Function to get the scrapper class of a newspaper.
+
+    Args:
+        name (str): Name of the newspaper
+
+    Returns:
+        type: NewsScrapper subclass of the newspaper.
+    """
+    return NEWSPAPERS.load(name)
+
+
+def register_newspaper(name, target):
+    """Function to add a newspaper to the registry.
+
+    Args:
+        name (str): Name of the newspaper
+        target (str/type): 'module:Class' path of the scrapper, or the class.
+    """
+    NEWSPAPERS.register(name, target)
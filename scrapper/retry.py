@@ -0,0 +1,318 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Retries of the failed requests and circuit breaker for the hosts.
+
+The requests that fail because the newspaper is overloaded or throttling
+us (timeouts, connection errors, 429 and 5xx responses) are retried later
+with jittered exponential backoff, waiting at least what the server asks
+in its Retry-After header. When a host keeps failing, its circuit breaker
+opens and the requests to it fail fast until it's tried again. If it
+keeps failing after being tried again a few times, the host is given up:
+its requests fail without being retried, so a host that is down doesn't
+keep the crawl waiting.
+"""
+import heapq
+import itertools
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+import requests
+
+
+RETRYABLE_STATUS = frozenset([429, 500, 502, 503, 504])
+
+
+class RetryableError(requests.HTTPError):
+    """Error raised by the transport when a request fails for a reason that
+    could go away if it's retried later.
+    """
+    def __init__(self, message, retry_after=None, **kwargs) -> None:
+        super().__init__(message, **kwargs)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(RetryableError):
+    """Error raised, without doing the request, when the circuit breaker of
+    the host is open. retry_after is the time until the host is tried again.
+    As no request was done, it doesn't count as a failed attempt.
+    """
+
+
+class HostDownError(requests.RequestException):
+    """Error raised, without doing the request, when the circuit breaker of
+    the host has given it up. It isn't retried.
+    """
+
+
+def parse_retry_after(value):
+    """Function to parse a Retry-After header, given in seconds or as an HTTP date.
+
+    Args:
+        value (str): Value of the header
+
+    Returns:
+        float: Seconds to wait, or None if there is no valid value.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max((date - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def counts_as_attempt(err):
+    """Function to know if a failed call counts as one of the attempts of a request.
+
+    Args:
+        err (Exception): Error raised by the request
+
+    Returns:
+        bool: False if the request wasn't done because its host is paused.
+    """
+    return not isinstance(err, CircuitOpenError)
+
+
+def is_retryable(err):
+    """Function to know if a failed request can be retried later.
+
+    Args:
+        err (Exception): Error raised by the request
+
+    Returns:
+        bool: True for timeouts, connection errors and retryable responses.
+    """
+    return isinstance(err, (RetryableError, requests.ConnectionError, requests.Timeout))
+
+
+class RetryPolicy:
+    """Class with the number of attempts of a request and the delay before
+    every retry: full jitter exponential backoff, never shorter than the
+    Retry-After asked by the server.
+    """
+    def __init__(self, max_attempts=4, base_delay=1.0, max_delay=60.0) -> None:
+        self.__max_attempts = max_attempts
+        self.__base_delay = base_delay
+        self.__max_delay = max_delay
+
+    @property
+    def max_attempts_(self):
+        """Max attempts property.
+
+        Returns:
+            int: Max number of times a request is tried.
+        """
+        return self.__max_attempts
+
+    def delay(self, attempt, retry_after=None):
+        """Function to get the seconds to wait before a retry.
+
+        Args:
+            attempt (int): Number of attempts already done
+            retry_after (float): Seconds asked by the server, if any.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        delay = random.uniform(0, min(self.__max_delay, self.__base_delay * 2 ** (max(attempt, 1) - 1)))
+        if retry_after is not None:
+            # Keep the jitter, so the requests waiting for the same host don't go all at once.
+            delay = min(retry_after, self.__max_delay * 10) + random.uniform(0, self.__base_delay)
+        return delay
+
+    def should_retry(self, attempt, err):
+        """Function to know if a failed request must be retried.
+
+        Args:
+            attempt (int): Number of attempts already done, counting the failed one.
+            err (Exception): Error of the last attempt.
+
+        Returns:
+            bool: True if the error can be retried and there are attempts left.
+        """
+        if not is_retryable(err):
+            return False
+        return not counts_as_attempt(err) or attempt < self.__max_attempts
+
+
+class RetryQueue:
+    """Class that implements a queue of failed items ordered by the time
+    when they can be retried.
+    """
+    def __init__(self, policy=None) -> None:
+        self.__policy = policy if policy is not None else RetryPolicy()
+        self.__heap = []
+        self.__counter = itertools.count()
+
+    def __len__(self):
+        return len(self.__heap)
+
+    def push(self, item, attempt, err):
+        """Function to add an item that has failed to the queue.
+
+        Args:
+            item (object): Item to retry
+            attempt (int): Number of attempts already done, counting the failed one.
+            err (Exception): Error of the last attempt.
+
+        Returns:
+            bool: False if the error can't be retried or there are no attempts left.
+        """
+        if not self.__policy.should_retry(attempt, err):
+            return False
+        if not counts_as_attempt(err):
+            attempt -= 1
+        ready_at = time.monotonic() + self.__policy.delay(attempt, getattr(err, 'retry_after', None))
+        heapq.heappush(self.__heap, (ready_at, next(self.__counter), item, attempt))
+        return True
+
+    def pop(self):
+        """Function to take the next item to retry, waiting until it can be retried.
+
+        Returns:
+            object, int: Item and number of attempts already done, counting the failed ones.
+        """
+        ready_at, _, item, attempt = heapq.heappop(self.__heap)
+        time.sleep(max(ready_at - time.monotonic(), 0.0))
+        return item, attempt
+
+
+class CircuitBreaker:
+    """Class that implements a thread safe circuit breaker for every host.
+    After failure_threshold consecutive failures the host is paused for
+    reset_timeout, and when the server asks to wait with Retry-After it's
+    paused for that time. Once the pause ends one request
+    is let through: if it works the host is closed again, otherwise the pause
+    is doubled, up to max_reset_timeout. After max_failed_trials failed
+    trial requests in a row, or once it has been paused for more than
+    max_open_time, the host is given up for max_reset_timeout, and its
+    requests fail with HostDownError instead of waiting.
+    """
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, max_reset_timeout=600.0,
+                 max_failed_trials=3, max_open_time=900.0) -> None:
+        self.__failure_threshold = failure_threshold
+        self.__reset_timeout = reset_timeout
+        self.__max_reset_timeout = max_reset_timeout
+        self.__max_failed_trials = max_failed_trials
+        self.__max_open_time = max_open_time
+        self.__lock = threading.Lock()
+        # host -> [consecutive failures, opened until, current pause, trial request running, failed trials,
+        #          first opened at]
+        self.__hosts = {}
+
+    def _give_up(self, host, state, reason):
+        """Function to give up a host for max_reset_timeout. Must be called with the lock held.
+
+        Args:
+            host (str): Host of the requests
+            state (list): State of the host
+            reason (str): Why the host is given up, for the message.
+        """
+        state[1], state[2], state[3] = time.monotonic() + self.__max_reset_timeout, self.__max_reset_timeout, False
+        state[4] = max(state[4], self.__max_failed_trials)
+        print(f'Giving up {host} for {self.__max_reset_timeout:.0f}s after {reason}.')
+
+    def before_request(self, host):
+        """Function to check if a request to a host can be done.
+
+        Args:
+            host (str): Host of the request
+
+        Raises:
+            CircuitOpenError: If the host is paused.
+            HostDownError: If the host has been given up.
+        """
+        with self.__lock:
+            state = self.__hosts.get(host)
+            if state is None or state[1] is None:
+                return
+            now = time.monotonic()
+            remaining = state[1] - now
+            if remaining <= 0 and not state[3]:
+                state[3] = True
+                return
+            if state[4] < self.__max_failed_trials and now - state[5] > self.__max_open_time:
+                self._give_up(host, state, f'being paused for {now - state[5]:.0f}s')
+            if state[4] >= self.__max_failed_trials:
+                raise HostDownError(f'{host} is down, giving up its requests')
+        raise CircuitOpenError(f'Circuit open for {host}', retry_after=max(remaining, 1.0))
+
+    def record_success(self, host):
+        """Function to record a request that has worked, closing the host.
+
+        Args:
+            host (str): Host of the request
+        """
+        with self.__lock:
+            self.__hosts.pop(host, None)
+
+    def release_trial(self, host):
+        """Function to record that a request ended without telling if the host
+        works, like an error of our own, so another trial request can be done.
+
+        Args:
+            host (str): Host of the request
+        """
+        with self.__lock:
+            state = self.__hosts.get(host)
+            if state is not None:
+                state[3] = False
+
+    def record_failure(self, host, retry_after=None):
+        """Function to record a failed request, opening the host if needed.
+
+        Args:
+            host (str): Host of the request
+            retry_after (float): Seconds asked by the server, if any.
+        """
+        with self.__lock:
+            state = self.__hosts.setdefault(host, [0, None, 0.0, False, 0, None])
+            state[0] += 1
+            if state[3]:
+                # The trial request after a pause has failed too.
+                state[4] += 1
+                if state[4] >= self.__max_failed_trials:
+                    self._give_up(host, state, f'{state[4]} failed trials')
+                    return
+                pause = min(state[2] * 2, self.__max_reset_timeout)
+            elif state[1] is None and state[0] >= self.__failure_threshold:
+                pause = self.__reset_timeout
+                print(f'Pausing {host} after {state[0]} failed requests.')
+            elif state[1] is None and retry_after:
+                # The server asks to wait, so wait only what it asks.
+                pause = 0.0
+                print(f'Pausing {host} for {retry_after:.0f}s as asked by the server.')
+            else:
+                return
+            if retry_after is not None:
+                pause = max(pause, min(retry_after, self.__max_reset_timeout))
+            if state[1] is None:
+                state[5] = time.monotonic()
+            state[1], state[2], state[3] = time.monotonic() + pause, pause, False
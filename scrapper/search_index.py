@@ -0,0 +1,741 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Inverted index of the saved news articles, for term, phrase and date searches.
+
+The index is a folder with a SQLite database, with the news articles and
+the term dictionary, and the postings of the terms in segment files. The
+news articles are buffered and written in batches as a new segment by a
+background thread, so the index is only appended to and the crawl doesn't
+wait for it. The segments are never changed: when there are merge_factor
+segments of the same level they are merged in a new one of the next
+level, so a search only reads a few segments whatever the number of news
+articles indexed.
+
+For every term of a field of a segment, the postings file has the sorted
+ids of the news articles, the number of times the term is in every one of
+them, where the positions of every block of SKIP_INTERVAL news articles
+start, and the positions, as arrays of 32 bit ints. The files are memory
+mapped, so a search only reads the postings of its terms. The news
+articles are searched from the newest ones in windows of ids that grow,
+so a search for common terms stops as soon as it has enough results.
+
+Search the index from the command line with:
+
+    python -m scrapper.search_index '"banco central" inflación' --newspaper elpais --since 2024-01-01
+"""
+import os
+import re
+import sys
+import mmap
+import shlex
+import sqlite3
+import argparse
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import namedtuple, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from itertools import accumulate, groupby
+
+FIELDS = ('title', 'text')
+TOKEN_RE = re.compile(r'\w+')
+COMBINING_RE = re.compile('[\u0300-\u036f]')
+ITEM_SIZE = array('I').itemsize
+SKIP_INTERVAL = 128
+# Ids of news articles searched in the first window, it's doubled for every next one.
+FIRST_WINDOW = 4096
+# Max number of news articles checked with one query to the database.
+SQL_BATCH = 500
+
+SearchHit = namedtuple('SearchHit', ['id', 'newspaper', 'url', 'title', 'extracted_at'])
+
+
+def tokenize(text):
+    """Function to split a text in the terms that are indexed. The terms are
+    casefolded and lose their accents, so 'Economía' is found with 'economia'.
+
+    Args:
+        text (str): Text to split
+
+    Returns:
+        list: List with the terms, in the order they are in the text.
+    """
+    return TOKEN_RE.findall(COMBINING_RE.sub('', unicodedata.normalize('NFKD', text.casefold())))
+
+
+def parse_query(query):
+    """Function to split a query in its terms and phrases. The words between
+    double quotes are a phrase, and the other words are terms.
+
+    Args:
+        query (str): Query, like '"banco central" inflación'
+
+    Returns:
+        list, list: List with the terms and list with the phrases, every phrase as a list of terms.
+    """
+    terms, phrases = [], []
+    for part in shlex.split(query or ''):
+        tokens = tokenize(part)
+        if len(tokens) == 1:
+            terms.append(tokens[0])
+        elif tokens:
+            phrases.append(tokens)
+    return terms, phrases
+
+
+def _date_bound(value, upper=False):
+    """Function to get the bound of a date range as it's compared with the
+    ISO extraction dates.
+
+    Args:
+        value (str/date/datetime): Date of the bound, or None.
+        upper (bool): If True the bound includes the whole day, or second, given.
+
+    Returns:
+        str: Bound of the range, or None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, date):
+        value = value.isoformat()
+    # '~' sorts after the digits, 'T' and ':', so '2024-05-01~' is after all the dates of that day.
+    return value + '~' if upper else value
+
+
+def _skip_starts(counts):
+    """Function to get where the positions of every block of SKIP_INTERVAL
+    news articles start.
+
+    Args:
+        counts (array): Number of positions of every news article
+
+    Returns:
+        array: Index of the first position of every block.
+    """
+    sums = [sum(counts[i:i + SKIP_INTERVAL]) for i in range(0, len(counts), SKIP_INTERVAL)]
+    return array('I', accumulate(sums[:-1], initial=0))
+
+
+def _n_skips(n_docs):
+    """Function to get the number of blocks of the postings of a term.
+
+    Args:
+        n_docs (int): Number of news articles with the term
+
+    Returns:
+        int: Number of blocks.
+    """
+    return (n_docs + SKIP_INTERVAL - 1) // SKIP_INTERVAL
+
+
+def _read_array(segment_map, start, n_items):
+    """Function to read an array of ints from a memory mapped segment.
+
+    Args:
+        segment_map (mmap): Map of the postings file
+        start (int): Offset of the first int
+        n_items (int): Number of ints
+
+    Returns:
+        array: The ints.
+    """
+    values = array('I')
+    values.frombytes(segment_map[start:start + n_items * ITEM_SIZE])
+    return values
+
+
+class _Postings:
+    """Class with the postings of a term in one or several fields, in every
+    segment that has it. The ids are read from the memory mapped segments the
+    first time they are needed.
+    """
+    def __init__(self, chunks) -> None:
+        # Every chunk is (segment map, offset, number of news articles, first id and last id of the segment).
+        self.__chunks = chunks
+        self.__doc_ids = [None] * len(chunks)
+
+    @property
+    def n_docs_(self):
+        """Number of news articles property.
+
+        Returns:
+            int: Number of news articles with the term.
+        """
+        return sum(chunk[2] for chunk in self.__chunks)
+
+    def _chunk_doc_ids(self, i):
+        """Function to get the ids of the news articles of a chunk.
+
+        Args:
+            i (int): Index of the chunk
+
+        Returns:
+            array: Sorted ids of the news articles.
+        """
+        if self.__doc_ids[i] is None:
+            segment_map, offset, n_docs, _, _ = self.__chunks[i]
+            self.__doc_ids[i] = _read_array(segment_map, offset, n_docs)
+        return self.__doc_ids[i]
+
+    def _ranges(self, low, high):
+        """Function to find the news articles with ids in a window.
+
+        Args:
+            low (int): First id of the window
+            high (int): Id after the last one of the window.
+
+        Yields:
+            array, int, int: Ids of a chunk, and index of the first and after the last ones in the window.
+        """
+        for i, (_, _, _, first_doc, last_doc) in enumerate(self.__chunks):
+            if first_doc < high and last_doc >= low:
+                doc_ids = self._chunk_doc_ids(i)
+                yield doc_ids, bisect_left(doc_ids, low), bisect_left(doc_ids, high)
+
+    def doc_ids(self, low, high):
+        """Function to get the ids of the news articles with the term in a window.
+
+        Args:
+            low (int): First id of the window
+            high (int): Id after the last one of the window.
+
+        Returns:
+            set: Set with the ids.
+        """
+        found = set()
+        for doc_ids, start, end in self._ranges(low, high):
+            found.update(doc_ids[start:end])
+        return found
+
+    def count(self, low, high):
+        """Function to count the news articles with the term in a window.
+
+        Args:
+            low (int): First id of the window
+            high (int): Id after the last one of the window.
+
+        Returns:
+            int: Number of news articles.
+        """
+        return sum(end - start for _, start, end in self._ranges(low, high))
+
+    def _find(self, doc_id):
+        """Function to find a news article in the postings.
+
+        Args:
+            doc_id (int): Id of the news article
+
+        Returns:
+            int, int: Index of its chunk and its index in the chunk, or None if it hasn't got the term.
+        """
+        for i, (_, _, _, first_doc, last_doc) in enumerate(self.__chunks):
+            if first_doc <= doc_id <= last_doc:
+                doc_ids = self._chunk_doc_ids(i)
+                index = bisect_left(doc_ids, doc_id)
+                if index < len(doc_ids) and doc_ids[index] == doc_id:
+                    return i, index
+        return None
+
+    def __contains__(self, doc_id):
+        return self._find(doc_id) is not None
+
+    def positions(self, doc_id):
+        """Function to get the positions of the term in a news article. Only the
+        counts of its block are read, from the start of the block.
+
+        Args:
+            doc_id (int): Id of the news article
+
+        Returns:
+            array: Positions of the term, empty if the news article hasn't got it.
+        """
+        found = self._find(doc_id)
+        if found is None:
+            return array('I')
+        i, index = found
+        segment_map, offset, n_docs, _, _ = self.__chunks[i]
+        block = index // SKIP_INTERVAL
+        counts_offset = offset + n_docs * ITEM_SIZE
+        skips_offset = counts_offset + n_docs * ITEM_SIZE
+        counts = _read_array(segment_map, counts_offset + block * SKIP_INTERVAL * ITEM_SIZE,
+                             index - block * SKIP_INTERVAL + 1)
+        start = _read_array(segment_map, skips_offset + block * ITEM_SIZE, 1)[0] + sum(counts) - counts[-1]
+        positions_offset = skips_offset + _n_skips(n_docs) * ITEM_SIZE
+        return _read_array(segment_map, positions_offset + start * ITEM_SIZE, counts[-1])
+
+
+class SearchIndex:
+    """Class that keeps an inverted index of the title and text of the news
+    articles saved, with their newspaper and extraction date. It can be shared
+    by several scrappers. Saving a news article again, like when it's extracted
+    again from a WARC file, replaces it in the searches.
+    """
+    def __init__(self, path='search_index', batch_size=1000, merge_factor=10) -> None:
+        if sys.byteorder != 'little' or ITEM_SIZE != 4:
+            raise ValueError('The search index needs 32 bit little endian ints.')
+        os.makedirs(path, exist_ok=True)
+        self.__path = path
+        self.__batch_size = batch_size
+        self.__merge_factor = merge_factor
+        self.__lock = threading.Lock()
+        self.__buffer_lock = threading.Lock()
+        self.__buffer = []
+        self.__pending = None
+        self.__maps = {}
+        # The segments are written and merged by one background thread with its
+        # own connection, and with WAL its transactions don't block the searches.
+        self.__writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='search-index')
+        database = os.path.join(path, 'index.sqlite')
+        self.__writer_connection = sqlite3.connect(database, check_same_thread=False)
+        self.__writer_connection.execute('PRAGMA journal_mode=WAL')
+        with self.__writer_connection as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS documents (id INTEGER PRIMARY KEY, url TEXT, '
+                               'newspaper TEXT, title TEXT, extracted_at TEXT, live INTEGER)')
+            connection.execute('CREATE INDEX IF NOT EXISTS documents_url ON documents (url)')
+            connection.execute('CREATE INDEX IF NOT EXISTS documents_date ON documents (extracted_at)')
+            connection.execute('CREATE INDEX IF NOT EXISTS documents_newspaper ON documents (newspaper, extracted_at)')
+            connection.execute('CREATE TABLE IF NOT EXISTS segments (id INTEGER PRIMARY KEY, level INTEGER, '
+                               'first_doc INTEGER, last_doc INTEGER)')
+            connection.execute('CREATE TABLE IF NOT EXISTS terms (term TEXT, field INTEGER, segment INTEGER, '
+                               'offset INTEGER, n_docs INTEGER, n_positions INTEGER, '
+                               'PRIMARY KEY (term, field, segment)) WITHOUT ROWID')
+        self.__connection = sqlite3.connect(database, check_same_thread=False)
+
+    @property
+    def path_(self):
+        """Path property.
+
+        Returns:
+            str: Path of the index folder.
+        """
+        return self.__path
+
+    def _segment_path(self, segment):
+        """Function to get the path of the postings file of a segment.
+
+        Args:
+            segment (int): Id of the segment
+
+        Returns:
+            str: Path of the postings file.
+        """
+        return os.path.join(self.__path, f'segment-{segment:08d}.postings')
+
+    def _map_segment(self, segment):
+        """Function to memory map the postings file of a segment.
+
+        Args:
+            segment (int): Id of the segment
+
+        Returns:
+            mmap: Read only map of the file.
+        """
+        with open(self._segment_path(segment), 'rb') as file:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _segment_map(self, segment):
+        """Function to get the memory map of a segment used by the searches,
+        mapping it the first time. Called with the lock.
+
+        Args:
+            segment (int): Id of the segment
+
+        Returns:
+            mmap: Read only map of the file.
+        """
+        if segment not in self.__maps:
+            self.__maps[segment] = self._map_segment(segment)
+        return self.__maps[segment]
+
+    def add_many(self, articles):
+        """Function to add several news articles to the index. They are written
+        in a new segment by the background writer once there are batch_size
+        news articles waiting, so they are searchable after that or after flush.
+
+        Args:
+            articles (list): List with Article objects.
+        """
+        with self.__buffer_lock:
+            self.__buffer.extend((article.url, article.newspaper, article.title, article.text,
+                                  article.extracted_at) for article in articles)
+            if len(self.__buffer) >= self.__batch_size:
+                self._submit()
+
+    def add(self, article):
+        """Function to add a news article to the index.
+
+        Args:
+            article (Article): News article
+        """
+        self.add_many([article])
+
+    def _submit(self):
+        """Function to send the buffered news articles to the background writer.
+        Only one batch is written at a time, so if the writer is behind the
+        caller waits for the previous batch. Called with the buffer lock.
+        """
+        if self.__pending is not None:
+            self.__pending.result()
+        batch, self.__buffer = self.__buffer, []
+        self.__pending = self.__writer.submit(self._write_segment, batch)
+
+    def flush(self):
+        """Function to write the news articles waiting in the buffer and wait
+        until they are searchable.
+        """
+        with self.__buffer_lock:
+            if self.__buffer:
+                self._submit()
+            if self.__pending is not None:
+                pending, self.__pending = self.__pending, None
+                pending.result()
+
+    def _write_segment(self, batch):
+        """Function to write a batch of news articles as a new segment, and to
+        merge the segments if there are too many of the same level. Runs in the
+        background writer.
+
+        Args:
+            batch (list): List with the url, newspaper, title, text and extraction date
+            of every news article.
+        """
+        # The ids, counts and positions of every term and field.
+        postings = defaultdict(lambda: (array('I'), array('I'), array('I')))
+        with self.__writer_connection as connection:
+            for url, newspaper, title, text, extracted_at in batch:
+                connection.execute('UPDATE documents SET live = 0 WHERE url = ? AND live = 1', (url,))
+                doc_id = connection.execute('INSERT INTO documents (url, newspaper, title, extracted_at, live) '
+                                            'VALUES (?, ?, ?, ?, 1)', (url, newspaper, title, extracted_at)).lastrowid
+                for field, value in enumerate((title, text)):
+                    doc_positions = defaultdict(list)
+                    for position, term in enumerate(tokenize(value or '')):
+                        doc_positions[term].append(position)
+                    for term, term_positions in doc_positions.items():
+                        doc_ids, counts, positions = postings[term, field]
+                        doc_ids.append(doc_id)
+                        counts.append(len(term_positions))
+                        positions.extend(term_positions)
+            segment = connection.execute('INSERT INTO segments (level, first_doc, last_doc) VALUES (0, ?, ?)',
+                                         (doc_id - len(batch) + 1, doc_id)).lastrowid
+            rows = []
+            with open(self._segment_path(segment), 'wb') as file:
+                offset = 0
+                for (term, field), (doc_ids, counts, positions) in postings.items():
+                    skips = _skip_starts(counts)
+                    for values in (doc_ids, counts, skips, positions):
+                        values.tofile(file)
+                    rows.append((term, field, segment, offset, len(doc_ids), len(positions)))
+                    offset += (2 * len(doc_ids) + len(skips) + len(positions)) * ITEM_SIZE
+            connection.executemany('INSERT INTO terms (term, field, segment, offset, n_docs, n_positions) '
+                                   'VALUES (?, ?, ?, ?, ?, ?)', rows)
+        while True:
+            row = self.__writer_connection.execute('SELECT level FROM segments GROUP BY level HAVING COUNT(*) >= ? '
+                                                   'ORDER BY level LIMIT 1', (self.__merge_factor,)).fetchone()
+            if row is None:
+                return
+            self._merge([segment for segment, in self.__writer_connection.execute(
+                'SELECT id FROM segments WHERE level = ?', row)], row[0] + 1)
+
+    def merge(self):
+        """Function to merge all the segments in one, so the searches read only
+        one postings file. The news articles waiting in the buffer are written first.
+        """
+        self.flush()
+        self.__writer.submit(self._merge_all).result()
+
+    def _merge_all(self):
+        """Function to merge all the segments in one. Runs in the background writer.
+        """
+        segments = [segment for segment, in self.__writer_connection.execute('SELECT id FROM segments')]
+        if len(segments) > 1:
+            level = self.__writer_connection.execute('SELECT MAX(level) FROM segments').fetchone()[0]
+            self._merge(segments, level + 1)
+
+    def _merge(self, segments, level):
+        """Function to merge several segments in a new one. Every news article
+        is only in one segment, so the postings of every term are concatenated
+        in the order of the segments first news articles, and only the starts
+        of the blocks are computed again. Runs in the background writer.
+
+        Args:
+            segments (list): List with the ids of the segments.
+            level (int): Level of the new segment.
+        """
+        placeholders = ', '.join('?' * len(segments))
+        maps = {segment: self._map_segment(segment) for segment in segments}
+        try:
+            with self.__writer_connection as connection:
+                merged = connection.execute(
+                    'INSERT INTO segments (level, first_doc, last_doc) SELECT ?, MIN(first_doc), MAX(last_doc) '
+                    f'FROM segments WHERE id IN ({placeholders})', [level, *segments]).lastrowid
+                chunks = connection.execute(
+                    'SELECT term, field, terms.segment, offset, n_docs, n_positions FROM terms '
+                    f'JOIN segments ON segments.id = terms.segment WHERE terms.segment IN ({placeholders}) '
+                    'ORDER BY term, field, first_doc', segments)
+                rows = []
+                with open(self._segment_path(merged), 'wb') as file:
+                    offset = 0
+                    for (term, field), term_chunks in groupby(chunks, key=lambda chunk: chunk[:2]):
+                        doc_ids, counts, positions = [], array('I'), []
+                        for _, _, segment, chunk_offset, n_docs, n_positions in term_chunks:
+                            segment_map = maps[segment]
+                            counts_offset = chunk_offset + n_docs * ITEM_SIZE
+                            positions_offset = counts_offset + (n_docs + _n_skips(n_docs)) * ITEM_SIZE
+                            doc_ids.append(segment_map[chunk_offset:counts_offset])
+                            counts.frombytes(segment_map[counts_offset:counts_offset + n_docs * ITEM_SIZE])
+                            positions.append(segment_map[positions_offset:positions_offset
+                                                         + n_positions * ITEM_SIZE])
+                        skips = _skip_starts(counts)
+                        file.write(b''.join(doc_ids))
+                        counts.tofile(file)
+                        skips.tofile(file)
+                        positions = b''.join(positions)
+                        file.write(positions)
+                        rows.append((term, field, merged, offset, len(counts), len(positions) // ITEM_SIZE))
+                        offset += (2 * len(counts) + len(skips)) * ITEM_SIZE + len(positions)
+                connection.executemany('INSERT INTO terms (term, field, segment, offset, n_docs, n_positions) '
+                                       'VALUES (?, ?, ?, ?, ?, ?)', rows)
+                connection.execute(f'DELETE FROM terms WHERE segment IN ({placeholders})', segments)
+                connection.execute(f'DELETE FROM segments WHERE id IN ({placeholders})', segments)
+        finally:
+            for segment_map in maps.values():
+                segment_map.close()
+        # No search is running while the lock is held, so the old segments can be unmapped.
+        with self.__lock:
+            for segment in segments:
+                segment_map = self.__maps.pop(segment, None)
+                if segment_map is not None:
+                    segment_map.close()
+                os.remove(self._segment_path(segment))
+
+    def _postings(self, term, fields):
+        """Function to get the postings of a term.
+
+        Args:
+            term (str): Term, as returned by tokenize.
+            fields (list): List with the numbers of the fields.
+
+        Returns:
+            _Postings: Postings of the term in those fields.
+        """
+        placeholders = ', '.join('?' * len(fields))
+        rows = self.__connection.execute(
+            'SELECT segment, offset, n_docs, first_doc, last_doc FROM terms '
+            'JOIN segments ON segments.id = terms.segment '
+            f'WHERE term = ? AND field IN ({placeholders}) ORDER BY first_doc', [term, *fields])
+        return _Postings([(self._segment_map(segment), offset, n_docs, first_doc, last_doc)
+                          for segment, offset, n_docs, first_doc, last_doc in rows])
+
+    @staticmethod
+    def _matching_docs(every_postings, low, high):
+        """Function to get the news articles of a window with all the terms.
+
+        Args:
+            every_postings (list): List with the postings of every term, the rarest first.
+            low (int): First id of the window
+            high (int): Id after the last one of the window.
+
+        Returns:
+            set: Set with the ids of the news articles.
+        """
+        doc_ids = every_postings[0].doc_ids(low, high)
+        for postings in every_postings[1:]:
+            if not doc_ids:
+                break
+            # Few candidates are looked up in the postings, and many are intersected with them.
+            if len(doc_ids) * 16 < postings.count(low, high):
+                doc_ids = {doc_id for doc_id in doc_ids if doc_id in postings}
+            else:
+                doc_ids &= postings.doc_ids(low, high)
+        return doc_ids
+
+    @staticmethod
+    def _has_phrase(doc_id, phrase_postings):
+        """Function to check if the terms of a phrase are one after the other in
+        a field of a news article.
+
+        Args:
+            doc_id (int): Id of the news article
+            phrase_postings (list): List with the postings of every term of the phrase in the field.
+
+        Returns:
+            bool: True if the news article has the phrase.
+        """
+        starts = None
+        for i, postings in enumerate(phrase_postings):
+            term_starts = {position - i for position in postings.positions(doc_id)}
+            starts = term_starts if starts is None else starts & term_starts
+            if not starts:
+                return False
+        return True
+
+    def _filter_docs(self, doc_ids, phrases_postings, select, params, limit):
+        """Function to get the news articles that have the phrases and pass the
+        filters of the search. The phrases are checked one news article at a
+        time and the filters in batches, until there are enough.
+
+        Args:
+            doc_ids (list): List with the ids of the candidates, the newest first.
+            phrases_postings (list): List with the postings of every phrase, by field and term.
+            select (str): Query of the news articles that pass the filters
+            params (list): Parameters of the query.
+            limit (int): Max number of news articles, all if None.
+
+        Returns:
+            list: List with SearchHit objects.
+        """
+        candidates = (doc_id for doc_id in doc_ids
+                      if all(any(self._has_phrase(doc_id, postings) for postings in fields_postings)
+                             for fields_postings in phrases_postings))
+        hits = []
+        batch_size = SQL_BATCH if limit is None else min(limit, SQL_BATCH)
+        while limit is None or len(hits) < limit:
+            batch = [doc_id for _, doc_id in zip(range(batch_size), candidates)]
+            if not batch:
+                break
+            hits += [SearchHit(*row) for row in self.__connection.execute(
+                f'{select} AND id IN ({", ".join("?" * len(batch))}) ORDER BY id DESC', params + batch)]
+            batch_size = min(batch_size * 2, SQL_BATCH)
+        return hits[:limit]
+
+    def search(self, query='', newspaper=None, since=None, until=None, field=None, limit=20):
+        """Function to search the news articles, the most recently indexed first.
+
+        Args:
+            query (str): Terms and phrases between double quotes, all of them must be
+            in the news articles. An empty query finds all the news articles.
+            newspaper (str): If given, only the news articles of this newspaper.
+            since (str/date): If given, only the news articles extracted from this date.
+            until (str/date): If given, only the news articles extracted until this date, included.
+            field (str): 'title' or 'text' to search only there, both by default.
+            limit (int): Max number of news articles returned, all if None.
+
+        Returns:
+            list: List with SearchHit objects.
+        """
+        if field is not None and field not in FIELDS:
+            raise ValueError(f'Unknown field {field}, use {" or ".join(FIELDS)}.')
+        fields = [FIELDS.index(field)] if field is not None else list(range(len(FIELDS)))
+        terms, phrases = parse_query(query)
+        conditions, params = ['live = 1'], []
+        for condition, value in (('newspaper = ?', newspaper), ('extracted_at >= ?', _date_bound(since)),
+                                 ('extracted_at <= ?', _date_bound(until, upper=True))):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        select = 'SELECT id, newspaper, url, title, extracted_at FROM documents WHERE ' + ' AND '.join(conditions)
+        with self.__lock:
+            if not terms and not phrases:
+                limit_clause = ' LIMIT ?' if limit is not None else ''
+                return [SearchHit(*row) for row in self.__connection.execute(
+                    select + ' ORDER BY id DESC' + limit_clause, params + ([limit] if limit is not None else []))]
+            # The terms of the phrases are looked up as terms first, and the
+            # phrases are only checked in the news articles with all of them.
+            every_postings = sorted((self._postings(term, fields) for term in terms + sum(phrases, [])),
+                                    key=lambda postings: postings.n_docs_)
+            phrases_postings = [[[self._postings(term, [field]) for term in phrase] for field in fields]
+                                for phrase in phrases]
+            high = (self.__connection.execute('SELECT MAX(last_doc) FROM segments').fetchone()[0] or 0) + 1
+            window = FIRST_WINDOW if limit is not None else high
+            hits = []
+            while high > 0 and (limit is None or len(hits) < limit):
+                low = max(high - window, 0)
+                doc_ids = sorted(self._matching_docs(every_postings, low, high), reverse=True)
+                hits += self._filter_docs(doc_ids, phrases_postings, select, params,
+                                          limit - len(hits) if limit is not None else None)
+                high, window = low, window * 2
+            return hits
+
+    def counts(self):
+        """Function to count the news articles, terms and segments of the index.
+
+        Returns:
+            dict: Number of news articles searchable, terms and segments.
+        """
+        with self.__lock:
+            n_articles = self.__connection.execute('SELECT COUNT(*) FROM documents WHERE live = 1').fetchone()[0]
+            n_terms = self.__connection.execute('SELECT COUNT(DISTINCT term) FROM terms').fetchone()[0]
+            n_segments = self.__connection.execute('SELECT COUNT(*) FROM segments').fetchone()[0]
+        return {'articles': n_articles, 'terms': n_terms, 'segments': n_segments}
+
+    def close(self):
+        """Function to write the news articles waiting in the buffer and to
+        close the index.
+        """
+        self.flush()
+        self.__writer.shutdown()
+        with self.__lock:
+            for segment_map in self.__maps.values():
+                segment_map.close()
+            self.__maps.clear()
+            self.__connection.close()
+        self.__writer_connection.close()
+
+
+def parse_args():
+    """Function to parse the command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description='Search the news articles saved with a search index.')
+    parser.add_argument('query', nargs='?', default='',
+                        help='Terms and "phrases between double quotes" that must be in the news articles.')
+    parser.add_argument('--index', default='search_index', help='Folder of the search index.')
+    parser.add_argument('--newspaper', default=None, help='Only the news articles of this newspaper.')
+    parser.add_argument('--since', default=None, help='Only the news articles extracted from this ISO date.')
+    parser.add_argument('--until', default=None, help='Only the news articles extracted until this ISO date.')
+    parser.add_argument('--field', default=None, choices=FIELDS, help='Search only the title or the text.')
+    parser.add_argument('--limit', type=int, default=20, help='Max number of news articles shown.')
+    parser.add_argument('--merge', action='store_true', help='Merge all the segments of the index in one.')
+    parser.add_argument('--stats', action='store_true', help='Print the size of the index.')
+    return parser.parse_args()
+
+
+def main():
+    """Main function.
+    """
+    args = parse_args()
+    if not os.path.isdir(args.index):
+        raise SystemExit(f'There is no search index at {args.index}.')
+    index = SearchIndex(args.index)
+    try:
+        if args.merge:
+            index.merge()
+        if args.stats:
+            print(index.counts())
+        if args.merge or args.stats:
+            return
+        try:
+            hits = index.search(args.query, newspaper=args.newspaper, since=args.since, until=args.until,
+                                field=args.field, limit=args.limit)
+        except ValueError as err:
+            raise SystemExit(f'Wrong query: {err}') from err
+        for hit in hits:
+            print(f'{hit.extracted_at}  {hit.newspaper:<10} {hit.title}\n    {hit.url}')
+        print(f'{len(hits)} news articles found.')
+    finally:
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""SoupStrainers used to parse only the parts of the newspaper pages that
+the scrappers read.
+
+The main page only needs the headers that contain the news links, and the
+news articles only need the title, the body and the images. Building only
+those subtrees saves most of the parsing time.
+"""
+from bs4 import SoupStrainer
+
+
+class AnyOfStrainer(SoupStrainer):
+    """SoupStrainer that keeps a tag if any of the given strainers keeps it.
+    Works with the parse time API of BeautifulSoup before and after 4.13.
+    """
+    def __init__(self, *strainers) -> None:
+        super().__init__()
+        self.strainers = strainers
+
+    @property
+    def includes_everything(self):
+        """An AnyOfStrainer never includes everything.
+        """
+        return False
+
+    @property
+    def excludes_everything(self):
+        """An AnyOfStrainer never excludes everything.
+        """
+        return False
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        """Function used by BeautifulSoup >= 4.13 to check if a tag is kept.
+        """
+        return any(strainer.allow_tag_creation(nsprefix, name, attrs) for strainer in self.strainers)
+
+    def allow_string_creation(self, string):
+        """Function used by BeautifulSoup >= 4.13 to check if a string outside
+        the kept tags is kept.
+        """
+        return False
+
+    def search_tag(self, markup_name=None, markup_attrs={}):  # pylint: disable=dangerous-default-value
+        """Function used by BeautifulSoup < 4.13 to check if a tag is kept.
+        """
+        for strainer in self.strainers:
+            found = strainer.search_tag(markup_name, markup_attrs)
+            if found:
+                return found
+        return None
+
+
+def _class_matcher(class_):
+    """Function to create a class matcher that works as the class_ argument
+    of find_all: the class attribute must be equal to class_ or contain it as
+    one of its classes. At parse time the class attribute isn't split yet, so
+    a plain string would only match the exact attribute.
+
+    Args:
+        class_ (str): Tag class
+
+    Returns:
+        callable: Function that checks a class attribute value.
+    """
+    def matches(value):
+        if value is None:
+            return False
+        if not isinstance(value, str):
+            value = ' '.join(value)
+        return value == class_ or class_ in value.split()
+    return matches
+
+
+def _tag_strainer(name, class_):
+    """Function to create a strainer that keeps the tags with a name and class,
+    matching them as the find_all function does.
+
+    Args:
+        name (str): Tag name
+        class_ (str): Tag class, empty to match any class.
+
+    Returns:
+        SoupStrainer: Strainer for the tags.
+    """
+    if class_:
+        return SoupStrainer(name, class_=_class_matcher(class_))
+    return SoupStrainer(name)
+
+
+def main_page_strainer(header_name_news, header_class_news):
+    """Function to create the strainer for the newspaper main page.
+
+    Args:
+        header_name_news (str): Headers at the main page that contain the news
+        header_class_news (str): header_name_news class in the html file.
+
+    Returns:
+        SoupStrainer: Strainer that keeps the headers with the news links.
+    """
+    return _tag_strainer(header_name_news, header_class_news)
+
+
+def news_article_strainer(newsarticle_title_name, newsarticle_title_class,
+                          newsarticle_body_name, newsarticle_body_class):
+    """Function to create the strainer for a news article.
+
+    Args:
+        newsarticle_title_name (str): String with the news article title name in the html file
+        newsarticle_title_class (str): String with the news article title class in the html file
+        newsarticle_body_name (str): String with the news body name in the html file.
+        newsarticle_body_class (str): String with the news body class in the html file.
+
+    Returns:
+        SoupStrainer: Strainer that keeps the title, the body and the images.
+    """
+    return AnyOfStrainer(_tag_strainer(newsarticle_title_name, newsarticle_title_class),
+                         _tag_strainer(newsarticle_body_name, newsarticle_body_class),
+                         SoupStrainer('img'))
@@ -0,0 +1,291 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Output backends for the news articles saved by the scrappers.
+
+The folder backend keeps the original layout: one folder per news article
+with METADATA.txt, text_news.txt and the images. The shard backends append
+the news articles as records to a few big compressed files, JSONL or
+Parquet, that are rotated by size.
+
+Every backend consumes the Article objects yielded by the scrapper, and
+returns from write and flush the articles that are already saved, so the
+scrapper only marks a news article as seen once it's on disk. For the
+shard backends that is once their shard is complete and has its final
+name: the articles of a .part shard left by a crash aren't marked as
+seen, so they are downloaded again in the next run.
+"""
+import os
+import json
+import gzip
+import threading
+from abc import abstractmethod, ABC
+from datetime import datetime
+
+
+class FolderStorage:
+    """Class that saves every news article in its own folder, using the
+    folder and file functions of the scrapper.
+    """
+    def __init__(self, scrapper) -> None:
+        self.__scrapper = scrapper
+
+    @property
+    def root_(self):
+        """Root property.
+
+        Returns:
+            str: Folder where the news articles folders are created.
+        """
+        return self.__scrapper.name_
+
+    def write(self, article, download_images=True):
+        """Function to save a news article in its folder.
+
+        Args:
+            article (Article): News article
+            download_images (bool): If False the images aren't downloaded.
+
+        Returns:
+            list: List with the saved article.
+        """
+        self.__scrapper._save_news_folder(article,  # pylint: disable=protected-access
+                                          download_images=download_images)
+        return [article]
+
+    def flush(self):
+        """The folder backend saves every news article when written.
+
+        Returns:
+            list: Empty list.
+        """
+        return []
+
+    def close(self):
+        """The folder backend doesn't keep any file open.
+
+        Returns:
+            list: Empty list.
+        """
+        return []
+
+
+class ShardStorage(ABC):
+    """Base class for the backends that append the records to shards. The
+    records are written in batches, and when a shard is bigger than
+    max_shard_bytes or has max_shard_articles it's closed, synced to disk
+    and a new one is started. The shard is also completed on every flush.
+    A shard has a .part suffix until it's complete, and its articles are
+    only returned as saved then.
+    """
+    def __init__(self, root, extension, prefix='news', max_shard_bytes=256 * 1024 ** 2,
+                 batch_size=100, max_shard_articles=5000) -> None:
+        self.__root = root
+        self.__extension = extension
+        self.__prefix = prefix
+        self.__max_shard_bytes = max_shard_bytes
+        self.__batch_size = batch_size
+        self.__max_shard_articles = max_shard_articles
+        self.__batch = []
+        # Articles written to the open .part shard, saved once it's complete.
+        self.__shard_articles = []
+        self.__shard_path = None
+        self.__n_shards = 0
+        self.__lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    @property
+    def root_(self):
+        """Root property.
+
+        Returns:
+            str: Folder of the shards.
+        """
+        return self.__root
+
+    @abstractmethod
+    def _open_shard(self, path):
+        """Function to open a new shard file.
+
+        Args:
+            path (str): Path of the shard file
+        """
+
+    @abstractmethod
+    def _write_batch(self, records):
+        """Function to append a batch of records to the open shard.
+
+        Args:
+            records (list): List with the records.
+        """
+
+    @abstractmethod
+    def _close_shard(self):
+        """Function to close the open shard and sync it to disk.
+        """
+
+    def _new_shard_path(self):
+        """Function to get the path of the next shard.
+
+        Returns:
+            str: Path of the shard, with the .part suffix.
+        """
+        self.__n_shards += 1
+        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        name = f'{self.__prefix}-{timestamp}-{os.getpid()}-{self.__n_shards:05d}{self.__extension}'
+        return os.path.join(self.__root, name + '.part')
+
+    def _rotate(self):
+        """Function to close the open shard and give it its final name.
+
+        Returns:
+            list: List with the articles of the shard.
+        """
+        self._close_shard()
+        os.replace(self.__shard_path, self.__shard_path[:-len('.part')])
+        self.__shard_path = None
+        articles, self.__shard_articles = self.__shard_articles, []
+        return articles
+
+    def _flush_batch(self):
+        """Function to write the buffered articles, rotating the shard if it's full.
+
+        Returns:
+            list: List with the articles of the shard, if it has been completed.
+        """
+        articles, self.__batch = self.__batch, []
+        if not articles:
+            return articles
+        if self.__shard_path is None:
+            self.__shard_path = self._new_shard_path()
+            self._open_shard(self.__shard_path)
+        self._write_batch([article.to_record() for article in articles])
+        self.__shard_articles.extend(articles)
+        if os.path.getsize(self.__shard_path) >= self.__max_shard_bytes or \
+                len(self.__shard_articles) >= self.__max_shard_articles:
+            return self._rotate()
+        return []
+
+    def write(self, article, download_images=True):  # pylint: disable=unused-argument
+        """Function to add an article to the batch, writing it when it's full.
+
+        Args:
+            article (Article): News article
+            download_images (bool): Not used, the shard backends only save the images urls.
+
+        Returns:
+            list: List with the articles saved in a complete shard by this call.
+        """
+        with self.__lock:
+            self.__batch.append(article)
+            if len(self.__batch) >= self.__batch_size:
+                return self._flush_batch()
+        return []
+
+    def flush(self):
+        """Function to write the buffered articles and complete the open shard.
+
+        Returns:
+            list: List with the articles saved in a complete shard by this call.
+        """
+        with self.__lock:
+            articles = self._flush_batch()
+            if self.__shard_path is not None:
+                articles.extend(self._rotate())
+            return articles
+
+    def close(self):
+        """Function to write the buffered articles and complete the open shard.
+
+        Returns:
+            list: List with the articles saved in a complete shard by this call.
+        """
+        return self.flush()
+
+
+class JsonlShardStorage(ShardStorage):
+    """Class that saves the records as lines of JSON in shards, compressed
+    with gzip by default.
+    """
+    def __init__(self, root, prefix='news', max_shard_bytes=256 * 1024 ** 2, batch_size=100,
+                 max_shard_articles=5000, compress=True) -> None:
+        super().__init__(root, '.jsonl.gz' if compress else '.jsonl', prefix=prefix,
+                         max_shard_bytes=max_shard_bytes, batch_size=batch_size,
+                         max_shard_articles=max_shard_articles)
+        self.__compress = compress
+        self.__raw_file = None
+        self.__file = None
+
+    def _open_shard(self, path):
+        self.__raw_file = open(path, 'wb')
+        self.__file = gzip.GzipFile(fileobj=self.__raw_file, mode='wb') if self.__compress else self.__raw_file
+
+    def _write_batch(self, records):
+        lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        self.__file.write(lines.encode('utf-8'))
+        self.__file.flush()
+
+    def _close_shard(self):
+        if self.__file is not self.__raw_file:
+            self.__file.close()
+        self.__raw_file.flush()
+        os.fsync(self.__raw_file.fileno())
+        self.__raw_file.close()
+        self.__raw_file = self.__file = None
+
+
+class ParquetShardStorage(ShardStorage):
+    """Class that saves the records in Parquet shards, one row group per batch.
+    It needs the optional pyarrow package.
+    """
+    def __init__(self, root, prefix='news', max_shard_bytes=256 * 1024 ** 2, batch_size=1000,
+                 max_shard_articles=5000, compression='zstd') -> None:
+        try:
+            import pyarrow  # pylint: disable=import-outside-toplevel
+            import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+        except ImportError as err:
+            raise ImportError('The parquet storage needs pyarrow: pip install pyarrow') from err
+        super().__init__(root, '.parquet', prefix=prefix, max_shard_bytes=max_shard_bytes,
+                         batch_size=batch_size, max_shard_articles=max_shard_articles)
+        self.__pyarrow = pyarrow
+        self.__compression = compression
+        self.__schema = pyarrow.schema([('newspaper', pyarrow.string()), ('url', pyarrow.string()),
+                                        ('title', pyarrow.string()),
+                                        ('paragraphs', pyarrow.list_(pyarrow.string())),
+                                        ('images', pyarrow.list_(pyarrow.string())),
+                                        ('extracted_at', pyarrow.string()), ('cluster_id', pyarrow.int64())])
+        self.__path = None
+        self.__writer = None
+
+    def _open_shard(self, path):
+        self.__path = path
+        self.__writer = self.__pyarrow.parquet.ParquetWriter(path, self.__schema, compression=self.__compression)
+
+    def _write_batch(self, records):
+        table = self.__pyarrow.Table.from_pylist(records, schema=self.__schema)
+        self.__writer.write_table(table)
+
+    def _close_shard(self):
+        self.__writer.close()
+        with open(self.__path, 'rb') as file:
+            os.fsync(file.fileno())
+        self.__writer = self.__path = None
+
+
+STORAGES = {'jsonl': JsonlShardStorage, 'parquet': ParquetShardStorage}
@@ -0,0 +1,313 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Persistent index of the news articles urls already saved.
+
+The urls are canonicalized before being checked, so the same news article
+reached with a different query string order, a fragment or tracking
+parameters is only downloaded once. The index is a SQLite database with
+an optional Bloom filter in front, so most of the new urls are found
+without touching the database.
+"""
+import os
+import math
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+# Only keys used by trackers: generic ones like ref could be real parameters of a page.
+TRACKING_PARAMS = frozenset(['fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid',
+                             'ocid', 'ref_src', 'ns_source', 'ns_mchannel', 'ns_campaign',
+                             'ns_linkname', 'ns_fee'])
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url):
+    """Function to canonicalize a news article url. The scheme and host are
+    lowercased, the default port, the fragment and the tracking parameters
+    are removed and the query parameters are sorted.
+
+    Args:
+        url (str): News article url
+
+    Returns:
+        str: Canonical url.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{parts.port}'
+    path = parts.path or '/'
+    if len(path) > 1 and path.endswith('/'):
+        path = path.rstrip('/')
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS]
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ''))
+
+
+class BloomFilter:
+    """Class that implements a Bloom filter over a bytearray, using double
+    hashing over a blake2b digest to get the bit positions.
+    """
+    def __init__(self, n_bits, n_hashes) -> None:
+        self.__n_bits = n_bits
+        self.__n_hashes = n_hashes
+        self.__bits = bytearray((n_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate=0.01):
+        """Function to create a Bloom filter sized for a number of items.
+
+        Args:
+            capacity (int): Expected number of items
+            error_rate (float): Expected false positive rate at full capacity.
+
+        Returns:
+            BloomFilter: Empty Bloom filter.
+        """
+        # Optimal sizes: m = -n ln(p) / ln(2)^2 and k = m / n ln(2)
+        n_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        n_hashes = max(1, round(n_bits / capacity * math.log(2)))
+        return cls(n_bits, n_hashes)
+
+    @property
+    def n_bits_(self):
+        """Number of bits property.
+
+        Returns:
+            int: Number of bits of the filter.
+        """
+        return self.__n_bits
+
+    @property
+    def n_hashes_(self):
+        """Number of hashes property.
+
+        Returns:
+            int: Number of bits set for every item.
+        """
+        return self.__n_hashes
+
+    def _positions(self, item):
+        """Function to get the bit positions of an item.
+
+        Args:
+            item (str): Item to hash
+
+        Returns:
+            generator: Bit positions of the item.
+        """
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        hash_1 = int.from_bytes(digest[:8], 'little')
+        hash_2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((hash_1 + i * hash_2) % self.__n_bits for i in range(self.__n_hashes))
+
+    def add(self, item):
+        """Function to add an item to the filter.
+
+        Args:
+            item (str): Item to add
+        """
+        for position in self._positions(item):
+            self.__bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.__bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(item))
+
+    def to_bytes(self):
+        """Function to get the filter bits.
+
+        Returns:
+            bytes: Bits of the filter.
+        """
+        return bytes(self.__bits)
+
+    def load_bytes(self, data):
+        """Function to load the filter bits saved with to_bytes.
+
+        Args:
+            data (bytes): Bits of the filter
+        """
+        if len(data) != len(self.__bits):
+            raise ValueError('The Bloom filter size does not match.')
+        self.__bits[:] = data
+
+
+class UrlIndex:
+    """Class that implements a persistent index of the canonical urls from
+    the news articles already saved. It can be shared by all the newspaper
+    scrappers.
+    """
+    SQL_CHUNK_SIZE = 500
+
+    def __init__(self, path='seen_urls.sqlite', use_bloom_filter=True, bloom_capacity=1_000_000,
+                 bloom_error_rate=0.01) -> None:
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        with self.__connection:
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS seen_urls (url TEXT PRIMARY KEY, '
+                                      'newspaper TEXT, added_at TEXT) WITHOUT ROWID')
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS last_runs (newspaper TEXT PRIMARY KEY, '
+                                      'last_run TEXT)')
+        self.__bloom = None
+        if use_bloom_filter:
+            self.__bloom = BloomFilter.for_capacity(bloom_capacity, bloom_error_rate)
+            self._load_bloom_filter()
+
+    @property
+    def path_(self):
+        """Path property.
+
+        Returns:
+            str: Path of the SQLite database.
+        """
+        return self.__path
+
+    def _bloom_path(self):
+        """Function to get the path where the Bloom filter is saved.
+
+        Returns:
+            str: Path of the Bloom filter file.
+        """
+        return f'{self.__path}.bloom-{self.__bloom.n_bits_}-{self.__bloom.n_hashes_}'
+
+    def _load_bloom_filter(self):
+        """Function to load the saved Bloom filter, or to build it again from
+        the database if it wasn't saved with the same size. The saved filter is
+        removed once loaded, so if the index isn't closed properly the next run
+        builds it again instead of loading an outdated one.
+        """
+        bloom_path = self._bloom_path()
+        if os.path.exists(bloom_path):
+            with open(bloom_path, 'rb') as file:
+                self.__bloom.load_bytes(file.read())
+            os.remove(bloom_path)
+            return
+        for (url,) in self.__connection.execute('SELECT url FROM seen_urls'):
+            self.__bloom.add(url)
+
+    def filter_new(self, urls):
+        """Function to select the urls not seen yet. The urls are checked in
+        bulk, and repeated urls are only returned once.
+
+        Args:
+            urls (list): List with the news articles urls
+
+        Returns:
+            list: List with the new urls, in the same order.
+        """
+        canonical_urls = {}
+        for url in urls:
+            canonical_urls.setdefault(canonicalize_url(url), url)
+        candidates = list(canonical_urls)
+        if self.__bloom is not None:
+            candidates = [url for url in candidates if url in self.__bloom]
+        seen = set()
+        with self.__lock:
+            for i in range(0, len(candidates), self.SQL_CHUNK_SIZE):
+                chunk = candidates[i:i + self.SQL_CHUNK_SIZE]
+                placeholders = ', '.join('?' * len(chunk))
+                query = f'SELECT url FROM seen_urls WHERE url IN ({placeholders})'
+                seen.update(url for (url,) in self.__connection.execute(query, chunk))
+        return [url for canonical_url, url in canonical_urls.items() if canonical_url not in seen]
+
+    def __contains__(self, url):
+        return not self.filter_new([url])
+
+    def add_many(self, urls, newspaper=None):
+        """Function to add urls to the index.
+
+        Args:
+            urls (list): List with the news articles urls
+            newspaper (str): Name of the newspaper of the urls.
+        """
+        canonical_urls = [canonicalize_url(url) for url in urls]
+        added_at = datetime.now().isoformat(timespec='seconds')
+        with self.__lock, self.__connection:
+            self.__connection.executemany('INSERT OR IGNORE INTO seen_urls (url, newspaper, added_at) '
+                                          'VALUES (?, ?, ?)',
+                                          [(url, newspaper, added_at) for url in canonical_urls])
+            if self.__bloom is not None:
+                for url in canonical_urls:
+                    self.__bloom.add(url)
+
+    def add(self, url, newspaper=None):
+        """Function to add an url to the index.
+
+        Args:
+            url (str): News article url
+            newspaper (str): Name of the newspaper of the url.
+        """
+        self.add_many([url], newspaper=newspaper)
+
+    def has_newspaper(self, newspaper):
+        """Function to know if the index has any url of a newspaper.
+
+        Args:
+            newspaper (str): Name of the newspaper
+
+        Returns:
+            bool: True if some url of the newspaper has been added.
+        """
+        with self.__lock:
+            row = self.__connection.execute('SELECT 1 FROM seen_urls WHERE newspaper = ? LIMIT 1',
+                                            (newspaper,)).fetchone()
+        return row is not None
+
+    def get_last_run(self, newspaper):
+        """Function to get when the last successful crawl of a newspaper started.
+
+        Args:
+            newspaper (str): Name of the newspaper
+
+        Returns:
+            datetime: Timezone aware start of the last crawl, or None if it was never crawled.
+        """
+        with self.__lock:
+            row = self.__connection.execute('SELECT last_run FROM last_runs WHERE newspaper = ?',
+                                            (newspaper,)).fetchone()
+        return datetime.fromisoformat(row[0]) if row is not None else None
+
+    def set_last_run(self, newspaper, last_run):
+        """Function to save when the last successful crawl of a newspaper started.
+
+        Args:
+            newspaper (str): Name of the newspaper
+            last_run (datetime): Timezone aware start of the crawl.
+        """
+        with self.__lock, self.__connection:
+            self.__connection.execute('INSERT OR REPLACE INTO last_runs (newspaper, last_run) VALUES (?, ?)',
+                                      (newspaper, last_run.isoformat()))
+
+    def close(self):
+        """Function to save the Bloom filter and close the database.
+        """
+        with self.__lock:
+            if self.__bloom is not None:
+                tmp_path = self._bloom_path() + '.tmp'
+                with open(tmp_path, 'wb') as file:
+                    file.write(self.__bloom.to_bytes())
+                os.replace(tmp_path, self._bloom_path())
+            self.__connection.close()
@@ -0,0 +1,191 @@
+# MIT License
+# Copyright (c) 2021 Alberto Argente del Castillo Garrido
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""WARC archive of the pages downloaded by the scrappers.
+
+Every response is saved as a WARC/1.0 response record compressed as its own
+gzip member, as the WARC standard recommends, so the files can be read by
+the usual WARC tools. The archived pages can be extracted again later
+without any network access.
+"""
+import os
+import gzip
+import uuid
+import threading
+from datetime import datetime, timezone
+
+
+# The body saved is the decoded one, so these headers don't describe it anymore.
+SKIPPED_HEADERS = frozenset(['content-encoding', 'transfer-encoding', 'content-length'])
+
+
+class WarcWriter:
+    """Class that appends the responses to gzip compressed WARC files,
+    rotated by size. A file has a .part suffix until it's complete.
+    """
+    def __init__(self, root='warc', prefix='news', max_file_bytes=1024 ** 3) -> None:
+        self.__root = root
+        self.__prefix = prefix
+        self.__max_file_bytes = max_file_bytes
+        self.__path = None
+        self.__file = None
+        self.__n_files = 0
+        self.__lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    @property
+    def root_(self):
+        """Root property.
+
+        Returns:
+            str: Folder of the WARC files.
+        """
+        return self.__root
+
+    @staticmethod
+    def _record(warc_type, headers, block):
+        """Function to build a WARC record.
+
+        Args:
+            warc_type (str): Type of the record
+            headers (dict): WARC headers besides the mandatory ones
+            block (bytes): Content of the record.
+
+        Returns:
+            bytes: WARC record.
+        """
+        warc_headers = {'WARC-Type': warc_type,
+                        'WARC-Record-ID': f'<urn:uuid:{uuid.uuid4()}>',
+                        'WARC-Date': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}
+        warc_headers.update(headers)
+        warc_headers['Content-Length'] = str(len(block))
+        head = 'WARC/1.0\r\n' + ''.join(f'{key}: {value}\r\n' for key, value in warc_headers.items())
+        return head.encode('utf-8') + b'\r\n' + block + b'\r\n\r\n'
+
+    def _write_member(self, record):
+        """Function to append a record as a new gzip member.
+
+        Args:
+            record (bytes): WARC record
+        """
+        self.__file.write(gzip.compress(record))
+
+    def _open_file(self):
+        """Function to open a new WARC file and write its warcinfo record.
+        """
+        self.__n_files += 1
+        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        name = f'{self.__prefix}-{timestamp}-{os.getpid()}-{self.__n_files:05d}.warc.gz'
+        self.__path = os.path.join(self.__root, name + '.part')
+        self.__file = open(self.__path, 'wb')
+        info = b'software: NewspaperScrapper\r\nformat: WARC File Format 1.0\r\n'
+        self._write_member(self._record('warcinfo', {'WARC-Filename': name,
+                                                     'Content-Type': 'application/warc-fields'}, info))
+
+    def _close_file(self):
+        """Function to close the open WARC file and give it its final name.
+        """
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+        self.__file.close()
+        os.replace(self.__path, self.__path[:-len('.part')])
+        self.__file = self.__path = None
+
+    def write_response(self, response):
+        """Function to archive a response.
+
+        Args:
+            response (requests.Response): Response to be archived.
+        """
+        raw = getattr(response, 'raw', None)
+        version = {10: 'HTTP/1.0', 11: 'HTTP/1.1'}.get(getattr(raw, 'version', 11), 'HTTP/1.1')
+        body = response.content
+        http_head = f'{version} {response.status_code} {response.reason}\r\n'
+        http_head += ''.join(f'{key}: {value}\r\n' for key, value in response.headers.items()
+                             if key.lower() not in SKIPPED_HEADERS)
+        http_head += f'Content-Length: {len(body)}\r\n\r\n'
+        record = self._record('response', {'WARC-Target-URI': response.url,
+                                           'Content-Type': 'application/http; msgtype=response'},
+                              http_head.encode('iso-8859-1', errors='replace') + body)
+        with self.__lock:
+            if self.__file is None:
+                self._open_file()
+            self._write_member(record)
+            if self.__file.tell() >= self.__max_file_bytes:
+                self._close_file()
+
+    def close(self):
+        """Function to close the open WARC file.
+        """
+        with self.__lock:
+            if self.__file is not None:
+                self._close_file()
+
+
+def _read_headers(stream):
+    """Function to read header lines until an empty line.
+
+    Args:
+        stream (file object): Stream positioned at the headers
+
+    Returns:
+        str, dict: First line and headers, or None, None at the end of the stream.
+    """
+    first_line = stream.readline()
+    while first_line in (b'\r\n', b'\n'):
+        first_line = stream.readline()
+    if not first_line:
+        return None, None
+    headers = {}
+    for line in iter(stream.readline, b''):
+        line = line.rstrip(b'\r\n')
+        if not line:
+            break
+        key, _, value = line.decode('utf-8', errors='replace').partition(':')
+        headers[key.strip().lower()] = value.strip()
+    return first_line.decode('utf-8', errors='replace').strip(), headers
+
+
+def iter_warc_responses(path):
+    """Function to read the response records from a WARC file, compressed or not.
+
+    Args:
+        path (str): Path of the WARC file
+
+    Yields:
+        str, int, dict, bytes: Target url, HTTP status, HTTP headers and body of every response.
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as stream:
+        while True:
+            version, warc_headers = _read_headers(stream)
+            if version is None:
+                return
+            block = stream.read(int(warc_headers.get('content-length', 0)))
+            if warc_headers.get('warc-type') != 'response':
+                continue
+            head, _, body = block.partition(b'\r\n\r\n')
+            status_line, *header_lines = head.decode('iso-8859-1').split('\r\n')
+            http_headers = {}
+            for line in header_lines:
+                key, _, value = line.partition(':')
+                http_headers[key.strip().lower()] = value.strip()
+            parts = status_line.split(' ', 2)
+            status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+            yield warc_headers.get('warc-target-uri'), status, http_headers, body